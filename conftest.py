@@ -60,6 +60,12 @@
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def _no_background_chart_rendering(settings: Any) -> None:
+    """Keep chart worker threads from writing to storage after a test ends."""
+    settings.MECHANISM_CHARTS_IN_BACKGROUND = False
+
+
 @pytest.fixture(name="admin_user")
 def admin_user_fixture() -> Any:
     """Create and return a superuser."""
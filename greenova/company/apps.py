@@ -5,3 +5,9 @@ class CompanyConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "company"
     verbose_name = "Companies"
+
+    def ready(self):
+        """Generate thumbnails of uploaded company logos."""
+        from core.utils.thumbnails import register_thumbnail_field
+
+        register_thumbnail_field(self.get_model("Company"), "logo")
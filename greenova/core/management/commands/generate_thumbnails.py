@@ -0,0 +1,30 @@
+import logging
+from typing import Any
+
+from core.utils.thumbnails import generate_derivatives, registered_files
+from django.core.management.base import BaseCommand
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate missing thumbnails and previews for every uploaded evidence '
+        'file, company logo and profile image'
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Render derivatives for files uploaded before generation was enabled."""
+        files = written = failed = 0
+        for storage, name in registered_files():
+            files += 1
+            try:
+                written += generate_derivatives(storage, name)
+            except Exception as e:  # pylint: disable=broad-except
+                failed += 1
+                self.stderr.write(f"{name}: {e}")
+        logger.info("Generated %s derivatives for %s files", written, files)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {files} files: {written} derivatives written, {failed} failed"
+        ))
@@ -7,6 +7,8 @@
     THEME_OPTIONS,
     USER_NAVIGATION,
 )
+from core.utils.thumbnails import DEFAULT_THUMBNAIL_SIZE
+from core.utils.thumbnails import thumbnail_url as derivative_url
 from django import template
 from django.conf import settings
 from django.urls import NoReverseMatch, reverse
@@ -156,3 +158,12 @@ def format_date(date_value, format_string="%d %b %Y"):
         return date_value.strftime(format_string)
     except (AttributeError, ValueError):
         return str(date_value)
+
+
+@register.filter
+def thumbnail_url(field_file, size=DEFAULT_THUMBNAIL_SIZE):
+    """Return a file's thumbnail URL, or a placeholder until it is generated.
+
+    Usage: ``{{ company.logo|thumbnail_url:"small" }}``
+    """
+    return derivative_url(getattr(field_file, "name", None) or "", size)
@@ -13,3 +13,5 @@ def site_version() -> str: ...
 def main_navigation(context: Any) -> dict: ...
 def user_role_in_project(project: Any, user: Any) -> Any: ...
 def base_url(context: Any) -> str: ...
+def format_date(date_value: Any, format_string: str = ...) -> str: ...
+def thumbnail_url(field_file: Any, size: str = ...) -> str: ...
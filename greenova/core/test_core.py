@@ -1,6 +1,13 @@
+import io
 import logging
+import threading
+from xml.etree import ElementTree
 
 import pytest
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
 from core.commons import get_active_namespace, get_user_display_name
 from core.constants import AUTH_NAVIGATION, MAIN_NAVIGATION, USER_NAVIGATION
 from core.mixins import BreadcrumbMixin, PageTitleMixin, SectionMixin, ViewMixin
@@ -12,12 +19,32 @@
     main_navigation,
     theme_switcher,
 )
+from core.utils.charts import (
+    BAR_COLOR,
+    DEFAULT_COLORS,
+    NO_DATA_TEXT,
+    chart_spec,
+    create_pie_chart,
+    register_chart,
+    render_cache,
+    render_chart,
+    svg_bar_chart,
+    svg_pie_chart,
+)
+from core.utils.executors import LazyExecutor
 from core.utils.roles import (
     ProjectRole,
     get_role_choices,
     get_role_color,
     get_role_display,
 )
+from core.utils.thumbnails import (
+    THUMBNAIL_SIZES,
+    delete_derivatives,
+    derivative_name,
+    generate_derivatives,
+    thumbnail_url,
+)
 from django.contrib.auth import get_user_model
 from django.template import Context, Template
 from django.test import RequestFactory
@@ -307,6 +334,115 @@ def test_role_utility_functions(self) -> None:
         assert all(isinstance(choice, tuple) and len(
             choice) == 2 for choice in role_choices)
 
+    def test_thumbnail_derivatives(self, settings, tmp_path) -> None:
+        """Test derivatives are generated once and replace the placeholder."""
+        settings.MEDIA_ROOT = str(tmp_path)
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+            },
+        }
+        cache.clear()
+        buffer = io.BytesIO()
+        Image.new("RGB", (2000, 1000), "green").save(buffer, "PNG")
+        name = default_storage.save(
+            "company_logos/logo.png", ContentFile(buffer.getvalue())
+        )
+
+        assert thumbnail_url(name, "small").endswith("thumbnail-placeholder.svg")
+        assert generate_derivatives(default_storage, name) == len(THUMBNAIL_SIZES)
+        assert generate_derivatives(default_storage, name) == 0
+        assert thumbnail_url(name, "small") == default_storage.url(
+            derivative_name(name, "small")
+        )
+        with default_storage.open(derivative_name(name, "medium")) as derivative:
+            assert Image.open(derivative).size == (THUMBNAIL_SIZES["medium"], 160)
+
+        # Files that cannot be previewed always get the placeholder
+        assert thumbnail_url("evidence/report.docx").endswith(".svg")
+        delete_derivatives(name)
+        assert not default_storage.exists(derivative_name(name, "small"))
+
+    def test_render_chart_renders_identical_charts_once(self) -> None:
+        """Test charts are drawn off the request thread and memoized by content."""
+        calls = []
+
+        @register_chart("test.counted")
+        def build(data, fig_size):
+            calls.append(threading.current_thread().name)
+            return create_pie_chart(
+                data["data"], data["labels"], None, fig_size=fig_size
+            )
+
+        render_cache.clear()
+        data = chart_spec("status", "Status", ["Open", "Closed"], [3, 1])
+        png = render_chart("test.counted", data, (300, 200))
+        assert png.startswith(b"\x89PNG")
+        assert render_chart("test.counted", dict(data), (300, 200)) == png
+        assert calls and calls[0].startswith("chart-render")
+        assert len(calls) == 1
+
+        # A different size, format or dataset is a different chart
+        assert render_chart("test.counted", data, (300, 200), "svg").startswith(
+            b"<?xml"
+        )
+        render_chart("test.counted", {**data, "data": [1, 3]}, (300, 200))
+        assert len(calls) == 3
+
+        with pytest.raises(ValueError):
+            render_chart("test.unknown", data)
+
+    def test_lazy_executor(self) -> None:
+        """Test the shared pool starts on first submit and is reused after."""
+        executor = LazyExecutor(max_workers=1, thread_name_prefix="test-lazy")
+        assert executor._executor is None  # pylint: disable=protected-access
+
+        name = executor.submit(lambda: threading.current_thread().name).result()
+        assert name.startswith("test-lazy")
+        pool = executor.get()
+        assert executor.submit(pow, 2, 3).result() == 8
+        assert executor.get() is pool
+        pool.shutdown()
+
+    def test_svg_charts(self) -> None:
+        """Test pies, donuts and bars are drawn as SVG with the chart formatting."""
+        pie = svg_pie_chart(
+            [3, 1, 0],
+            ["Open", "Closed <old>", "Void"],
+            ["#f9c74f", "#90be6d", "#43aa8b"],
+            title="Status",
+            legend_title="Status",
+        )
+        document = ElementTree.fromstring(pie)
+        paths = document.findall("{http://www.w3.org/2000/svg}path")
+        # One wedge per non-zero value, in the given colors
+        assert [path.get("fill") for path in paths] == ["#f9c74f", "#90be6d"]
+        texts = [
+            text.text for text in document.iter("{http://www.w3.org/2000/svg}text")
+        ]
+        assert "75.0%" in texts
+        assert "Closed <old> (1 - 25.0%)" in texts
+        assert "Void (0 - 0.0%)" in texts
+
+        # A single value is a full ring, drawn as two arcs
+        donut = ElementTree.fromstring(svg_pie_chart([5], ["All"], donut=True))
+        (ring,) = donut.findall("{http://www.w3.org/2000/svg}path")
+        assert ring.get("d").count("A") == 4
+        assert ring.get("fill") == DEFAULT_COLORS[0]
+
+        bar = svg_bar_chart([5, 2], ["Site Manager", "Ecologist"], xlabel="Obligations")
+        document = ElementTree.fromstring(bar)
+        widths = [
+            float(rect.get("width"))
+            for rect in document.findall("{http://www.w3.org/2000/svg}rect")
+            if rect.get("fill") == BAR_COLOR
+        ]
+        assert widths[0] == pytest.approx(widths[1] * 5 / 2)
+
+        for empty in (svg_pie_chart([0, 0], ["A", "B"]), svg_bar_chart([], [])):
+            assert NO_DATA_TEXT in empty
+
 
 # ----- SIGNAL TESTS -----
 
@@ -1,22 +1,21 @@
-"""Copyright (C) 2025 Adrian Gallo.
-
-This file is part of Greenova.
-
-Greenova is free software: you can redistribute it and/or modify
-it under the terms of the GNU Affero General Public License as published by
-the Free Software Foundation, either version 3 of the License, or
-(at your option) any later version.
-
-Greenova is distributed in the hope that it will be useful,
-but WITHOUT ANY WARRANTY; without even the implied warranty of
-MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
-GNU Affero General Public License for more details.
-
-You should have received a copy of the GNU Affero General Public License
-along with Greenova. If not, see <https://www.gnu.org/licenses/>.
-
-Author: Adrian Gallo <agallo@enveng-group.com.au>
-"""
+# Copyright (C) 2025 Adrian Gallo.
+#
+# This file is part of Greenova.
+#
+# Greenova is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Greenova is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Greenova. If not, see <https://www.gnu.org/licenses/>.
+#
+# Author: Adrian Gallo <agallo@enveng-group.com.au>
 
 """Shared chart utilities for Greenova project.
 
@@ -24,14 +23,252 @@
 (e.g., pie charts) using matplotlib, to eliminate code duplication and
 ensure consistent chart appearance across the project.
 
+Pages draw their charts in the browser from a uniform chart data schema
+(``chart_spec``): each chart JSON endpoint answers with a list of specs,
+and ``static/js/chart-data.js`` draws every ``<canvas data-chart-url>``
+from it with Chart.js. Server-side rendering is kept only for exports:
+``chart_response`` answers ``?format=png`` or ``?format=svg`` with an image
+of one chart, rendered by ``render_chart_export``.
+
+Every server-side render goes through ``render_chart``. Figures are built
+on ``Figure`` with an attached ``FigureCanvasAgg`` and never touch pyplot's
+global state, so they are safe under threaded workers and nothing needs
+closing. Renders run on a small bounded thread pool and the resulting bytes
+are memoized in an in-process LRU keyed by (chart type, data hash, size,
+format), so an identical chart requested by many users is drawn once.
+Chart types are registered with ``register_chart``.
+
+Simple pies, donuts and horizontal bars don't need matplotlib at all:
+``svg_pie_chart`` and ``svg_bar_chart`` write the SVG markup directly, in
+the same palette and with the same legend and percentage formatting, and
+SVG exports of ``chart_spec`` charts use them. matplotlib is imported only
+when a figure is actually built, so workers that serve just these charts
+never load it; PNG output and complex plots still go through matplotlib.
+
 Author: Adrian Gallo
 Email: agallo@enveng-group.com.au
 License: AGPL-3.0
 """
 
+import hashlib
+import io
+import json
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any
+from xml.sax.saxutils import escape, quoteattr
+
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+)
+
+from .executors import LazyExecutor
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Chart types understood by the client and the export renderer
+CHART_TYPES = ("pie", "doughnut", "bar")
+# Export formats and their content types
+EXPORT_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+EXPORT_SIZE = (600, 300)
+BAR_COLOR = "#65a879"
+# matplotlib's default color cycle, used when a chart has no colors
+DEFAULT_COLORS = (
+    "#1f77b4",
+    "#ff7f0e",
+    "#2ca02c",
+    "#d62728",
+    "#9467bd",
+    "#8c564b",
+    "#e377c2",
+    "#7f7f7f",
+    "#bcbd22",
+    "#17becf",
+)
+# Ring width of donut charts, as a fraction of the radius
+DONUT_WIDTH = 0.4
+NO_DATA_TEXT = "No data available"
+
+# Concurrent renders per process; matplotlib rendering is CPU-bound
+RENDER_WORKERS = 2
+# Rendered images kept in memory per process
+RENDER_CACHE_SIZE = 256
+# Seconds a caller waits for a queued render
+RENDER_TIMEOUT = 30
+
+ChartKey = tuple[str, str, tuple[int, int], str]
+ChartBuilder = Callable[[Any, tuple[int, int]], "Figure"]
+
+_chart_builders: dict[str, ChartBuilder] = {}
+_render_pool = LazyExecutor(
+    max_workers=RENDER_WORKERS, thread_name_prefix="chart-render"
+)
+# Renders queued or running, so concurrent identical requests share one
+_in_flight: dict[ChartKey, Future] = {}
+_in_flight_lock = threading.Lock()
+
+
+def new_figure(
+    fig_size: tuple[int, int] = EXPORT_SIZE, dpi: int = 100, **kwargs: Any
+) -> "Figure":
+    """Create a pyplot-free figure drawn by its own Agg canvas.
+
+    Args:
+        fig_size: Tuple of (width, height) in pixels for the figure.
+        dpi: Resolution of the figure.
+        **kwargs: Passed on to ``Figure``.
+
+    Returns:
+        Matplotlib Figure object with a ``FigureCanvasAgg`` attached.
+
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig_width, fig_height = fig_size
+    fig = Figure(figsize=(fig_width / dpi, fig_height / dpi), dpi=dpi, **kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def figure_to_bytes(fig: "Figure", fmt: str = "png") -> bytes:
+    """Render a figure to image file contents.
+
+    Args:
+        fig: Figure to render.
+        fmt: Image format understood by matplotlib, e.g. ``png`` or ``svg``.
+
+    Returns:
+        Image file contents.
+
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+class _LRUCache:
+    """Thread-safe mapping that forgets its least recently used entries."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[ChartKey, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: ChartKey) -> bytes | None:
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+
+    def put(self, key: ChartKey, content: bytes) -> None:
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+render_cache = _LRUCache(RENDER_CACHE_SIZE)
+
+
+def register_chart(chart_type: str) -> Callable[[ChartBuilder], ChartBuilder]:
+    """Register a figure builder for ``render_chart``.
+
+    The builder is called as ``builder(data, fig_size)`` on a render worker
+    and must return a new ``Figure`` (see ``new_figure``) built only from
+    ``data``, which must be JSON-serializable so it can be hashed.
+
+    Args:
+        chart_type: Unique name of the chart type.
+
+    Returns:
+        Decorator registering the builder and returning it unchanged.
+
+    """
+
+    def decorator(builder: ChartBuilder) -> ChartBuilder:
+        _chart_builders[chart_type] = builder
+        return builder
+
+    return decorator
+
+
+def chart_key(
+    chart_type: str, data: Any, fig_size: tuple[int, int], fmt: str
+) -> ChartKey:
+    """Return the memoization key of a rendered chart."""
+    source = json.dumps(data, sort_keys=True, default=str)
+    digest = hashlib.sha256(source.encode()).hexdigest()
+    return (chart_type, digest, tuple(fig_size), fmt)
+
+
+def _render(
+    key: ChartKey, chart_type: str, data: Any, fig_size: tuple[int, int], fmt: str
+) -> bytes:
+    try:
+        content = figure_to_bytes(_chart_builders[chart_type](data, fig_size), fmt)
+        render_cache.put(key, content)
+        return content
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
 
-from collections.abc import Sequence
-from matplotlib.figure import Figure
+
+def render_chart(
+    chart_type: str,
+    data: Any,
+    fig_size: tuple[int, int] = EXPORT_SIZE,
+    fmt: str = "png",
+) -> bytes:
+    """Render a registered chart type, once per distinct chart.
+
+    Args:
+        chart_type: Name given to ``register_chart``.
+        data: JSON-serializable data passed to the chart's builder.
+        fig_size: Tuple of (width, height) in pixels for the figure.
+        fmt: One of ``EXPORT_FORMATS``.
+
+    Returns:
+        Image file contents.
+
+    Raises:
+        ValueError: If the chart type or format is unknown.
+
+    """
+    if chart_type not in _chart_builders:
+        raise ValueError(f"Unknown chart type: {chart_type}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported chart format: {fmt}")
+
+    key = chart_key(chart_type, data, fig_size, fmt)
+    content = render_cache.get(key)
+    if content is not None:
+        return content
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        if future is None:
+            future = _render_pool.submit(
+                _render, key, chart_type, data, fig_size, fmt
+            )
+            _in_flight[key] = future
+    return future.result(timeout=RENDER_TIMEOUT)
 
 
 def create_pie_chart(
@@ -40,7 +277,8 @@ def create_pie_chart(
     colors: Sequence[str],
     title: str = "Status Distribution",
     fig_size: tuple[int, int] = (320, 240),
-) -> Figure:
+    donut: bool = False,
+) -> "Figure":
     """Create a matplotlib pie chart with consistent style for Greenova.
 
     Args:
@@ -49,13 +287,13 @@ def create_pie_chart(
         colors: Sequence of colors for each segment.
         title: Title for the chart.
         fig_size: Tuple of (width, height) in pixels for the figure.
+        donut: Draw a ring instead of a full pie.
 
     Returns:
         Matplotlib Figure object containing the pie chart.
 
     """
-    fig_width, fig_height = fig_size
-    fig: Figure = Figure(figsize=(fig_width / 100, fig_height / 100), dpi=100)
+    fig = new_figure(fig_size)
     ax = fig.add_subplot(1, 1, 1)
     if data and any(data):
         ax.pie(
@@ -64,7 +302,12 @@ def create_pie_chart(
             colors=colors,
             autopct="%1.1f%%",
             startangle=90,
-            wedgeprops={"edgecolor": "w", "linewidth": 1},
+            pctdistance=1 - DONUT_WIDTH / 2 if donut else 0.6,
+            wedgeprops={
+                "edgecolor": "w",
+                "linewidth": 1,
+                **({"width": DONUT_WIDTH} if donut else {}),
+            },
             textprops={"fontsize": 10},
         )
         ax.axis("equal")
@@ -73,7 +316,52 @@ def create_pie_chart(
         ax.text(
             0.5,
             0.5,
-            "No data available",
+            NO_DATA_TEXT,
+            horizontalalignment="center",
+            verticalalignment="center",
+            fontsize=12,
+        )
+        ax.axis("off")
+    fig.tight_layout()
+    return fig
+
+
+def create_bar_chart(
+    data: Sequence[int],
+    labels: Sequence[str],
+    color: str = BAR_COLOR,
+    title: str = "",
+    fig_size: tuple[int, int] = EXPORT_SIZE,
+) -> "Figure":
+    """Create a matplotlib horizontal bar chart with consistent style for Greenova.
+
+    Args:
+        data: Sequence of values, one bar each.
+        labels: Sequence of labels for each bar, read top to bottom.
+        color: Bar color.
+        title: Title for the chart.
+        fig_size: Tuple of (width, height) in pixels for the figure.
+
+    Returns:
+        Matplotlib Figure object containing the bar chart.
+
+    """
+    fig = new_figure(fig_size)
+    ax = fig.add_subplot(1, 1, 1)
+    if data:
+        positions = range(len(data))
+        ax.barh(positions, data, align="center", color=color)
+        ax.set_yticks(positions)
+        ax.set_yticklabels(labels)
+        ax.invert_yaxis()
+        for position, value in zip(positions, data, strict=True):
+            ax.text(value, position, f" {value}", va="center")
+        ax.set_title(title, fontsize=12)
+    else:
+        ax.text(
+            0.5,
+            0.5,
+            NO_DATA_TEXT,
             horizontalalignment="center",
             verticalalignment="center",
             fontsize=12,
@@ -81,3 +369,394 @@ def create_pie_chart(
         ax.axis("off")
     fig.tight_layout()
     return fig
+
+
+# Native SVG charts
+
+_SVG_FONT = "DejaVu Sans, Arial, sans-serif"
+_SVG_TITLE_HEIGHT = 24
+_SVG_MARGIN = 8
+
+
+def _svg_number(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _svg_text(
+    x: float,
+    y: float,
+    text: str,
+    size: int = 10,
+    anchor: str = "middle",
+    **attrs: str,
+) -> str:
+    extra = "".join(
+        f" {name.replace('_', '-')}={quoteattr(value)}"
+        for name, value in attrs.items()
+    )
+    return (
+        f'<text x="{_svg_number(x)}" y="{_svg_number(y)}" font-size="{size}" '
+        f'text-anchor="{anchor}" dominant-baseline="central"{extra}>'
+        f"{escape(str(text))}</text>"
+    )
+
+
+def _svg_document(
+    fig_size: tuple[int, int], title: str, body: Sequence[str]
+) -> str:
+    width, height = fig_size
+    label = quoteattr(title or "Chart")
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{height}" viewBox="0 0 {width} {height}" role="img" '
+        f'aria-label={label} font-family="{_SVG_FONT}">'
+        f"<title>{escape(title or 'Chart')}</title>"
+        f'<rect width="100%" height="100%" fill="#ffffff"/>'
+        + "".join(body)
+        + "</svg>"
+    )
+
+
+def _svg_header(fig_size: tuple[int, int], title: str) -> tuple[list[str], float]:
+    """Return the title element (if any) and the y where the plot area starts."""
+    if not title:
+        return [], _SVG_MARGIN
+    return [_svg_text(fig_size[0] / 2, _SVG_TITLE_HEIGHT / 2 + 2, title, 12)], (
+        _SVG_TITLE_HEIGHT + _SVG_MARGIN
+    )
+
+
+def _svg_no_data(fig_size: tuple[int, int], title: str) -> str:
+    body, _ = _svg_header(fig_size, title)
+    body.append(_svg_text(fig_size[0] / 2, fig_size[1] / 2, NO_DATA_TEXT, 12))
+    return _svg_document(fig_size, title, body)
+
+
+def _point(cx: float, cy: float, radius: float, angle: float) -> str:
+    # SVG's y axis points down, so angles run counterclockwise on screen
+    x = cx + radius * math.cos(angle)
+    y = cy - radius * math.sin(angle)
+    return f"{_svg_number(x)},{_svg_number(y)}"
+
+
+def _wedge_path(
+    cx: float, cy: float, radius: float, inner: float, start: float, end: float
+) -> str:
+    """Return the path of a pie wedge (or ring segment when ``inner`` > 0)."""
+    sweep = end - start
+    if sweep >= 2 * math.pi - 1e-9:
+        # A full circle cannot be one arc; draw it as two halves
+        middle = start + math.pi
+        return _wedge_path(cx, cy, radius, inner, start, middle) + _wedge_path(
+            cx, cy, radius, inner, middle, end
+        )
+    large = 1 if sweep > math.pi else 0
+    r = _svg_number(radius)
+    path = (
+        f"M{_point(cx, cy, radius, start)} "
+        f"A{r},{r} 0 {large} 0 {_point(cx, cy, radius, end)} "
+    )
+    if inner > 0:
+        ri = _svg_number(inner)
+        path += (
+            f"L{_point(cx, cy, inner, end)} "
+            f"A{ri},{ri} 0 {large} 1 {_point(cx, cy, inner, start)} Z"
+        )
+    else:
+        path += f"L{_svg_number(cx)},{_svg_number(cy)} Z"
+    return path
+
+
+def svg_pie_chart(
+    data: Sequence[float],
+    labels: Sequence[str],
+    colors: Sequence[str] | None = None,
+    title: str = "",
+    fig_size: tuple[int, int] = (320, 240),
+    donut: bool = False,
+    legend_title: str = "",
+    show_percentages: bool = True,
+) -> str:
+    """Draw a pie or donut chart as SVG markup, without matplotlib.
+
+    Wedges start at 12 o'clock and run counterclockwise, as in
+    ``create_pie_chart``. Percentages are printed on the wedges like
+    matplotlib's ``autopct="%1.1f%%"``, and the legend lists each segment as
+    ``"Label (value - 12.5%)"`` like the mechanism charts.
+
+    Args:
+        data: Sequence of values for the pie chart.
+        labels: Sequence of labels for each segment.
+        colors: Sequence of colors for each segment (``DEFAULT_COLORS``
+            when not given).
+        title: Title for the chart.
+        fig_size: Tuple of (width, height) in pixels for the image.
+        donut: Draw a ring instead of a full pie.
+        legend_title: Heading of the legend.
+        show_percentages: Print each segment's percentage on its wedge.
+
+    Returns:
+        SVG document.
+
+    """
+    total = sum(data)
+    if not data or total <= 0:
+        return _svg_no_data(fig_size, title)
+    colors = list(colors or DEFAULT_COLORS)
+    width, height = fig_size
+    body, top = _svg_header(fig_size, title)
+
+    # Legend on the right, pie in the remaining square
+    legend_width = width * 0.45
+    plot_width = width - legend_width
+    radius = max(min(plot_width, height - top) / 2 - _SVG_MARGIN, 1)
+    cx = plot_width / 2
+    cy = top + (height - top) / 2
+    inner = radius * (1 - DONUT_WIDTH) if donut else 0
+    label_radius = radius * (1 - DONUT_WIDTH / 2) if donut else radius * 0.6
+
+    angle = math.pi / 2
+    for index, value in enumerate(data):
+        if value <= 0:
+            continue
+        sweep = 2 * math.pi * value / total
+        color = colors[index % len(colors)]
+        body.append(
+            f'<path d="{_wedge_path(cx, cy, radius, inner, angle, angle + sweep)}" '
+            f'fill="{escape(color)}" stroke="#ffffff" stroke-width="1"/>'
+        )
+        if show_percentages:
+            middle = angle + sweep / 2
+            body.append(
+                _svg_text(
+                    cx + label_radius * math.cos(middle),
+                    cy - label_radius * math.sin(middle),
+                    f"{100 * value / total:.1f}%",
+                )
+            )
+        angle += sweep
+
+    line_height = 16
+    x = plot_width + _SVG_MARGIN
+    y = cy - line_height * (len(data) + bool(legend_title)) / 2 + line_height / 2
+    if legend_title:
+        body.append(_svg_text(x, y, legend_title, 10, "start", font_weight="bold"))
+        y += line_height
+    for index, (label, value) in enumerate(zip(labels, data, strict=True)):
+        color = colors[index % len(colors)]
+        body.append(
+            f'<rect x="{_svg_number(x)}" y="{_svg_number(y - 5)}" width="10" '
+            f'height="10" fill="{escape(color)}"/>'
+        )
+        text = f"{label} ({_svg_number(value)} - {100 * value / total:.1f}%)"
+        body.append(_svg_text(x + 14, y, text, 9, "start"))
+        y += line_height
+    return _svg_document(fig_size, title, body)
+
+
+def svg_bar_chart(
+    data: Sequence[float],
+    labels: Sequence[str],
+    color: str = BAR_COLOR,
+    title: str = "",
+    fig_size: tuple[int, int] = EXPORT_SIZE,
+    xlabel: str = "",
+) -> str:
+    """Draw a horizontal bar chart as SVG markup, without matplotlib.
+
+    Bars read top to bottom in the order given, each followed by its value,
+    as in ``create_bar_chart``.
+
+    Args:
+        data: Sequence of values, one bar each.
+        labels: Sequence of labels for each bar.
+        color: Bar color.
+        title: Title for the chart.
+        fig_size: Tuple of (width, height) in pixels for the image.
+        xlabel: Caption under the value axis.
+
+    Returns:
+        SVG document.
+
+    """
+    if not data:
+        return _svg_no_data(fig_size, title)
+    width, height = fig_size
+    body, top = _svg_header(fig_size, title)
+    bottom = height - _SVG_MARGIN - (16 if xlabel else 0)
+
+    # Roughly 6px per character at 10px, capped at 40% of the width
+    label_width = min(max(len(str(label)) for label in labels) * 6 + 8, width * 0.4)
+    value_width = max(len(_svg_number(value)) for value in data) * 6 + 8
+    left = _SVG_MARGIN + label_width
+    plot_width = max(width - left - value_width - _SVG_MARGIN, 1)
+    largest = max(*data, 0) or 1
+    row = (bottom - top) / len(data)
+    bar_height = row * 0.8
+
+    body.append(
+        f'<line x1="{_svg_number(left)}" y1="{_svg_number(top)}" '
+        f'x2="{_svg_number(left)}" y2="{_svg_number(bottom)}" stroke="#000000"/>'
+    )
+    for index, (label, value) in enumerate(zip(labels, data, strict=True)):
+        y = top + row * index + row / 2
+        bar_width = plot_width * max(value, 0) / largest
+        body.append(
+            f'<rect x="{_svg_number(left)}" y="{_svg_number(y - bar_height / 2)}" '
+            f'width="{_svg_number(bar_width)}" height="{_svg_number(bar_height)}" '
+            f'fill="{escape(color)}"/>'
+        )
+        body.append(_svg_text(left - 4, y, label, 10, "end"))
+        body.append(
+            _svg_text(left + bar_width + 4, y, _svg_number(value), 10, "start")
+        )
+    if xlabel:
+        body.append(_svg_text(left + plot_width / 2, height - _SVG_MARGIN - 6, xlabel))
+    return _svg_document(fig_size, title, body)
+
+
+def svg_chart(spec: dict[str, Any], fig_size: tuple[int, int] = EXPORT_SIZE) -> str:
+    """Draw a ``chart_spec`` chart as SVG markup, without matplotlib.
+
+    Args:
+        spec: Chart in the ``chart_spec`` schema.
+        fig_size: Tuple of (width, height) in pixels for the image.
+
+    Returns:
+        SVG document.
+
+    """
+    if spec["type"] == "bar":
+        return svg_bar_chart(
+            spec["data"],
+            spec["labels"],
+            color=(spec.get("colors") or [BAR_COLOR])[0],
+            title=spec["name"],
+            fig_size=fig_size,
+        )
+    return svg_pie_chart(
+        spec["data"],
+        spec["labels"],
+        spec.get("colors") or None,
+        title=spec["name"],
+        fig_size=fig_size,
+        donut=spec["type"] == "doughnut",
+    )
+
+
+def chart_spec(
+    chart_id: Any,
+    name: str,
+    labels: Sequence[str],
+    data: Sequence[float],
+    chart_type: str = "pie",
+    colors: Sequence[str] = (),
+) -> dict[str, Any]:
+    """Describe one chart in the chart data schema shared by all endpoints.
+
+    Args:
+        chart_id: Identifier, unique within one response.
+        name: Human-readable chart title.
+        labels: Label of each value.
+        data: Values, in label order.
+        chart_type: One of ``CHART_TYPES``.
+        colors: Color of each value (pie) or of every bar (bar, first only);
+            empty lets the client choose.
+
+    Returns:
+        JSON-serializable dict with ``id``, ``name``, ``type``, ``labels``,
+        ``data`` and ``colors``.
+
+    """
+    if chart_type not in CHART_TYPES:
+        raise ValueError(f"Unknown chart type: {chart_type}")
+    return {
+        "id": chart_id,
+        "name": name,
+        "type": chart_type,
+        "labels": list(labels),
+        "data": list(data),
+        "colors": list(colors),
+    }
+
+
+@register_chart("pie")
+@register_chart("doughnut")
+def _build_pie_chart(spec: dict[str, Any], fig_size: tuple[int, int]) -> "Figure":
+    return create_pie_chart(
+        spec["data"],
+        spec["labels"],
+        spec.get("colors") or None,
+        title=spec["name"],
+        fig_size=fig_size,
+        donut=spec["type"] == "doughnut",
+    )
+
+
+@register_chart("bar")
+def _build_bar_chart(spec: dict[str, Any], fig_size: tuple[int, int]) -> "Figure":
+    return create_bar_chart(
+        spec["data"],
+        spec["labels"],
+        color=(spec.get("colors") or [BAR_COLOR])[0],
+        title=spec["name"],
+        fig_size=fig_size,
+    )
+
+
+def render_chart_export(
+    spec: dict[str, Any],
+    fmt: str = "png",
+    fig_size: tuple[int, int] = EXPORT_SIZE,
+) -> bytes:
+    """Render a chart spec to an image.
+
+    SVG is written directly by ``svg_chart``; PNG goes through
+    ``render_chart``.
+
+    Args:
+        spec: Chart in the ``chart_spec`` schema.
+        fmt: One of ``EXPORT_FORMATS``.
+        fig_size: Tuple of (width, height) in pixels for the figure.
+
+    Returns:
+        Image file contents.
+
+    """
+    if fmt == "svg":
+        return svg_chart(spec, fig_size).encode()
+    return render_chart(spec["type"], spec, fig_size, fmt)
+
+
+def chart_response(
+    request: HttpRequest, charts: Sequence[dict[str, Any]]
+) -> HttpResponse:
+    """Answer a chart endpoint: JSON specs, or one chart as an exported image.
+
+    Without ``format`` (or with ``format=json``) the specs are returned as a
+    JSON list. ``format=png`` or ``format=svg`` returns the chart whose id
+    matches ``chart`` (the first chart when not given) as an image.
+
+    Args:
+        request: The current request.
+        charts: Charts in the ``chart_spec`` schema.
+
+    Returns:
+        JSON or image response.
+
+    """
+    fmt = request.GET.get("format", "json")
+    if fmt == "json":
+        return JsonResponse(list(charts), safe=False)
+    if fmt not in EXPORT_FORMATS:
+        return HttpResponseBadRequest("Unsupported chart format")
+
+    chart_id = request.GET.get("chart")
+    spec = next(
+        (chart for chart in charts if chart_id in (None, str(chart["id"]))), None
+    )
+    if spec is None:
+        raise Http404("No such chart")
+    return HttpResponse(
+        render_chart_export(spec, fmt), content_type=EXPORT_FORMATS[fmt]
+    )
@@ -0,0 +1,40 @@
+"""Process-wide background thread pools, created on first use.
+
+Background work (bulk jobs, chart renders, thumbnails) runs on small
+``ThreadPoolExecutor`` pools owned by the module that needs them. Starting
+the threads lazily keeps management commands and test runs that never
+queue any work from spawning them, and keeps each pool's size in one place.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class LazyExecutor:
+    """A ``ThreadPoolExecutor`` that is only started when work is submitted.
+
+    Args:
+        max_workers: Worker threads in the pool
+        thread_name_prefix: Prefix for the worker thread names
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str) -> None:
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ThreadPoolExecutor:
+        """Return the pool, starting it if this is the first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=self.thread_name_prefix,
+                )
+            return self._executor
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Schedule ``fn(*args, **kwargs)`` on the pool."""
+        return self.get().submit(fn, *args, **kwargs)
@@ -0,0 +1,233 @@
+"""Thumbnail and preview derivatives for uploaded images and PDFs.
+
+When a registered file field is saved, a background worker renders the file
+(the first page, for PDFs) at each of ``THUMBNAIL_SIZES`` and stores the
+results as WebP under ``derivatives/`` in the default storage. Templates ask
+for a derivative with the ``thumbnail_url`` filter, which answers with the
+placeholder image until the worker has finished, so pages never wait for
+rendering and never download full-size originals for a list view.
+"""
+
+import hashlib
+import io
+import logging
+import os
+from typing import Any, Iterator, List, Tuple
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage, default_storage
+from django.db import models, transaction
+from django.db.models.signals import post_save
+from django.templatetags.static import static
+from PIL import Image, ImageOps
+
+from .executors import LazyExecutor
+
+logger = logging.getLogger(__name__)
+
+# PyMuPDF is only needed to render first-page previews of PDF evidence
+try:
+    import fitz
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# Bounding box, in pixels, of each derivative size
+THUMBNAIL_SIZES = {
+    "small": 96,
+    "medium": 320,
+    "large": 1024,
+}
+DEFAULT_THUMBNAIL_SIZE = "medium"
+DERIVATIVE_PREFIX = "derivatives"
+PLACEHOLDER_IMAGE = "img/ui/thumbnail-placeholder.svg"
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp"}
+PDF_EXTENSIONS = {".pdf"}
+
+# How long a finished derivative is remembered without checking storage
+_READY_TIMEOUT = 24 * 60 * 60
+_WEBP_QUALITY = 80
+
+_registered_fields: List[Tuple[type, str]] = []
+# One worker keeps image decoding from competing with requests
+_executor = LazyExecutor(max_workers=1, thread_name_prefix="thumbnails")
+
+
+def can_preview(name: str) -> bool:
+    """Whether derivatives can be generated for a file with this name."""
+    extension = os.path.splitext(name or "")[1].lower()
+    return extension in IMAGE_EXTENSIONS or (
+        PYMUPDF_AVAILABLE and extension in PDF_EXTENSIONS
+    )
+
+
+def derivative_name(name: str, size: str) -> str:
+    """Return the storage name of a source file's derivative at ``size``."""
+    return f"{DERIVATIVE_PREFIX}/{size}/{name}.webp"
+
+
+def _ready_key(name: str, size: str) -> str:
+    digest = hashlib.sha1(f"{name}:{size}".encode(), usedforsecurity=False)
+    return f"thumbnail:{digest.hexdigest()}"
+
+
+def thumbnail_url(name: str, size: str = DEFAULT_THUMBNAIL_SIZE) -> str:
+    """
+    Return the URL of a file's derivative, or the placeholder until it exists.
+
+    Args:
+        name: Storage name of the source file
+        size: One of ``THUMBNAIL_SIZES``
+
+    Returns:
+        str: Derivative URL, or the placeholder's static URL
+    """
+    if size not in THUMBNAIL_SIZES:
+        size = DEFAULT_THUMBNAIL_SIZE
+    if not name or not can_preview(name):
+        return static(PLACEHOLDER_IMAGE)
+    key = _ready_key(name, size)
+    target = derivative_name(name, size)
+    if not cache.get(key):
+        # Another process may have rendered it; check storage once
+        if not default_storage.exists(target):
+            return static(PLACEHOLDER_IMAGE)
+        cache.set(key, True, _READY_TIMEOUT)
+    return default_storage.url(target)
+
+
+def _open_source(storage: Storage, name: str) -> Image.Image:
+    largest = max(THUMBNAIL_SIZES.values())
+    with storage.open(name, "rb") as source:
+        if os.path.splitext(name)[1].lower() in PDF_EXTENSIONS:
+            with fitz.open(stream=source.read(), filetype="pdf") as document:
+                page = document[0]
+                zoom = largest / max(page.rect.width, page.rect.height)
+                pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                return Image.frombytes(
+                    "RGB", (pixmap.width, pixmap.height), pixmap.samples
+                )
+        image = Image.open(source)
+        # Let JPEG decode at a reduced scale instead of full resolution
+        image.draft("RGB", (largest, largest))
+        image.load()
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    return image
+
+
+def generate_derivatives(storage: Storage, name: str) -> int:
+    """
+    Render and store every missing derivative of a file.
+
+    Args:
+        storage: Storage holding the source file
+        name: Storage name of the source file
+
+    Returns:
+        int: Number of derivatives written
+    """
+    if not name or not can_preview(name):
+        return 0
+    pending = [
+        size
+        for size in THUMBNAIL_SIZES
+        if not default_storage.exists(derivative_name(name, size))
+    ]
+    written = 0
+    if pending:
+        image = _open_source(storage, name)
+        # Largest first, so each size is reduced from the previous one
+        for size in sorted(pending, key=THUMBNAIL_SIZES.get, reverse=True):
+            pixels = THUMBNAIL_SIZES[size]
+            image.thumbnail((pixels, pixels), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, "WEBP", quality=_WEBP_QUALITY)
+            default_storage.save(
+                derivative_name(name, size), ContentFile(buffer.getvalue())
+            )
+            written += 1
+    cache.set_many(
+        {_ready_key(name, size): True for size in THUMBNAIL_SIZES}, _READY_TIMEOUT
+    )
+    return written
+
+
+def delete_derivatives(name: str) -> None:
+    """Delete every derivative of a source file that is being removed."""
+    for size in THUMBNAIL_SIZES:
+        default_storage.delete(derivative_name(name, size))
+    cache.delete_many([_ready_key(name, size) for size in THUMBNAIL_SIZES])
+
+
+def _run_in_background(storage: Storage, name: str) -> None:
+    try:
+        generate_derivatives(storage, name)
+    except Exception:  # pylint: disable=broad-except
+        # The placeholder stays in place; a later save or the
+        # generate_thumbnails command can try again
+        logger.exception("Could not generate derivatives of %s", name)
+
+
+def queue_derivatives(field_file: Any) -> bool:
+    """
+    Queue derivative generation for a saved file, after the transaction commits.
+
+    Args:
+        field_file: The ``FieldFile`` to render
+
+    Returns:
+        bool: Whether any work was queued
+    """
+    name = field_file.name if field_file else ""
+    if not can_preview(name):
+        return False
+    ready = cache.get_many([_ready_key(name, size) for size in THUMBNAIL_SIZES])
+    if len(ready) == len(THUMBNAIL_SIZES):
+        return False
+    storage = field_file.storage
+    transaction.on_commit(
+        lambda: _executor.submit(_run_in_background, storage, name)
+    )
+    return True
+
+
+def register_thumbnail_field(model: type[models.Model], field_name: str) -> None:
+    """
+    Generate derivatives whenever ``model.field_name`` is saved with a file.
+
+    Call from the owning app's ``AppConfig.ready``.
+
+    Args:
+        model: Model class with a file or image field
+        field_name: Name of that field
+    """
+    def queue_on_save(sender, instance, **kwargs):
+        queue_derivatives(getattr(instance, field_name))
+
+    _registered_fields.append((model, field_name))
+    post_save.connect(
+        queue_on_save,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"thumbnails:{model._meta.label}.{field_name}",
+    )
+
+
+def registered_files() -> Iterator[Tuple[Storage, str]]:
+    """Yield (storage, name) for every file in every registered field."""
+    for model, field_name in _registered_fields:
+        storage = model._meta.get_field(field_name).storage
+        names = (
+            model._default_manager.exclude(**{f"{field_name}__isnull": True})
+            .exclude(**{field_name: ""})
+            .values_list(field_name, flat=True)
+            .distinct()
+            .iterator()
+        )
+        for name in names:
+            yield storage, name
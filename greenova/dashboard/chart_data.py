@@ -0,0 +1,76 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Dashboard chart data in the shared chart data schema.
+
+The dashboard draws its status and compliance charts in the browser from
+these specs (see ``core.utils.charts``), so rendering a dashboard page no
+longer runs matplotlib. Each chart is a single aggregate query.
+"""
+
+from typing import Any
+
+from core.utils.charts import BAR_COLOR, chart_spec
+from django.db.models import Count, Q, QuerySet
+from mechanisms.chart_data import STATUS_COLORS, STATUS_LABELS
+from obligations.constants import (
+    STATUS_COMPLETED,
+    STATUS_IN_PROGRESS,
+    STATUS_NOT_STARTED,
+)
+from obligations.models import Obligation
+from obligations.utils import overdue_q
+from projects.models import Project
+
+# Stored statuses in ``STATUS_LABELS`` order; overdue is counted separately
+_STATUSES = (STATUS_NOT_STARTED, STATUS_IN_PROGRESS, STATUS_COMPLETED)
+
+
+def status_chart(project_id: int) -> dict[str, Any]:
+    """Return a pie chart of a project's obligations by status.
+
+    Overdue obligations are also counted under their stored status.
+    """
+    counts = Obligation.objects.filter(project_id=project_id).aggregate(
+        **{
+            f"status_{index}": Count("pk", filter=Q(status=status))
+            for index, status in enumerate(_STATUSES)
+        },
+        overdue=Count("pk", filter=overdue_q()),
+    )
+    data = [counts[f"status_{index}"] for index in range(len(_STATUSES))]
+    return chart_spec(
+        "status",
+        "Obligation Status Distribution",
+        STATUS_LABELS,
+        [*data, counts["overdue"]],
+        colors=STATUS_COLORS,
+    )
+
+
+def compliance_chart(projects: QuerySet[Project]) -> dict[str, Any]:
+    """Return a bar chart of the percentage of completed obligations per project."""
+    rows = (
+        projects.order_by("name")
+        .annotate(
+            total=Count("obligations"),
+            completed=Count(
+                "obligations", filter=Q(obligations__status=STATUS_COMPLETED)
+            ),
+        )
+        .values_list("name", "total", "completed")
+    )
+    labels = []
+    data = []
+    for name, total, completed in rows:
+        labels.append(name)
+        data.append(round(100 * completed / total) if total else 0)
+    return chart_spec(
+        "compliance",
+        "Project Compliance (% completed)",
+        labels,
+        data,
+        chart_type="bar",
+        colors=[BAR_COLOR],
+    )
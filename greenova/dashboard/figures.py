@@ -5,28 +5,53 @@
 Chart generation utilities for the dashboard application.
 
 This module provides functions for generating matplotlib charts
-used in the dashboard views and components.
+used in the dashboard views and components. Charts are drawn by the
+shared rendering service in ``core.utils.charts`` on pyplot-free figures,
+so identical charts are rendered once and no global figure state is kept.
 """
 
-import io
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING, Any
 
-import matplotlib
-import matplotlib.pyplot as plt
+from core.utils.charts import new_figure, register_chart, render_chart
 from django.db.models import Count
 from obligations.models import Obligation
 
-# Configure matplotlib for non-interactive backend to avoid GUI requirements
-matplotlib.use("Agg")
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+CHART_SIZE = (640, 480)
+
+
+@register_chart("dashboard.obligation_status")
+def _build_obligations_status_chart(
+    data: dict[str, Any], fig_size: tuple[int, int]
+) -> Figure:
+    fig = new_figure(fig_size)
+    ax = fig.add_subplot(1, 1, 1)
+    if data["sizes"]:
+        ax.pie(data["sizes"], labels=data["labels"], autopct="%1.1f%%")
+    else:
+        ax.text(0.5, 0.5, "No data", ha="center", va="center")
+    ax.set_title("Obligation Status Distribution")
+    return fig
+
+
+@register_chart("dashboard.placeholder")
+def _build_placeholder_chart(text: str, fig_size: tuple[int, int]) -> Figure:
+    fig = new_figure(fig_size)
+    ax = fig.add_subplot(1, 1, 1)
+    ax.text(0.5, 0.5, text, ha="center", va="center")
+    return fig
 
-def create_obligations_status_chart(
-    project_id: int | None = None,
-) -> tuple[plt.Figure, bytes]:
-    """Create a pie chart of obligation statuses."""
+
+def create_obligations_status_chart(project_id: int | None = None) -> bytes:
+    """Create a PNG pie chart of obligation statuses."""
     filters = {}
     if project_id:
         filters["project_id"] = project_id
@@ -39,51 +64,28 @@ def create_obligations_status_chart(
         .order_by("status")
     )
 
-    labels = [item["status"] for item in status_counts]
-    sizes = [item["count"] for item in status_counts]
-
-    fig, ax = plt.subplots()
-    if sizes:
-        ax.pie(sizes, labels=labels, autopct="%1.1f%%")
-    else:
-        ax.text(0.5, 0.5, "No data", ha="center", va="center")
-    ax.set_title("Obligation Status Distribution")
-
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png")
-    plt.close(fig)
-    buf.seek(0)
-    return fig, buf.getvalue()
+    data = {
+        "labels": [item["status"] for item in status_counts],
+        "sizes": [item["count"] for item in status_counts],
+    }
+    return render_chart("dashboard.obligation_status", data, CHART_SIZE)
 
 
 def create_obligations_status_chart_svg(project_id=None):
     """Create an SVG chart of obligation statuses."""
-    fig, ax = plt.subplots()
-    ax.text(0.5, 0.5, "Obligations Status Chart", ha="center", va="center")
-    buf = io.BytesIO()
-    fig.savefig(buf, format="svg")
-    plt.close(fig)
-    buf.seek(0)
-    return buf.getvalue().decode("utf-8")
-
-
-def create_timeline_chart(project_id: int | None = None) -> tuple[plt.Figure, bytes]:
-    """Stub: Returns a blank chart for timeline."""
-    fig, ax = plt.subplots()
-    ax.text(0.5, 0.5, "Timeline Chart", ha="center", va="center")
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png")
-    plt.close(fig)
-    buf.seek(0)
-    return fig, buf.getvalue()
-
-
-def create_project_compliance_chart(projects) -> tuple[plt.Figure, bytes]:
-    """Stub: Returns a blank chart for project compliance."""
-    fig, ax = plt.subplots()
-    ax.text(0.5, 0.5, "Project Compliance Chart", ha="center", va="center")
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png")
-    plt.close(fig)
-    buf.seek(0)
-    return fig, buf.getvalue()
+    content = render_chart(
+        "dashboard.placeholder", "Obligations Status Chart", CHART_SIZE, "svg"
+    )
+    return content.decode("utf-8")
+
+
+def create_timeline_chart(project_id: int | None = None) -> bytes:
+    """Stub: Returns a blank PNG chart for timeline."""
+    return render_chart("dashboard.placeholder", "Timeline Chart", CHART_SIZE)
+
+
+def create_project_compliance_chart(projects) -> bytes:
+    """Stub: Returns a blank PNG chart for project compliance."""
+    return render_chart(
+        "dashboard.placeholder", "Project Compliance Chart", CHART_SIZE
+    )
@@ -8,29 +8,19 @@
 dashboard-specific functionality and context data.
 """
 
-import base64
 import logging
 from typing import Any
 
 from core.mixins import BreadcrumbMixin, PageTitleMixin
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models import Count
+from django.urls import reverse
 from django.utils import timezone
 from projects.models import Project
 
-from .figures import (
-    create_obligations_status_chart,
-    create_project_compliance_chart,
-    create_timeline_chart,
-)
-
 logger = logging.getLogger(__name__)
 
 
-class ChartMixin:
-    """Stub mixin for chart-related dashboard views."""
-
-
 class ProjectAwareDashboardMixin:
     """Stub mixin for project-aware dashboard views."""
 
@@ -39,8 +29,8 @@ class DashboardContextMixin(LoginRequiredMixin, BreadcrumbMixin, PageTitleMixin)
     """
     Mixin for dashboard views that provides common context data.
 
-    This mixin handles project selection persistence and provides chart data
-    for the dashboard views.
+    This mixin handles project selection persistence and provides the chart
+    spec URLs for the dashboard views.
     """
 
     page_title = "Dashboard"
@@ -59,7 +49,7 @@ def get_context_data(self, **kwargs) -> dict[str, Any]:
         context["projects"] = self._get_user_projects()
         context["current_project_id"] = current_project_id
 
-        # Generate charts and statistics
+        # Point at the chart specs and add statistics
         self._add_chart_data(context, current_project_id)
         self._add_statistics(context, current_project_id)
 
@@ -99,36 +89,22 @@ def _get_user_projects(self):
 
     def _add_chart_data(self, context: dict[str, Any], project_id: int | None) -> None:
         """
-        Add chart data to the context.
+        Add the chart spec URLs to the context.
+
+        Charts are drawn client-side from the JSON specs, so nothing is
+        rendered while building the page.
 
         Args:
             context: The context dictionary to update
             project_id: The current project ID (if any)
         """
-        try:
-            # Generate obligation status chart
-            _, status_chart_data = create_obligations_status_chart(project_id)
-            context["status_chart"] = base64.b64encode(status_chart_data).decode(
-                "utf-8"
-            )
-
-            # Generate timeline chart
-            _, timeline_chart_data = create_timeline_chart(project_id)
-            context["timeline_chart"] = base64.b64encode(timeline_chart_data).decode(
-                "utf-8"
+        if project_id:
+            context["status_chart_url"] = (
+                f"{reverse('dashboard:status_chart_json')}?project_id={project_id}"
             )
-
-            # Generate project compliance chart if no specific project is selected
-            if not project_id:
-                projects = self._get_user_projects()
-                _, compliance_chart_data = create_project_compliance_chart(projects)
-                context["compliance_chart"] = base64.b64encode(
-                    compliance_chart_data
-                ).decode("utf-8")
-
-        except Exception as e:
-            logger.exception("Error generating chart data: %s", e)
-            context["chart_error"] = str(e)
+        else:
+            # Compare all the user's projects when none is selected
+            context["compliance_chart_url"] = reverse("dashboard:compliance_chart_json")
 
     def _add_statistics(self, context: dict[str, Any], project_id: int | None) -> None:
         """
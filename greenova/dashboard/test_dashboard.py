@@ -1,9 +1,18 @@
 """Pytest tests for dashboard functionality."""
+import json
 from datetime import date
 from typing import Never
 
 import pytest
+from dashboard.mixins import DashboardContextMixin
+from dashboard.views import (
+    compliance_chart_json,
+    search_obligations,
+    status_chart_json,
+)
+from django.http import Http404
 from django.urls import reverse
+from obligations.models import Obligation
 from projects.models import Project, ProjectMembership
 
 
@@ -226,3 +235,90 @@ def raise_exception(**kwargs) -> Never:
         # Should return 0 when there's an error
         assert response.status_code == 200
         assert b"0" in response.content
+
+
+@pytest.mark.django_db
+class TestDashboardChartData:
+    """Test the dashboard chart data endpoints."""
+
+    def test_status_and_compliance_charts(self, rf, django_user_model) -> None:
+        """Test status and compliance charts are served as chart specs."""
+        # bulk_create skips the profile signal handlers
+        (user,) = django_user_model.objects.bulk_create(
+            [django_user_model(username="charts")]
+        )
+        project = Project.objects.create(name="Test Project")
+        ProjectMembership.objects.create(user=user, project=project, role="member")
+        for number, status in enumerate(["completed", "not started"]):
+            Obligation.objects.create(
+                obligation_number=f"PCEMP-{number:03d}",
+                project=project,
+                status=status,
+            )
+
+        request = rf.get("/", {"project_id": project.id})
+        request.user = user
+        charts = json.loads(status_chart_json(request).content)
+        assert charts[0]["id"] == "status"
+        assert charts[0]["data"] == [1, 0, 1, 0]
+
+        request = rf.get("/")
+        request.user = user
+        charts = json.loads(compliance_chart_json(request).content)
+        assert charts[0]["type"] == "bar"
+        assert (charts[0]["labels"], charts[0]["data"]) == (["Test Project"], [50])
+
+        # Projects the user is not a member of are not charted
+        other = Project.objects.create(name="Other Project")
+        request = rf.get("/", {"project_id": other.id})
+        request.user = user
+        with pytest.raises(Http404):
+            status_chart_json(request)
+
+    def test_search_obligations(self, rf, django_user_model) -> None:
+        """Test search returns matches from the user's selected project only."""
+        (user,) = django_user_model.objects.bulk_create(
+            [django_user_model(username="searcher")]
+        )
+        project = Project.objects.create(name="Test Project")
+        other = Project.objects.create(name="Other Project")
+        ProjectMembership.objects.create(user=user, project=project, role="member")
+        Obligation.objects.create(
+            obligation_number="PCEMP-001",
+            project=project,
+            obligation="Monitor groundwater levels",
+        )
+        Obligation.objects.create(
+            obligation_number="PCEMP-002",
+            project=project,
+            obligation="Submit annual report",
+        )
+        Obligation.objects.create(
+            obligation_number="PCEMP-003",
+            project=other,
+            obligation="Monitor groundwater quality",
+        )
+        assert reverse("dashboard:search") == "/dashboard/search/"
+
+        request = rf.get("/", {"q": "groundwater", "project_id": project.id})
+        request.user = user
+        request.session = {}
+        results = json.loads(search_obligations(request).content)["obligations"]
+        assert [row["obligation_number"] for row in results] == ["PCEMP-001"]
+        assert request.session["selected_project_id"] == str(project.id)
+
+        # Projects the user is not a member of return nothing
+        request = rf.get("/", {"q": "groundwater", "project_id": other.id})
+        request.user = user
+        request.session = {}
+        assert json.loads(search_obligations(request).content) == {"obligations": []}
+
+    def test_context_mixin_links_chart_specs(self) -> None:
+        """Test dashboard context points at the chart specs, not rendered images."""
+        context: dict = {}
+        DashboardContextMixin()._add_chart_data(context, 7)
+        assert context == {"status_chart_url": "/dashboard/charts/status/?project_id=7"}
+
+        context = {}
+        DashboardContextMixin()._add_chart_data(context, None)
+        assert context == {"compliance_chart_url": "/dashboard/charts/compliance/"}
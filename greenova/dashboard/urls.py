@@ -26,6 +26,13 @@
         views.UpcomingObligationsView.as_view(),
         name="upcoming_obligations",
     ),
+    path("search/", views.search_obligations, name="search"),
+    path("charts/status/", views.status_chart_json, name="status_chart_json"),
+    path(
+        "charts/compliance/",
+        views.compliance_chart_json,
+        name="compliance_chart_json",
+    ),
     path(
         "projects-at-risk/", views.ProjectsAtRiskView.as_view(), name="projects_at_risk"
     ),
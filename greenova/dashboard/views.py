@@ -5,33 +5,32 @@
 
 """
 
-import base64
 import logging
 from datetime import datetime, timedelta  # Use timedelta from datetime
 from typing import Any, TypedDict, cast
 
+from core.utils.charts import chart_response
 from django.conf import settings
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import AbstractUser
 from django.db.models import QuerySet
-from django.http import HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_control
 from django.views.decorators.vary import vary_on_headers
 from django.views.generic import ListView, TemplateView
+from obligations.conditional import project_conditional
 from obligations.models import Obligation
+from obligations.search import search_obligations as run_search
+from obligations.search import text_search_q
 from projects.models import Project
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET
-from .figures import create_obligations_status_chart_svg
-
 
 # Import our new components
-from .figures import (
-    create_obligations_status_chart_svg,
-    create_project_compliance_chart,
-)
-from .mixins import ChartMixin, ProjectAwareDashboardMixin
+from .chart_data import compliance_chart, status_chart
+from .mixins import ProjectAwareDashboardMixin
 
 # Constants for system information
 SYSTEM_STATUS = "operational"  # or fetch from settings/environment
@@ -165,16 +164,8 @@ def get_context_data(self, **kwargs: dict[str, Any]) -> dict[str, Any]:
             logger.exception("Error in dashboard context: %s", e)
             context["error"] = str(e)
 
-        try:
-            _, compliance_chart = create_project_compliance_chart(context["projects"])
-            context["compliance_chart"] = base64.b64encode(compliance_chart).decode("utf-8")
-        except Exception as exc:
-            logger.exception("Error generating compliance chart: %s", exc)
-
-        try:
-            context["obligations_status_chart_svg"] = create_obligations_status_chart_svg(selected_project_id)
-        except Exception as exc:
-            logger.exception("Error generating obligations status chart: %s", exc)
+        # Status and compliance charts are drawn in the browser from
+        # dashboard:status_chart_json and dashboard:compliance_chart_json
         self.add_specific_charts(context)
         return context
 
@@ -261,48 +252,24 @@ def get_active_mechanisms_count(self) -> int:
         return 10  # Example count
 
 
-class ChartView(ChartMixin, ProjectAwareDashboardMixin, TemplateView):
-    """View for rendering charts."""
-
-    template_name = "dashboard/partials/charts.html"
+@login_required
+@project_conditional()
+def status_chart_json(request: HttpRequest) -> HttpResponse:
+    """Obligation status chart of one of the user's projects."""
+    project_id = request.GET.get("project_id", "")
+    if not project_id.isdigit():
+        raise Http404("No project selected")
+    if not Project.objects.filter(pk=project_id, members=request.user).exists():
+        raise Http404("No such project")
+    return chart_response(request, [status_chart(int(project_id))])
 
-    @property
-    def selected_project_id(self) -> str | None:
-        """Return the selected project ID from the request/session."""
-        return get_selected_project_id(self.request)
 
-    def get_queryset(self):
-        """Return the queryset for projects at risk of missing deadlines."""
-        now = timezone.now()
-        queryset = Project.objects.filter(
-            obligations__action_due_date__lt=now,
-            obligations__status__in=["pending", "in progress"],
-        ).distinct()
-        return queryset
-
-    def get_context_data(self, **kwargs):
-        """Add projects_with_stats to the context for at-risk projects."""
-        context = super().get_context_data(**kwargs)
-
-        now = timezone.now()
-        projects_with_stats = []
-        for project in context["projects"]:
-            overdue_obligations = project.obligations.filter(
-                action_due_date__lt=now, status__in=["pending", "in progress"]
-            )
-            overdue_count = overdue_obligations.count()
-            last_due_date = overdue_obligations.order_by("-action_due_date").first()
-            projects_with_stats.append(
-                {
-                    "project": project,
-                    "overdue_count": overdue_count,
-                    "last_due_date": last_due_date.action_due_date
-                    if last_due_date
-                    else None,
-                }
-            )
-        context["projects_with_stats"] = projects_with_stats
-        return context
+@login_required
+@cache_control(private=True, max_age=60)
+def compliance_chart_json(request: HttpRequest) -> HttpResponse:
+    """Completion percentage of every project the user is a member of."""
+    projects = Project.objects.filter(members=request.user)
+    return chart_response(request, [compliance_chart(projects)])
 
 
 class ProjectsAtRiskView(ProjectAwareDashboardMixin, ListView):
@@ -344,23 +311,44 @@ def get_context_data(self, **kwargs):
         context["projects_with_stats"] = projects_with_stats
         return context
 
-def search_obligations(request):
+@login_required
+@require_GET
+def search_obligations(request: HttpRequest) -> JsonResponse:
+    """Return ranked obligation matches for ``q`` in the selected project."""
     query = request.GET.get('q', '').strip()
-    project_id = get_selected_project_id(request)  # your project filter function
+    project_id = get_selected_project_id(request)
 
     if not project_id:
         return JsonResponse({'obligations': []})
 
-    # Filter obligations based on project and search query in obligation_number or obligation fields
-    obligations_qs = Obligation.objects.filter(
-        project_id=project_id
-    ).filter(
-        Q(obligation_number__icontains=query) | Q(obligation__icontains=query)
-    ).values(
-        'id', 'obligation_number', 'obligation', 'action_due_date', 'status'
-    )[:50]  # limit for performance
+    if not query:
+        return JsonResponse({'obligations': []})
 
-    obligations = list(obligations_qs)
+    # Ranked full-text matches within the project, with highlighted snippets
+    project_obligations = Obligation.objects.filter(
+        project_id=project_id, project__members=request.user
+    )
+    hits = run_search(query, queryset=project_obligations, limit=50)
+    if hits is None:
+        # No full-text index on this database; unranked substring match
+        obligations = list(
+            project_obligations.filter(text_search_q(query)).values(
+                'obligation_number', 'obligation', 'action_due_date', 'status'
+            )[:50]
+        )
+        return JsonResponse({'obligations': obligations})
+
+    rows = {
+        row['obligation_number']: row
+        for row in project_obligations.filter(
+            pk__in=[hit.obligation_number for hit in hits]
+        ).values('obligation_number', 'obligation', 'action_due_date', 'status')
+    }
+    obligations = [
+        {**rows[hit.obligation_number], 'snippet': hit.snippet}
+        for hit in hits
+        if hit.obligation_number in rows
+    ]
 
     return JsonResponse({'obligations': obligations})
 
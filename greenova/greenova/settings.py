@@ -271,7 +271,6 @@ def validate_settings() -> None:
     "corsheaders",
     "django_htmx",
     "django_hyperscript",
-    "django_matplotlib",
     "django_pdb",
     "template_partials",
     "tailwind",
@@ -454,8 +453,17 @@ def validate_settings() -> None:
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     },
+    # Evidence files are stored once per distinct content, named by SHA-256
+    "evidence": {
+        "BACKEND": "obligations.storage.ContentAddressedStorage",
+        "OPTIONS": {"prefix": "evidence"},
+    },
 }
 
+# Render mechanism status charts in a background thread as counters change;
+# when off, the nightly_sweep command renders them
+MECHANISM_CHARTS_IN_BACKGROUND = True
+
 # Application version
 APP_VERSION = "0.0.6"
 
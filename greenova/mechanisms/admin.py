@@ -6,6 +6,7 @@
 from django.forms import ModelForm
 from django.http import HttpRequest
 from django.utils import timezone
+from django.utils.html import format_html
 
 from .models import EnvironmentalMechanism
 
@@ -34,7 +35,7 @@ class EnvironmentalMechanismAdmin(admin.ModelAdmin):
         'name', 'project', 'description', 'category', 'reference_number',
         'effective_date', 'status', 'primary_environmental_mechanism',
         'updated_at', 'overdue_count', 'not_started_count',
-        'in_progress_count', 'completed_count'
+        'in_progress_count', 'completed_count', 'status_chart'
     )
 
     def get_queryset(self, request: HttpRequest) -> Any:
@@ -50,6 +51,14 @@ def get_total_obligations(obj: EnvironmentalMechanism) -> int:
     # Add short description for admin list display
     get_total_obligations.short_description = 'Total'  # type: ignore
 
+    @staticmethod
+    def status_chart(obj: EnvironmentalMechanism) -> str:
+        """Show the stored status chart, if it has been rendered."""
+        url = obj.status_chart_url if obj.pk else None
+        if not url:
+            return '-'
+        return format_html('<img src="{}" alt="Status chart" width="300">', url)
+
     def save_model(
             self,
             request: HttpRequest,
@@ -0,0 +1,232 @@
+"""
+Stored status chart images for environmental mechanisms.
+
+A mechanism's pie chart depends only on its four counters, so it is
+rendered once per distinct set of counts and kept in the default storage
+as ``charts/mechanisms/<id>/<hash>.<format>``, where the hash covers the
+counts and everything else that affects the drawing. Whenever counters
+change, the new counts are handed to a background worker that renders any
+artifact not already stored; pages link to the stored file by URL and never
+call matplotlib while answering a request. Artifacts for superseded counts
+and deleted mechanisms are removed by ``collect_chart_artifacts``, which
+the nightly sweep runs.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from core.utils.charts import figure_to_bytes
+from core.utils.executors import LazyExecutor
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from .chart_data import STATUS_COLORS, STATUS_LABELS
+from .models import COUNT_FIELDS, EnvironmentalMechanism
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_PREFIX = "charts/mechanisms"
+ARTIFACT_FORMATS = ("svg", "png")
+DEFAULT_ARTIFACT_FORMAT = "svg"
+ARTIFACT_WIDTH = 300
+ARTIFACT_HEIGHT = 250
+
+# Bump when the drawing changes, so every chart is rendered again
+_RENDER_VERSION = 2
+# How long a stored artifact is remembered without checking storage
+_READY_TIMEOUT = 24 * 60 * 60
+
+# One worker keeps rendering from competing with requests
+_executor = LazyExecutor(max_workers=1, thread_name_prefix="mechanism-charts")
+# Counts queued per mechanism and not yet picked up by the worker
+_pending: Dict[int, List[int]] = {}
+_pending_lock = threading.Lock()
+
+
+def artifact_name(mechanism_id: int, counts: Sequence[int], fmt: str) -> str:
+    """Return the storage name of a mechanism's chart for these counts."""
+    source = json.dumps([
+        _RENDER_VERSION,
+        list(counts),
+        STATUS_LABELS,
+        STATUS_COLORS,
+        ARTIFACT_WIDTH,
+        ARTIFACT_HEIGHT,
+    ])
+    digest = hashlib.sha256(source.encode()).hexdigest()[:16]
+    return f"{ARTIFACT_PREFIX}/{mechanism_id}/{digest}.{fmt}"
+
+
+def mechanism_counts(mechanism: EnvironmentalMechanism) -> List[int]:
+    """Return a mechanism's counters in chart order."""
+    return [getattr(mechanism, field) for field in COUNT_FIELDS]
+
+
+def _ready_key(name: str) -> str:
+    return f"chart-artifact:{name}"
+
+
+def render_chart_artifacts(mechanism_id: int, counts: Sequence[int]) -> int:
+    """
+    Render and store every missing format of a mechanism's chart.
+
+    Args:
+        mechanism_id: Mechanism primary key
+        counts: Counters in ``COUNT_FIELDS`` order
+
+    Returns:
+        int: Number of artifacts written
+    """
+    from .figures import generate_pie_chart, generate_pie_chart_svg
+
+    names = {fmt: artifact_name(mechanism_id, counts, fmt) for fmt in ARTIFACT_FORMATS}
+    missing = [fmt for fmt, name in names.items() if not default_storage.exists(name)]
+    args = (list(counts), STATUS_LABELS, STATUS_COLORS, ARTIFACT_WIDTH, ARTIFACT_HEIGHT)
+    for fmt in missing:
+        if fmt == "svg":
+            # Drawn natively; only the PNG needs matplotlib
+            content = generate_pie_chart_svg(*args).encode()
+        else:
+            content = figure_to_bytes(generate_pie_chart(*args), fmt)
+        default_storage.save(names[fmt], ContentFile(content))
+    cache.set_many({_ready_key(name): True for name in names.values()}, _READY_TIMEOUT)
+    return len(missing)
+
+
+def render_all_chart_artifacts(
+    mechanisms: Optional[Iterable[EnvironmentalMechanism]] = None,
+) -> int:
+    """
+    Render missing chart artifacts for many mechanisms.
+
+    Args:
+        mechanisms: Mechanisms to render (defaults to all of them)
+
+    Returns:
+        int: Number of artifacts written
+    """
+    if mechanisms is None:
+        mechanisms = EnvironmentalMechanism.objects.only("pk", *COUNT_FIELDS).iterator()
+    return sum(
+        render_chart_artifacts(mechanism.pk, mechanism_counts(mechanism))
+        for mechanism in mechanisms
+    )
+
+
+def _run_in_background() -> None:
+    with _pending_lock:
+        work = dict(_pending)
+        _pending.clear()
+    for mechanism_id, counts in work.items():
+        try:
+            render_chart_artifacts(mechanism_id, counts)
+        except Exception:  # pylint: disable=broad-except
+            # Pages keep showing the counts without a chart; the nightly
+            # sweep renders anything still missing
+            logger.exception("Could not render chart for mechanism %s", mechanism_id)
+
+
+def _in_background() -> bool:
+    return getattr(settings, "MECHANISM_CHARTS_IN_BACKGROUND", True)
+
+
+def _submit(counts: Dict[int, List[int]]) -> None:
+    with _pending_lock:
+        idle = not _pending
+        # Later counts replace queued ones; only the newest chart matters
+        _pending.update(counts)
+    if idle:
+        _executor.submit(_run_in_background)
+
+
+def queue_chart_artifacts(mechanism_ids: Iterable[Optional[int]]) -> None:
+    """
+    Render the charts of mechanisms whose counters changed, after commit.
+
+    The counts are read in the committing thread, so the worker only
+    draws and never touches the database.
+
+    Args:
+        mechanism_ids: Mechanism primary keys; None entries are ignored
+    """
+    ids: Set[int] = {pk for pk in mechanism_ids if pk}
+    if not ids or not _in_background():
+        return
+
+    def load_and_submit() -> None:
+        rows = EnvironmentalMechanism.objects.filter(pk__in=ids).values_list(
+            "pk", *COUNT_FIELDS
+        )
+        _submit({row[0]: list(row[1:]) for row in rows})
+
+    transaction.on_commit(load_and_submit)
+
+
+def chart_artifact_url(
+    mechanism: EnvironmentalMechanism, fmt: str = DEFAULT_ARTIFACT_FORMAT
+) -> Optional[str]:
+    """
+    Return the URL of a mechanism's stored chart, or None until it exists.
+
+    A missing artifact is queued for rendering, so it appears on a later load
+    (or after the nightly sweep, if ``MECHANISM_CHARTS_IN_BACKGROUND`` is off).
+
+    Args:
+        mechanism: Mechanism with its counters loaded
+        fmt: One of ``ARTIFACT_FORMATS``
+
+    Returns:
+        Optional[str]: Storage URL of the chart
+    """
+    if fmt not in ARTIFACT_FORMATS:
+        fmt = DEFAULT_ARTIFACT_FORMAT
+    counts = mechanism_counts(mechanism)
+    name = artifact_name(mechanism.pk, counts, fmt)
+    if not cache.get(_ready_key(name)):
+        # Another process may have rendered it; check storage once
+        if not default_storage.exists(name):
+            if _in_background():
+                transaction.on_commit(lambda: _submit({mechanism.pk: counts}))
+            return None
+        cache.set(_ready_key(name), True, _READY_TIMEOUT)
+    return default_storage.url(name)
+
+
+def collect_chart_artifacts() -> int:
+    """
+    Delete artifacts of superseded counts and of deleted mechanisms.
+
+    Returns:
+        int: Number of files deleted
+    """
+    if not default_storage.exists(ARTIFACT_PREFIX):
+        return 0
+    directories, _ = default_storage.listdir(ARTIFACT_PREFIX)
+    current = {
+        mechanism.pk: mechanism_counts(mechanism)
+        for mechanism in EnvironmentalMechanism.objects.only("pk", *COUNT_FIELDS)
+    }
+
+    deleted = 0
+    for directory in directories:
+        mechanism_id = int(directory) if directory.isdigit() else None
+        keep = set()
+        if mechanism_id in current:
+            keep = {
+                artifact_name(mechanism_id, current[mechanism_id], fmt)
+                for fmt in ARTIFACT_FORMATS
+            }
+        _, files = default_storage.listdir(f"{ARTIFACT_PREFIX}/{directory}")
+        for filename in files:
+            name = f"{ARTIFACT_PREFIX}/{directory}/{filename}"
+            if name not in keep:
+                default_storage.delete(name)
+                cache.delete(_ready_key(name))
+                deleted += 1
+    return deleted
@@ -0,0 +1,94 @@
+"""
+Mechanism status chart data for a project, built once and cached.
+
+The counters of every mechanism in a project are read with a single
+``values()`` query and the project totals with one ``aggregate()``. The
+result is cached under the project's ``chart_version``, read from the
+database with one small query, so repeated dashboard loads skip the chart
+queries, and every process sees a change as soon as it commits, even with
+the default local-memory cache.
+"""
+
+from typing import Any, Dict, List
+
+from core.utils.charts import chart_spec
+from django.core.cache import cache
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from projects.models import Project
+
+from .models import COUNT_FIELDS, EnvironmentalMechanism, chart_version
+
+STATUS_LABELS: List[str] = ["Not Started", "In Progress", "Completed", "Overdue"]
+STATUS_COLORS: List[str] = ["#f9c74f", "#90be6d", "#43aa8b", "#f94144"]
+
+# Payloads for old versions are never read again; this only bounds memory
+CHART_CACHE_TIMEOUT = 60 * 60
+
+_PAYLOAD_KEY = "mechanisms:chart-payload:{}:{}"
+
+
+def build_chart_payload(project_id: int) -> Dict[str, Any]:
+    """
+    Build the chart and table data for a project's mechanisms.
+
+    Args:
+        project_id: Project primary key
+
+    Returns:
+        Dict[str, Any]: ``project`` (None if it does not exist), ``charts``
+        (the overall chart first, then one per mechanism, in the
+        ``core.utils.charts.chart_spec`` schema), ``table`` (per-mechanism counts
+        and totals) and ``totals``
+    """
+    project = Project.objects.filter(pk=project_id).first()
+    mechanisms = EnvironmentalMechanism.objects.filter(project_id=project_id)
+    rows = list(mechanisms.values("id", "name", *COUNT_FIELDS))
+    totals = mechanisms.aggregate(
+        **{field: Coalesce(Sum(field), 0) for field in COUNT_FIELDS}
+    )
+
+    charts: List[Dict[str, Any]] = []
+    table: List[Dict[str, Any]] = []
+    if rows:
+        charts.append(chart_spec(
+            "overall",
+            "Overall Status",
+            STATUS_LABELS,
+            [totals[field] for field in COUNT_FIELDS],
+            colors=STATUS_COLORS,
+        ))
+    for row in rows:
+        data = [row[field] for field in COUNT_FIELDS]
+        charts.append(chart_spec(
+            row["id"], row["name"], STATUS_LABELS, data, colors=STATUS_COLORS
+        ))
+        table.append({
+            "id": row["id"],
+            "name": row["name"],
+            "not_started": row["not_started_count"],
+            "in_progress": row["in_progress_count"],
+            "completed": row["completed_count"],
+            "overdue": row["overdue_count"],
+            "total": sum(data),
+        })
+    return {"project": project, "charts": charts, "table": table, "totals": totals}
+
+
+def get_chart_payload(project_id: int) -> Dict[str, Any]:
+    """
+    Return the project's chart payload from the cache, building it if needed.
+
+    Args:
+        project_id: Project primary key
+
+    Returns:
+        Dict[str, Any]: See ``build_chart_payload``; treat it as read-only,
+        since it is shared with other requests
+    """
+    key = _PAYLOAD_KEY.format(project_id, chart_version(project_id))
+    payload = cache.get(key)
+    if payload is None:
+        payload = build_chart_payload(project_id)
+        cache.set(key, payload, CHART_CACHE_TIMEOUT)
+    return payload
@@ -1,11 +1,17 @@
+from __future__ import annotations
+
 import base64
 import io
 import logging
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
+
+from core.utils.charts import new_figure, svg_pie_chart
 
-from matplotlib.figure import Figure
+from .chart_data import STATUS_COLORS, STATUS_LABELS, get_chart_payload
+from .models import COUNT_FIELDS, EnvironmentalMechanism
 
-from .models import EnvironmentalMechanism
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +25,7 @@ def generate_pie_chart(
     """
     Generate a pie chart for given data and labels with percentages in the legend.
     """
-    fig = Figure(figsize=(fig_width / 100, fig_height / 100), dpi=100)
+    fig = new_figure((fig_width, fig_height))
     ax = fig.add_subplot(111)
 
     if sum(data) > 0:
@@ -56,6 +62,25 @@ def generate_pie_chart(
 
     return fig
 
+def generate_pie_chart_svg(
+    data: List[int],
+    labels: List[str],
+    colors: List[str],
+    fig_width: int = 300,
+    fig_height: int = 250
+) -> str:
+    """
+    Draw the same chart as ``generate_pie_chart`` as SVG markup, without matplotlib.
+    """
+    return svg_pie_chart(
+        data,
+        labels,
+        colors,
+        fig_size=(fig_width, fig_height),
+        legend_title='Status',
+        show_percentages=False,
+    )
+
 def encode_figure_to_base64(fig: Figure) -> str:
     """
     Convert a matplotlib figure to a base64 encoded string.
@@ -110,17 +135,12 @@ def get_overall_chart(
     Returns both the figure and base64 encoded image data.
     """
     try:
-        mechanisms = EnvironmentalMechanism.objects.filter(project_id=project_id)
+        # Project totals from the shared (cached) chart payload
+        totals = get_chart_payload(project_id)["totals"]
 
-        # Aggregate data
-        not_started = sum(m.not_started_count for m in mechanisms)
-        in_progress = sum(m.in_progress_count for m in mechanisms)
-        completed = sum(m.completed_count for m in mechanisms)
-        overdue = sum(m.overdue_count for m in mechanisms)
-
-        labels = ['Not Started', 'In Progress', 'Completed', 'Overdue']
-        data = [not_started, in_progress, completed, overdue]
-        colors = ['#f9c74f', '#90be6d', '#43aa8b', '#f94144']
+        labels = STATUS_LABELS
+        data = [totals[field] for field in COUNT_FIELDS]
+        colors = STATUS_COLORS
 
         fig = generate_pie_chart(data, labels, colors, fig_width, fig_height)
         encoded_image = encode_figure_to_base64(fig)
@@ -10,6 +10,13 @@ def generate_pie_chart(
     fig_width: int = ...,
     fig_height: int = ...,
 ) -> Figure: ...
+def generate_pie_chart_svg(
+    data: List[int],
+    labels: List[str],
+    colors: List[str],
+    fig_width: int = ...,
+    fig_height: int = ...,
+) -> str: ...
 def encode_figure_to_base64(fig: Figure) -> str: ...
 def get_mechanism_chart(
     mechanism_id: int, fig_width: int = ..., fig_height: int = ...
@@ -1,22 +1,52 @@
 import logging
 from builtins import property
-from typing import List
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 
 from core.types import StatusData
 from django.core.exceptions import FieldError, ObjectDoesNotExist
 from django.db import models
+from django.db.models import (
+    Count,
+    F,
+    IntegerField,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce, Greatest
 from django.db.models.query import QuerySet
-from django_matplotlib.fields import MatplotlibFigureField  # type: ignore
+from django.utils import timezone
 from obligations.constants import (
     STATUS_CHOICES,
     STATUS_COMPLETED,
     STATUS_IN_PROGRESS,
     STATUS_NOT_STARTED,
 )
-from obligations.utils import is_obligation_overdue
+from obligations.utils import is_obligation_overdue, overdue_q
 
 logger = logging.getLogger(__name__)
 
+# Counter field maintained for each stored obligation status
+STATUS_COUNT_FIELDS: Dict[str, str] = {
+    STATUS_NOT_STARTED: 'not_started_count',
+    STATUS_IN_PROGRESS: 'in_progress_count',
+    STATUS_COMPLETED: 'completed_count',
+}
+OVERDUE_COUNT_FIELD = 'overdue_count'
+COUNT_FIELDS: Tuple[str, ...] = (*STATUS_COUNT_FIELDS.values(), OVERDUE_COUNT_FIELD)
+
+# (mechanism id, counter fields the obligation contributes to)
+CounterState = Tuple[Optional[int], FrozenSet[str]]
+
+# Set while a bulk operation will recount affected mechanisms itself
+_counters_deferred: ContextVar[bool] = ContextVar('counters_deferred', default=False)
+
 
 class EnvironmentalMechanism(models.Model):
     """Represents an environmental mechanism that governs obligations."""
@@ -63,16 +93,6 @@ class EnvironmentalMechanism(models.Model):
     created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
     updated_at: models.DateTimeField = models.DateTimeField(auto_now=True)
 
-    # Add matplotlib figure fields
-    status_chart: MatplotlibFigureField = MatplotlibFigureField(
-        figure='mechanisms.figures.get_mechanism_chart',  # Full import path
-        plt_args=lambda obj: (obj.id,),  # type: ignore
-        fig_width=300,
-        fig_height=250,
-        output_format='png',
-        silent=True,
-    )
-
     class Meta:
         verbose_name: str = 'Environmental Mechanism'
         verbose_name_plural: str = 'Environmental Mechanisms'
@@ -81,43 +101,57 @@ class Meta:
     def __str__(self) -> str:
         return self.name
 
+    def save(self, *args, **kwargs) -> None:
+        """Save the mechanism without clobbering concurrently maintained counters.
+
+        Counters are changed in place by ``apply_counter_transition``, so a
+        stale in-memory copy must not write them back. Pass ``update_fields``
+        explicitly (as ``update_obligation_counts`` does) to persist them.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in COUNT_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def status_chart_url(self) -> Optional[str]:
+        """URL of the stored status chart, or None until it is rendered."""
+        from .chart_artifacts import chart_artifact_url
+
+        return chart_artifact_url(self)
+
     @property
     def total_obligations(self) -> int:
         """Total number of obligations."""
         return self.not_started_count + self.in_progress_count + self.completed_count
 
     def update_obligation_counts(self) -> None:
-        """Update obligation counts based on related obligations."""
+        """Recount obligation counters from scratch.
+
+        Day-to-day writes maintain the counters incrementally through
+        ``apply_counter_transition``; this full recount is the repair path
+        for data changed behind the signals' back (raw updates, imports).
+        """
         from obligations.models import Obligation
 
-        # Get all related obligations
-        obligations: QuerySet = Obligation.objects.filter(
+        counts = Obligation.objects.filter(
             primary_environmental_mechanism=self
+        ).aggregate(
+            **{
+                field: Count('pk', filter=Q(status=status))
+                for status, field in STATUS_COUNT_FIELDS.items()
+            },
+            **{OVERDUE_COUNT_FIELD: Count('pk', filter=overdue_q())},
         )
 
-        # Reset counts
-        self.not_started_count = 0
-        self.in_progress_count = 0
-        self.completed_count = 0
-        self.overdue_count = 0
+        for field, value in counts.items():
+            setattr(self, field, value)
 
-        # Count obligations by status
-        for obligation in obligations:
-            status = obligation.status
-
-            # Check if overdue using the utility function
-            if is_obligation_overdue(obligation):
-                self.overdue_count += 1
-
-            # Also count by regular status
-            if status == STATUS_NOT_STARTED:
-                self.not_started_count += 1
-            elif status == STATUS_IN_PROGRESS:
-                self.in_progress_count += 1
-            elif status == STATUS_COMPLETED:
-                self.completed_count += 1
-
-        self.save()
+        self.save(update_fields=[*COUNT_FIELDS, 'updated_at'])
+        _queue_chart_artifacts([self.pk])
 
     def get_status_data(self) -> StatusData:
         """Return a dictionary of status counts for charting."""
@@ -129,6 +163,191 @@ def get_status_data(self) -> StatusData:
         })
 
 
+def chart_version(project_id: int) -> str:
+    """Return the version of a project's mechanism chart data for cache keys.
+
+    Read from the database in one query: the project's ``updated_at`` and
+    the number and latest ``updated_at`` of its mechanisms. Every counter
+    write stamps ``updated_at``, so the version moves in every process as
+    soon as the change commits, whatever cache backend is configured.
+    """
+    from projects.models import Project
+
+    state = (
+        Project.objects.filter(pk=project_id)
+        .annotate(
+            mechanism_count=Count('mechanisms'),
+            mechanisms_updated=Max('mechanisms__updated_at'),
+        )
+        .values_list('updated_at', 'mechanism_count', 'mechanisms_updated')
+        .first()
+    )
+    if state is None:
+        return 'none'
+    project_updated, mechanism_count, mechanisms_updated = state
+    return '{}.{}.{}'.format(
+        project_updated.timestamp() if project_updated else 0,
+        mechanism_count,
+        mechanisms_updated.timestamp() if mechanisms_updated else 0,
+    )
+
+
+def _queue_chart_artifacts(mechanism_ids: Iterable[int]) -> None:
+    """Re-render stored status charts once counter changes commit."""
+    from .chart_artifacts import queue_chart_artifacts
+
+    queue_chart_artifacts(mechanism_ids)
+
+
+def get_counter_buckets(
+    status: str,
+    action_due_date: Optional[date],
+    reference_date: Optional[date] = None,
+) -> FrozenSet[str]:
+    """Return the counter fields an obligation with these values contributes to."""
+    buckets = set()
+    status_field = STATUS_COUNT_FIELDS.get(status)
+    if status_field:
+        buckets.add(status_field)
+    if is_obligation_overdue(
+        {'status': status, 'action_due_date': action_due_date}, reference_date
+    ):
+        buckets.add(OVERDUE_COUNT_FIELD)
+    return frozenset(buckets)
+
+
+def apply_counter_transition(
+    old: Optional[CounterState], new: Optional[CounterState]
+) -> None:
+    """Move an obligation between counter buckets with atomic F() updates.
+
+    Args:
+        old: Counter state before the write, or None for a new obligation
+        new: Counter state after the write, or None for a deletion
+    """
+    if _counters_deferred.get():
+        return
+    deltas: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for state, step in ((old, -1), (new, 1)):
+        if state and state[0]:
+            for field in state[1]:
+                deltas[state[0]][field] += step
+
+    for mechanism_id, fields in deltas.items():
+        changes = {
+            # Clamp at zero so a missed signal can't drive a counter negative
+            field: Greatest(F(field) + delta, Value(0))
+            for field, delta in fields.items()
+            if delta
+        }
+        if changes:
+            EnvironmentalMechanism.objects.filter(pk=mechanism_id).update(
+                updated_at=timezone.now(), **changes
+            )
+    if deltas:
+        _queue_chart_artifacts(deltas)
+
+
+@contextmanager
+def defer_counter_updates() -> Iterator[None]:
+    """Skip per-row counter transitions inside the block.
+
+    For bulk writes that finish with ``recount_mechanisms``; without the
+    recount the counters drift.
+    """
+    token = _counters_deferred.set(True)
+    try:
+        yield
+    finally:
+        _counters_deferred.reset(token)
+
+
+def recount_mechanisms(mechanism_ids: Iterable[Optional[int]]) -> int:
+    """Recount all counters for the given mechanisms from one grouped query.
+
+    The bulk counterpart of ``update_obligation_counts``: one aggregate
+    query grouped by mechanism and one ``bulk_update``, however many
+    mechanisms a bulk operation touched.
+
+    Args:
+        mechanism_ids: Mechanism primary keys; None entries are ignored
+
+    Returns:
+        int: Number of mechanisms updated
+    """
+    from obligations.models import Obligation
+
+    ids = {mechanism_id for mechanism_id in mechanism_ids if mechanism_id}
+    if not ids:
+        return 0
+
+    rows = (
+        Obligation.objects.filter(primary_environmental_mechanism__in=ids)
+        .order_by()
+        .values('primary_environmental_mechanism')
+        .annotate(
+            **{
+                field: Count('pk', filter=Q(status=status))
+                for status, field in STATUS_COUNT_FIELDS.items()
+            },
+            **{OVERDUE_COUNT_FIELD: Count('pk', filter=overdue_q())},
+        )
+    )
+    counts = {row.pop('primary_environmental_mechanism'): row for row in rows}
+
+    now = timezone.now()
+    mechanisms = list(
+        EnvironmentalMechanism.objects.filter(pk__in=ids).only('pk', 'project')
+    )
+    for mechanism in mechanisms:
+        mechanism_counts = counts.get(mechanism.pk, {})
+        for field in COUNT_FIELDS:
+            setattr(mechanism, field, mechanism_counts.get(field, 0))
+        mechanism.updated_at = now
+    EnvironmentalMechanism.objects.bulk_update(
+        mechanisms, [*COUNT_FIELDS, 'updated_at']
+    )
+    _queue_chart_artifacts(mechanism.pk for mechanism in mechanisms)
+    return len(mechanisms)
+
+
+def refresh_overdue_counts(reference_date: Optional[date] = None) -> int:
+    """Recompute every mechanism's overdue counter in one statement.
+
+    Obligations become overdue as days pass without any write, which the
+    incremental counters cannot see. This sets ``overdue_count`` from a
+    grouped count of overdue obligations per mechanism in a single UPDATE,
+    and is meant to run daily (see the ``nightly_sweep`` command). Every
+    mechanism's ``updated_at`` is stamped, which moves ``chart_version``.
+
+    Args:
+        reference_date: Date to evaluate overdue against (defaults to today)
+
+    Returns:
+        int: Number of mechanisms updated
+    """
+    from obligations.models import Obligation
+
+    overdue_per_mechanism = (
+        Obligation.objects.filter(primary_environmental_mechanism=OuterRef('pk'))
+        .filter(overdue_q(reference_date))
+        .order_by()
+        .values('primary_environmental_mechanism')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    updated = EnvironmentalMechanism.objects.update(
+        updated_at=timezone.now(),
+        **{
+            OVERDUE_COUNT_FIELD: Coalesce(
+                Subquery(overdue_per_mechanism, output_field=IntegerField()),
+                Value(0),
+            )
+        }
+    )
+    return updated
+
+
 def update_all_mechanism_counts() -> int:
     """
     Update obligation counts for all mechanisms.
@@ -1,6 +1,26 @@
 # Stub file for mechanisms.models
+from datetime import date
+from typing import ContextManager, Dict, FrozenSet, Iterable, Optional, Tuple
+
 from django.db import models
 
+STATUS_COUNT_FIELDS: Dict[str, str]
+OVERDUE_COUNT_FIELD: str
+COUNT_FIELDS: Tuple[str, ...]
+CounterState = Tuple[Optional[int], FrozenSet[str]]
+
 class EnvironmentalMechanism(models.Model): ...
 
+def get_counter_buckets(
+    status: str,
+    action_due_date: Optional[date],
+    reference_date: Optional[date] = None,
+) -> FrozenSet[str]: ...
+def apply_counter_transition(
+    old: Optional[CounterState], new: Optional[CounterState]
+) -> None: ...
+def defer_counter_updates() -> ContextManager[None]: ...
+def recount_mechanisms(mechanism_ids: Iterable[Optional[int]]) -> int: ...
+def refresh_overdue_counts(reference_date: Optional[date] = None) -> int: ...
 def update_all_mechanism_counts() -> int: ...
+def chart_version(project_id: int) -> str: ...
@@ -1,22 +1,21 @@
-"""Copyright (C) 2025 Adrian Gallo.
-
-This file is part of Greenova.
-
-Greenova is free software: you can redistribute it and/or modify
-it under the terms of the GNU Affero General Public License as published by
-the Free Software Foundation, either version 3 of the License, or
-(at your option) any later version.
-
-Greenova is distributed in the hope that it will be useful,
-but WITHOUT ANY WARRANTY; without even the implied warranty of
-MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
-GNU Affero General Public License for more details.
-
-You should have received a copy of the GNU Affero General Public License
-along with Greenova. If not, see <https://www.gnu.org/licenses/>.
-
-Author: Adrian Gallo <agallo@enveng-group.com.au>
-"""
+# Copyright (C) 2025 Adrian Gallo.
+#
+# This file is part of Greenova.
+#
+# Greenova is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Greenova is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Greenova. If not, see <https://www.gnu.org/licenses/>.
+#
+# Author: Adrian Gallo <agallo@enveng-group.com.au>
 
 """Protobuf utilities for mechanism data.
 
@@ -25,8 +24,10 @@
 """
 
 from obligations.models import Obligation
-from models import EnvironmentalMechanism
-from django.db.models import QuerySet
+from .chart_data import STATUS_COLORS, STATUS_LABELS, get_chart_payload
+from .models import COUNT_FIELDS, EnvironmentalMechanism
+from django.db.models import QuerySet, Sum
+from django.db.models.functions import Coalesce
 from typing import cast
 from dataclasses import dataclass
 import logging
@@ -121,13 +122,14 @@ def serialize_mechanism_chart_data(
 
 def serialize_overall_chart_data(
     project_id: int,
-    mechanisms: QuerySet,  # QuerySet[EnvironmentalMechanism] if stubs available
+    mechanisms: QuerySet | None = None,  # QuerySet[EnvironmentalMechanism]
 ) -> ChartData:
     """Serialize overall project data to protobuf for chart rendering.
 
     Args:
         project_id: ID of the project.
-        mechanisms: QuerySet of EnvironmentalMechanism objects.
+        mechanisms: QuerySet of EnvironmentalMechanism objects to total, or
+            None for all of the project's mechanisms.
 
     Returns:
         ChartData protobuf message.
@@ -137,15 +139,18 @@ def serialize_overall_chart_data(
     chart_data.mechanism_id = 0  # 0 indicates overall chart
     chart_data.mechanism_name = "Overall Status"
 
-    # Aggregate data
-    not_started: int = sum(m.not_started_count for m in mechanisms)
-    in_progress: int = sum(m.in_progress_count for m in mechanisms)
-    completed: int = sum(m.completed_count for m in mechanisms)
-    overdue: int = sum(m.overdue_count for m in mechanisms)
-
-    statuses: list[str] = ["Not Started", "In Progress", "Completed", "Overdue"]
-    values: list[int] = [not_started, in_progress, completed, overdue]
-    colors: list[str] = ["#f9c74f", "#90be6d", "#43aa8b", "#f94144"]
+    # Aggregate data: the whole project's totals come from the cached chart
+    # payload; any other subset is summed in the database
+    if mechanisms is None:
+        totals = get_chart_payload(project_id)["totals"]
+    else:
+        totals = mechanisms.aggregate(
+            **{field: Coalesce(Sum(field), 0) for field in COUNT_FIELDS}
+        )
+
+    statuses: list[str] = STATUS_LABELS
+    values: list[int] = [totals[field] for field in COUNT_FIELDS]
+    colors: list[str] = STATUS_COLORS
 
     for status, value, color in zip(statuses, values, colors, strict=False):
         segment = chart_data.segments.add()  # type: ignore
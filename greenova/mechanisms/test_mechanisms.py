@@ -5,6 +5,8 @@
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
 from django.contrib.auth.models import AbstractUser
 from django.urls import reverse
 from django.utils import timezone
@@ -14,7 +16,18 @@
     get_mechanism_chart,
     get_overall_chart,
 )
-from mechanisms.models import EnvironmentalMechanism, update_all_mechanism_counts
+from mechanisms.chart_artifacts import (
+    artifact_name,
+    collect_chart_artifacts,
+    mechanism_counts,
+    render_chart_artifacts,
+)
+from mechanisms.chart_data import get_chart_payload
+from mechanisms.models import (
+    EnvironmentalMechanism,
+    recount_mechanisms,
+    update_all_mechanism_counts,
+)
 from obligations.constants import (
     STATUS_COMPLETED,
     STATUS_IN_PROGRESS,
@@ -187,6 +200,53 @@ def test_update_obligation_counts(admin_user: AbstractUser) -> None:
         assert mechanism.completed_count == 1
         assert mechanism.overdue_count == 1
 
+    @staticmethod
+    def test_counters_follow_obligation_writes(admin_user: AbstractUser) -> None:
+        """Test counters are maintained incrementally as obligations change."""
+        project = Project.objects.create(name="Test Project")
+        project.add_member(admin_user, "admin")
+        mechanism1 = EnvironmentalMechanism.objects.create(
+            name="Mechanism 1", project=project
+        )
+        mechanism2 = EnvironmentalMechanism.objects.create(
+            name="Mechanism 2", project=project
+        )
+        yesterday = timezone.now().date() - timedelta(days=1)
+
+        obligation = Obligation.objects.create(
+            obligation_number="PCEMP-001",
+            obligation="Overdue obligation",
+            project=project,
+            primary_environmental_mechanism=mechanism1,
+            status=STATUS_NOT_STARTED,
+            action_due_date=yesterday,
+            environmental_aspect="Air",
+            accountability="Perdaman",
+        )
+        mechanism1.refresh_from_db()
+        assert mechanism1.not_started_count == 1
+        assert mechanism1.overdue_count == 1
+
+        obligation.status = STATUS_COMPLETED
+        obligation.save()
+        mechanism1.refresh_from_db()
+        assert mechanism1.not_started_count == 0
+        assert mechanism1.completed_count == 1
+        assert mechanism1.overdue_count == 0
+
+        # A stale in-memory mechanism save must not reset the counters
+        EnvironmentalMechanism.objects.get(pk=mechanism2.pk).save()
+        obligation.primary_environmental_mechanism = mechanism2
+        obligation.save()
+        mechanism1.refresh_from_db()
+        mechanism2.refresh_from_db()
+        assert mechanism1.completed_count == 0
+        assert mechanism2.completed_count == 1
+
+        obligation.delete()
+        mechanism2.refresh_from_db()
+        assert mechanism2.completed_count == 0
+
     @staticmethod
     def test_update_all_mechanism_counts(admin_user: AbstractUser) -> None:
         """Test updating counts for all mechanisms."""
@@ -246,6 +306,105 @@ def test_update_all_mechanism_counts(admin_user: AbstractUser) -> None:
 
 
 # View Tests
+@pytest.mark.django_db(transaction=True)
+class TestChartPayload:
+    """Test the cached mechanism chart payload."""
+
+    @staticmethod
+    def test_payload_cached_until_counters_change(
+        django_assert_num_queries, settings, tmp_path,
+    ) -> None:
+        """Test repeated reads cost one query and counter changes invalidate them."""
+        # Committed counter changes queue chart artifacts for rendering
+        settings.MEDIA_ROOT = str(tmp_path)
+        cache.clear()
+        project = Project.objects.create(name="Test Project")
+        mechanism = EnvironmentalMechanism.objects.create(
+            name="Mechanism 1", project=project, not_started_count=2
+        )
+        other = EnvironmentalMechanism.objects.create(
+            name="Mechanism 2", project=project, completed_count=3
+        )
+
+        payload = get_chart_payload(project.id)
+        assert payload["project"] == project
+        assert payload["charts"][0]["id"] == "overall"
+        assert payload["charts"][0]["data"] == [2, 0, 3, 0]
+        assert [row["total"] for row in payload["table"]] == [2, 3]
+        # Only the chart version is read
+        with django_assert_num_queries(1):
+            assert get_chart_payload(project.id) == payload
+
+        Obligation.objects.create(
+            obligation_number="PCEMP-001",
+            obligation="New obligation",
+            project=project,
+            primary_environmental_mechanism=mechanism,
+            status=STATUS_IN_PROGRESS,
+            environmental_aspect="Air",
+            accountability="Perdaman",
+        )
+        assert get_chart_payload(project.id)["charts"][0]["data"] == [2, 1, 3, 0]
+
+        # Recounting from the obligations table invalidates too
+        recount_mechanisms([mechanism.id])
+        assert get_chart_payload(project.id)["charts"][1]["data"] == [0, 1, 0, 0]
+
+        # A write by another process is seen without touching this cache
+        EnvironmentalMechanism.objects.filter(pk=mechanism.pk).update(
+            completed_count=4, updated_at=timezone.now()
+        )
+        assert get_chart_payload(project.id)["charts"][1]["data"] == [0, 1, 4, 0]
+
+        # So are a rename and a removed mechanism
+        mechanism.name = "Renamed"
+        mechanism.save(update_fields=["name", "updated_at"])
+        charts = get_chart_payload(project.id)["charts"]
+        assert [chart["name"] for chart in charts if chart["id"] == mechanism.id] == [
+            "Renamed"
+        ]
+        other.delete()
+        assert get_chart_payload(project.id)["charts"][0]["data"] == [0, 1, 4, 0]
+
+
+@pytest.mark.django_db
+class TestChartArtifacts:
+    """Test the stored mechanism status charts."""
+
+    @staticmethod
+    def test_artifacts_follow_counts(settings, tmp_path) -> None:
+        """Test charts are rendered once per count set and stale ones collected."""
+        settings.MEDIA_ROOT = str(tmp_path)
+        cache.clear()
+        project = Project.objects.create(name="Test Project")
+        mechanism = EnvironmentalMechanism.objects.create(
+            name="Test Mechanism", project=project, not_started_count=3
+        )
+        assert mechanism.status_chart_url is None
+
+        counts = mechanism_counts(mechanism)
+        assert render_chart_artifacts(mechanism.pk, counts) == 2
+        assert render_chart_artifacts(mechanism.pk, counts) == 0
+        svg_name = artifact_name(mechanism.pk, counts, "svg")
+        assert mechanism.status_chart_url == default_storage.url(svg_name)
+        with default_storage.open(svg_name) as artifact:
+            assert b"<svg" in artifact.read()
+
+        # New counts get a new artifact; the old ones become garbage
+        mechanism.completed_count = 1
+        assert mechanism.status_chart_url is None
+        render_chart_artifacts(mechanism.pk, mechanism_counts(mechanism))
+        EnvironmentalMechanism.objects.filter(pk=mechanism.pk).update(
+            completed_count=1
+        )
+        assert collect_chart_artifacts() == 2
+        assert not default_storage.exists(svg_name)
+        assert mechanism.status_chart_url
+
+        mechanism.delete()
+        assert collect_chart_artifacts() == 2
+
+
 @pytest.mark.django_db
 class TestMechanismChartView:
     """Test the MechanismChartView."""
@@ -268,11 +268,8 @@ def save_model(
                 '%s obligation %s for project %s',
                 action, obj.obligation_number, obj.project.name
             )
+            # Mechanism counters are maintained by the obligation save signals
             super().save_model(request, obj, form, change)
-
-            # Update mechanism counts
-            if obj.primary_environmental_mechanism:
-                obj.primary_environmental_mechanism.update_obligation_counts()
         except Exception as e:
             logger.error('Error saving obligation: %s', str(e))
             raise
@@ -281,12 +278,8 @@ def save_model(
 
     @admin.action(description='Update recurring forecasted dates')
     def update_recurring_dates(self, request, queryset):
-        """Update recurring forecasted dates for selected obligations."""
-        count = 0
-        for obligation in queryset:
-            if obligation.update_recurring_forecasted_date():
-                obligation.save()
-                count += 1
+        """Roll stale recurring forecasted dates forward for selected obligations."""
+        count = queryset.refresh_recurring_forecasts()
 
         self.message_user(
             request, f'Successfully updated {count} recurring forecasted dates'
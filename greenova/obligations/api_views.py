@@ -1,37 +1,54 @@
-"""Copyright (C) 2025 Adrian Gallo.
+# Copyright (C) 2025 Adrian Gallo.
+#
+# This file is part of Greenova.
+#
+# Greenova is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Greenova is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Greenova. If not, see <https://www.gnu.org/licenses/>.
+#
+# Author: Adrian Gallo <agallo@enveng-group.com.au>
+
+"""Module for API views that handle bulk operations and evidence uploads."""
 
-This file is part of Greenova.
-
-Greenova is free software: you can redistribute it and/or modify
-it under the terms of the GNU Affero General Public License as published by
-the Free Software Foundation, either version 3 of the License, or
-(at your option) any later version.
-
-Greenova is distributed in the hope that it will be useful,
-but WITHOUT ANY WARRANTY; without even the implied warranty of
-MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
-GNU Affero General Public License for more details.
-
-You should have received a copy of the GNU Affero General Public License
-along with Greenova. If not, see <https://www.gnu.org/licenses/>.
-
-Author: Adrian Gallo <agallo@enveng-group.com.au>
-"""
-
-"""Module for API views that handle bulk operations on obligations."""
-
-from models import Obligation
-from django.views.decorators.csrf import csrf_exempt
-from django.views import View
-from django.utils.decorators import method_decorator
-from django.http import HttpRequest, JsonResponse
-from django.contrib.auth.models import AbstractUser
-from django.contrib.auth import get_user_model
-from beartype import beartype
-from typing import TYPE_CHECKING, Any, cast
 import json
 import logging
+from typing import TYPE_CHECKING, Any, TypeAlias, cast
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AbstractUser
+from django.http import HttpRequest, JsonResponse
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 
+from .bulk import (
+    ASYNC_THRESHOLD,
+    BULK_ACTIONS,
+    MAX_IDS,
+    apply_bulk_operation,
+    start_bulk_job,
+    unique_obligation_numbers,
+)
+from .models import BulkOperationJob, EvidenceUpload, Obligation
+from .uploads import (
+    MAX_CHUNK_SIZE,
+    UPLOAD_CHUNK_SIZE,
+    UploadError,
+    abort_upload,
+    append_chunk,
+    complete_upload,
+    start_upload,
+)
 
 if TYPE_CHECKING:
     UserModel = AbstractUser
@@ -41,10 +58,15 @@
 logger = logging.getLogger(__name__)
 
 # Properly define UserType as a TypeAlias for mypy
-type UserType = AbstractUser
+UserType: TypeAlias = AbstractUser
+
+# Past-tense description of each bulk action for response messages
+ACTION_VERBS = {
+    BulkOperationJob.ACTION_COMPLETE: "marked as complete",
+    BulkOperationJob.ACTION_DELETE: "deleted",
+}
 
 
-@beartype
 def _get_validated_user(
     request: HttpRequest,
 ) -> tuple[UserType, None] | tuple[None, JsonResponse]:
@@ -71,33 +93,47 @@ def _get_validated_user(
     return user_instance, None
 
 
-@beartype
-def _parse_and_validate_ids_from_request(
+def _parse_json_body(
     request: HttpRequest,
-) -> tuple[list[str | int], None] | tuple[None, JsonResponse]:
-    """Parse and validate 'ids' from the JSON request body.
+) -> tuple[dict[str, Any], None] | tuple[None, JsonResponse]:
+    """Decode the JSON object in the request body.
 
     Args:
         request: The HTTP request.
 
     Returns:
-        A tuple containing the list of IDs and None if successful,
-        or None and a JsonResponse if validation fails or body is invalid.
+        A tuple containing the decoded object and None if successful,
+        or None and a JsonResponse if the body is missing or invalid.
 
     """
     if not request.body:
         return None, JsonResponse({"error": "Empty request body"}, status=400)
     try:
-        # Type cast the json.loads result to dict[str, Any] for mypy
-        data: dict[str, Any] = cast(
-            "dict[str, Any]", json.loads(request.body.decode("utf-8")))
+        data = json.loads(request.body.decode("utf-8"))
     except json.JSONDecodeError:
         logger.warning("Failed to decode JSON from request body.", exc_info=True)
         return None, JsonResponse({"error": "Invalid JSON payload"}, status=400)
     except UnicodeDecodeError:
         logger.warning("Failed to decode request body as UTF-8.", exc_info=True)
         return None, JsonResponse({"error": "Invalid request encoding"}, status=400)
+    if not isinstance(data, dict):
+        return None, JsonResponse({"error": "Invalid JSON payload"}, status=400)
+    return cast("dict[str, Any]", data), None
+
+
+def _validate_ids(
+    data: dict[str, Any],
+) -> tuple[list[str], None] | tuple[None, JsonResponse]:
+    """Validate the 'ids' list of a decoded request body.
 
+    Args:
+        data: The decoded JSON body.
+
+    Returns:
+        A tuple containing the de-duplicated obligation numbers and None if
+        successful, or None and a JsonResponse if validation fails.
+
+    """
     ids = data.get("ids", [])
     if not (
         isinstance(ids, list)
@@ -113,27 +149,136 @@ def _parse_and_validate_ids_from_request(
             },
             status=400,
         )
-    return ids, None
+    numbers = unique_obligation_numbers(ids)
+    if len(numbers) > MAX_IDS:
+        return None, JsonResponse(
+            {"error": f"Too many ids: at most {MAX_IDS} per request."}, status=400,
+        )
+    return numbers, None
+
+
+def _parse_and_validate_ids_from_request(
+    request: HttpRequest,
+) -> tuple[list[str], None] | tuple[None, JsonResponse]:
+    """Parse and validate 'ids' from the JSON request body.
+
+    Args:
+        request: The HTTP request.
+
+    Returns:
+        A tuple containing the list of IDs and None if successful,
+        or None and a JsonResponse if validation fails or body is invalid.
+
+    """
+    data, error_response = _parse_json_body(request)
+    if error_response is not None:
+        return None, error_response
+    return _validate_ids(data)
+
+
+def _job_payload(job: BulkOperationJob) -> dict[str, Any]:
+    """Serialize a bulk operation job for status responses."""
+    return {
+        "job_id": str(job.pk),
+        "action": job.action,
+        "state": job.state,
+        "total": job.total,
+        "processed": job.processed,
+        "affected": job.affected,
+        "progress": round(job.progress, 4),
+        "error": job.error or None,
+        "status_url": reverse("obligations:bulk_job", args=[job.pk]),
+    }
+
+
+def _run_bulk_action(
+    action: str, ids: list[str], user: UserType, ids_key: str,
+) -> JsonResponse:
+    """Run a bulk action inline, or queue it as a job if the batch is large.
+
+    Args:
+        action: One of the bulk actions.
+        ids: De-duplicated obligation numbers.
+        user: The requesting user.
+        ids_key: Response key echoing the submitted ids for inline runs.
+
+    Returns:
+        JsonResponse with the result (200) or the queued job (202).
+
+    """
+    try:
+        if len(ids) > ASYNC_THRESHOLD:
+            job = start_bulk_job(action, ids, user=user)
+            logger.info(
+                "User %s queued bulk %s job %s for %d obligations",
+                user.pk, action, job.pk, job.total,
+            )
+            return JsonResponse(_job_payload(job), status=202)
+
+        result = apply_bulk_operation(action, ids)
+        logger.info(
+            "User %s applied bulk %s to %d obligations. IDs: %s",
+            user.pk, action, result.affected, ids,
+        )
+        return JsonResponse(
+            {
+                "message": f"{result.affected} obligations {ACTION_VERBS[action]}.",
+                "affected": result.affected,
+                ids_key: ids,
+            },
+            status=200,
+        )
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.error(
+            "Error in bulk %s API for user %s, IDs %s: %s",
+            action,
+            user.pk if user else "Unknown",
+            ids or "Unknown",
+            exc,
+            exc_info=True,
+        )
+        return JsonResponse({"error": "Server error"}, status=500)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
 class MarkObligationsCompleteAPI(View):
     """API endpoint to mark obligations as complete in bulk."""
 
-    @beartype
-    def __init__(self, *args: tuple, **kwargs: dict) -> None:
-        """Initialize the MarkObligationsCompleteAPI view.
+    def post(self, request: HttpRequest, *args: tuple, **kwargs: dict) -> JsonResponse:
+        """API endpoint to mark obligations as complete in bulk.
 
         Args:
+            request: The HTTP request.
             *args: Variable length argument list.
             **kwargs: Arbitrary keyword arguments.
 
+        Returns:
+            JsonResponse indicating success or failure.
+
         """
-        super().__init__(*args, **kwargs)
+        user, error_response = _get_validated_user(request)
+        if error_response is not None:
+            return error_response
 
-    @beartype
-    def post(self, request: HttpRequest, *args: tuple, **kwargs: dict) -> JsonResponse:
-        """API endpoint to mark obligations as complete in bulk.
+        ids, error_response = _parse_and_validate_ids_from_request(request)
+        if error_response is not None:
+            return error_response
+
+        return _run_bulk_action(
+            BulkOperationJob.ACTION_COMPLETE, ids, user, "updated_ids"
+        )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class DeleteObligationsAPI(View):
+    """API endpoint to delete obligations in bulk."""
+
+    def delete(
+            self,
+            request: HttpRequest,
+            *args: tuple,
+            **kwargs: dict) -> JsonResponse:
+        """API endpoint to delete obligations in bulk.
 
         Args:
             request: The HTTP request.
@@ -152,101 +297,312 @@ def post(self, request: HttpRequest, *args: tuple, **kwargs: dict) -> JsonRespon
         if error_response is not None:
             return error_response
 
-        try:
-            updated_count: int = Obligation.objects.filter(
-                obligation_number__in=ids,
-            ).update(status="Complete")
+        return _run_bulk_action(
+            BulkOperationJob.ACTION_DELETE, ids, user, "deleted_ids"
+        )
 
-            logger.info(
-                "User %s marked %d obligations as complete. IDs: %s",
-                user.pk,
-                updated_count,
-                ids,
-            )
 
+@method_decorator(csrf_exempt, name="dispatch")
+class BulkOperationsAPI(View):
+    """API endpoint applying any bulk action to a (possibly large) id set.
+
+    Batches above ``ASYNC_THRESHOLD`` are queued and answered with 202 and
+    a job id; poll ``BulkOperationJobAPI`` for progress.
+    """
+
+    def post(self, request: HttpRequest, *args: tuple, **kwargs: dict) -> JsonResponse:
+        """Apply ``{"action": ..., "ids": [...]}`` to the listed obligations.
+
+        Args:
+            request: The HTTP request.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            JsonResponse with the result or the queued job.
+
+        """
+        user, error_response = _get_validated_user(request)
+        if error_response is not None:
+            return error_response
+
+        data, error_response = _parse_json_body(request)
+        if error_response is not None:
+            return error_response
+
+        action = data.get("action")
+        if action not in BULK_ACTIONS:
+            expected = ", ".join(BULK_ACTIONS)
             return JsonResponse(
-                {
-                    "message": f"{updated_count} obligations marked as complete.",
-                    "updated_ids": ids,
-                },
-                status=200,
-            )
-        except Exception as exc:  # pylint: disable=broad-except
-            logger.error(
-                "Error in mark_complete API for user %s, IDs %s: %s",
-                user.pk if user else "Unknown",
-                ids or "Unknown",
-                exc,
-                exc_info=True,
+                {"error": f"Invalid action: expected one of {expected}."}, status=400,
             )
-            return JsonResponse({"error": "Server error"}, status=500)
 
+        ids, error_response = _validate_ids(data)
+        if error_response is not None:
+            return error_response
+
+        return _run_bulk_action(action, ids, user, "ids")
 
-@method_decorator(csrf_exempt, name="dispatch")
-class DeleteObligationsAPI(View):
-    """API endpoint to delete obligations in bulk."""
 
-    @beartype
-    def __init__(self, *args: tuple, **kwargs: dict) -> None:
-        """Initialize the DeleteObligationsAPI view.
+class BulkOperationJobAPI(View):
+    """API endpoint reporting the progress of a queued bulk operation."""
+
+    def get(
+            self,
+            request: HttpRequest,
+            job_id: str,
+            *args: tuple,
+            **kwargs: dict) -> JsonResponse:
+        """Return the job's state and progress.
 
         Args:
+            request: The HTTP request.
+            job_id: The job's UUID.
             *args: Variable length argument list.
             **kwargs: Arbitrary keyword arguments.
 
+        Returns:
+            JsonResponse with the job status, or 404.
+
         """
-        super().__init__(*args, **kwargs)
+        _, error_response = _get_validated_user(request)
+        if error_response is not None:
+            return error_response
 
-    @beartype
-    def delete(
+        job = BulkOperationJob.objects.filter(pk=job_id).first()
+        if job is None:
+            return JsonResponse({"error": "Job not found"}, status=404)
+        return JsonResponse(_job_payload(job))
+
+
+def _upload_payload(upload: EvidenceUpload) -> dict[str, Any]:
+    """Serialize an evidence upload for status responses."""
+    return {
+        "upload_id": str(upload.pk),
+        "filename": upload.filename,
+        "size": upload.size,
+        "received": upload.received,
+        "state": upload.state,
+        "chunk_size": UPLOAD_CHUNK_SIZE,
+        "max_chunk_size": MAX_CHUNK_SIZE,
+        "upload_url": reverse("obligations:evidence_upload", args=[upload.pk]),
+        "complete_url": reverse(
+            "obligations:evidence_upload_complete", args=[upload.pk]
+        ),
+    }
+
+
+def _upload_error(
+    exc: UploadError, upload: EvidenceUpload | None = None,
+) -> JsonResponse:
+    """Answer a rejected upload request, with the offset to resume from."""
+    payload: dict[str, Any] = {"error": str(exc)}
+    if upload is not None:
+        upload.refresh_from_db(fields=["received", "state"])
+        payload["received"] = upload.received
+    return JsonResponse(payload, status=exc.status)
+
+
+def _get_upload(
+    request: HttpRequest, upload_id: str,
+) -> tuple[EvidenceUpload, None] | tuple[None, JsonResponse]:
+    """Fetch an upload the requesting user started.
+
+    Args:
+        request: The HTTP request.
+        upload_id: The upload's UUID.
+
+    Returns:
+        A tuple containing the upload and None if successful, or None and a
+        JsonResponse if the user is anonymous or the upload is not theirs.
+
+    """
+    if not request.user.is_authenticated:
+        return None, JsonResponse({"error": "Authentication required"}, status=401)
+    uploads = EvidenceUpload.objects.filter(pk=upload_id)
+    if not request.user.is_superuser:
+        uploads = uploads.filter(created_by=request.user)
+    upload = uploads.first()
+    if upload is None:
+        return None, JsonResponse({"error": "Upload not found"}, status=404)
+    return upload, None
+
+
+class EvidenceUploadsAPI(View):
+    """API endpoint opening a chunked, resumable evidence upload.
+
+    Send the chunks to ``upload_url`` with ``PUT``, each with an
+    ``Upload-Offset`` header, then ``POST`` to ``complete_url``. After a
+    dropped connection, ``GET`` the upload and resume from ``received``.
+    """
+
+    def post(self, request: HttpRequest, *args: tuple, **kwargs: dict) -> JsonResponse:
+        """Open an upload described by the JSON body.
+
+        The body holds ``obligation_number``, ``filename``, ``size`` (bytes),
+        ``sha256`` (hex digest of the whole file) and ``description``.
+
+        Args:
+            request: The HTTP request.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            JsonResponse with the new upload (201) or an error.
+
+        """
+        if not request.user.is_authenticated:
+            return JsonResponse({"error": "Authentication required"}, status=401)
+
+        data, error_response = _parse_json_body(request)
+        if error_response is not None:
+            return error_response
+
+        obligation = Obligation.objects.filter(
+            pk=str(data.get("obligation_number", ""))
+        ).first()
+        if obligation is None:
+            return JsonResponse({"error": "Obligation not found"}, status=404)
+
+        try:
+            upload = start_upload(
+                obligation,
+                filename=data.get("filename", ""),
+                size=data.get("size"),
+                sha256=data.get("sha256", ""),
+                description=data.get("description", ""),
+                user=request.user,
+            )
+        except UploadError as exc:
+            return _upload_error(exc)
+        return JsonResponse(_upload_payload(upload), status=201)
+
+
+class EvidenceUploadAPI(View):
+    """API endpoint receiving the chunks of one evidence upload."""
+
+    def get(
             self,
             request: HttpRequest,
+            upload_id: str,
             *args: tuple,
             **kwargs: dict) -> JsonResponse:
-        """API endpoint to delete obligations in bulk.
+        """Return the upload's progress, i.e. the offset to resume from.
 
         Args:
             request: The HTTP request.
+            upload_id: The upload's UUID.
             *args: Variable length argument list.
             **kwargs: Arbitrary keyword arguments.
 
         Returns:
-            JsonResponse indicating success or failure.
+            JsonResponse with the upload status, or an error.
 
         """
-        user, error_response = _get_validated_user(request)
+        upload, error_response = _get_upload(request, upload_id)
         if error_response is not None:
             return error_response
+        return JsonResponse(_upload_payload(upload))
 
-        ids, error_response = _parse_and_validate_ids_from_request(request)
+    def put(
+            self,
+            request: HttpRequest,
+            upload_id: str,
+            *args: tuple,
+            **kwargs: dict) -> JsonResponse:
+        """Write the raw request body at the ``Upload-Offset`` header's offset.
+
+        Args:
+            request: The HTTP request.
+            upload_id: The upload's UUID.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            JsonResponse with the updated upload status, or an error.
+
+        """
+        upload, error_response = _get_upload(request, upload_id)
         if error_response is not None:
             return error_response
 
         try:
-            deleted_count: int = Obligation.objects.filter(
-                obligation_number__in=ids,
-            ).update(status="Deleted")
-
-            logger.info(
-                "User %s marked %d obligations as deleted. IDs: %s",
-                user.pk,
-                deleted_count,
-                ids,
-            )
-
+            offset = int(request.headers.get("Upload-Offset", ""))
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
             return JsonResponse(
-                {
-                    "message": f"{deleted_count} obligations marked as deleted.",
-                    "deleted_ids": ids,
-                },
-                status=200,
+                {"error": "An integer Upload-Offset header is required"}, status=400,
             )
-        except Exception as exc:  # pylint: disable=broad-except
-            logger.error(
-                "Error in delete API for user %s, IDs %s: %s",
-                user.pk if user else "Unknown",
-                ids or "Unknown",
-                exc,
-                exc_info=True,
-            )
-            return JsonResponse({"error": "Server error"}, status=500)
+
+        try:
+            upload = append_chunk(upload, offset, request, length)
+        except UploadError as exc:
+            return _upload_error(exc, upload)
+        return JsonResponse(_upload_payload(upload))
+
+    def delete(
+            self,
+            request: HttpRequest,
+            upload_id: str,
+            *args: tuple,
+            **kwargs: dict) -> JsonResponse:
+        """Abandon the upload and discard its received bytes.
+
+        Args:
+            request: The HTTP request.
+            upload_id: The upload's UUID.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            JsonResponse confirming the upload was discarded, or an error.
+
+        """
+        upload, error_response = _get_upload(request, upload_id)
+        if error_response is not None:
+            return error_response
+        abort_upload(upload)
+        return JsonResponse({"message": "Upload discarded"})
+
+
+class EvidenceUploadCompleteAPI(View):
+    """API endpoint verifying a finished upload and attaching it as evidence."""
+
+    def post(
+            self,
+            request: HttpRequest,
+            upload_id: str,
+            *args: tuple,
+            **kwargs: dict) -> JsonResponse:
+        """Check the file against its SHA-256 and attach it to the obligation.
+
+        Args:
+            request: The HTTP request.
+            upload_id: The upload's UUID.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            JsonResponse describing the evidence file (201), or an error.
+
+        """
+        upload, error_response = _get_upload(request, upload_id)
+        if error_response is not None:
+            return error_response
+
+        try:
+            evidence = complete_upload(upload)
+        except UploadError as exc:
+            return _upload_error(exc, upload)
+        return JsonResponse(
+            {
+                "evidence_id": evidence.pk,
+                "obligation_number": evidence.obligation_id,
+                "name": evidence.display_name,
+                "url": evidence.file.url,
+                "size": evidence.size,
+                "sha256": evidence.sha256,
+                "content_type": evidence.content_type,
+            },
+            status=201,
+        )
@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def _ensure_search_index(sender, using="default", **kwargs):
+    from obligations.search import ensure_search_index
+
+    ensure_search_index(using=using)
 
 
 class ObligationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "obligations"
+
+    def ready(self):
+        """Hook up the search index and evidence thumbnail generation."""
+        from core.utils.thumbnails import register_thumbnail_field
+
+        post_migrate.connect(_ensure_search_index, sender=self)
+        register_thumbnail_field(self.get_model("ObligationEvidence"), "file")
@@ -0,0 +1,205 @@
+"""
+Bulk operations over large sets of obligations.
+
+Obligation numbers are processed in fixed-size chunks, each in its own
+transaction, with per-row counter transitions deferred. Every mechanism the
+operation touched is then recounted once with a single grouped query, so
+the dashboard counters end up exact however many rows changed. Batches
+larger than ``ASYNC_THRESHOLD`` run as a ``BulkOperationJob`` on a
+background thread and report progress through the job record.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, Set, Tuple
+
+from core.utils.executors import LazyExecutor
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from mechanisms.models import defer_counter_updates, recount_mechanisms
+
+from .constants import STATUS_COMPLETED
+from .models import BulkOperationJob, Obligation
+
+logger = logging.getLogger(__name__)
+
+# Obligations written per transaction
+CHUNK_SIZE = 500
+# Largest id list a single request may submit
+MAX_IDS = 50_000
+# Batches above this size are queued as a job instead of run in the request
+ASYNC_THRESHOLD = 2_000
+
+BULK_ACTIONS = (BulkOperationJob.ACTION_COMPLETE, BulkOperationJob.ACTION_DELETE)
+
+ChunkCallback = Callable[[int, int, Set[int]], None]
+
+# One worker: jobs run in submission order and never contend with each
+# other for the same rows
+_executor = LazyExecutor(max_workers=1, thread_name_prefix="obligation-bulk")
+
+
+@dataclass(frozen=True)
+class BulkResult:
+    """Outcome of a bulk operation."""
+
+    processed: int
+    affected: int
+    mechanisms_recounted: int
+
+
+def unique_obligation_numbers(ids: Iterable[object]) -> list[str]:
+    """Return the ids as obligation numbers, de-duplicated in order."""
+    return list(dict.fromkeys(str(value).strip() for value in ids))
+
+
+def _apply_chunk(action: str, numbers: list[str]) -> Tuple[int, Set[int]]:
+    """Apply ``action`` to one chunk and return (rows affected, mechanism ids)."""
+    queryset = Obligation.objects.filter(obligation_number__in=numbers)
+    with transaction.atomic(), defer_counter_updates():
+        mechanism_ids = set(
+            queryset.order_by()
+            .values_list("primary_environmental_mechanism", flat=True)
+            .distinct()
+        )
+        if action == BulkOperationJob.ACTION_DELETE:
+            _, deleted = queryset.delete()
+            return deleted.get(Obligation._meta.label, 0), mechanism_ids
+
+        pending = queryset.exclude(status=STATUS_COMPLETED)
+        # Completing a recurring obligation rolls it to its next occurrence,
+        # which the pre_save signal handles, so those rows are saved one by one
+        recurring = list(pending.filter(recurring_obligation=True))
+        for obligation in recurring:
+            obligation.status = STATUS_COMPLETED
+            obligation.save()
+        completed = pending.filter(recurring_obligation=False).update(
+            status=STATUS_COMPLETED, updated_at=timezone.now()
+        )
+        return completed + len(recurring), mechanism_ids
+
+
+def apply_bulk_operation(
+    action: str,
+    ids: Iterable[object],
+    chunk_size: int = CHUNK_SIZE,
+    start: int = 0,
+    mechanism_ids: Iterable[int] = (),
+    on_chunk: Optional[ChunkCallback] = None,
+) -> BulkResult:
+    """
+    Apply ``action`` to the obligations in ``ids``, chunk by chunk.
+
+    Args:
+        action: One of ``BULK_ACTIONS``
+        ids: Obligation numbers
+        chunk_size: Obligations per transaction
+        start: Offset into the de-duplicated ids to resume from
+        mechanism_ids: Mechanisms touched by chunks before ``start``
+        on_chunk: Called after each chunk with (processed so far, rows
+            affected by the chunk, mechanisms touched so far)
+
+    Returns:
+        BulkResult: Totals for this run
+    """
+    if action not in BULK_ACTIONS:
+        raise ValueError(f"Unknown bulk action '{action}'")
+    numbers = unique_obligation_numbers(ids)
+    touched = set(mechanism_ids)
+    affected = 0
+    processed = start
+    for offset in range(start, len(numbers), chunk_size):
+        chunk = numbers[offset:offset + chunk_size]
+        chunk_affected, chunk_mechanisms = _apply_chunk(action, chunk)
+        affected += chunk_affected
+        touched |= chunk_mechanisms
+        processed = offset + len(chunk)
+        if on_chunk is not None:
+            on_chunk(processed, chunk_affected, touched)
+
+    recounted = recount_mechanisms(touched)
+    logger.info(
+        "Bulk %s: %d obligations processed, %d affected, %d mechanisms recounted",
+        action, processed, affected, recounted,
+    )
+    return BulkResult(processed, affected, recounted)
+
+
+def run_bulk_job(job_id) -> BulkOperationJob:
+    """
+    Run (or resume) a queued bulk operation job to completion.
+
+    Args:
+        job_id: Primary key of the ``BulkOperationJob``
+
+    Returns:
+        BulkOperationJob: The job, refreshed after the run
+    """
+    job = BulkOperationJob.objects.get(pk=job_id)
+    if job.state == BulkOperationJob.STATE_SUCCEEDED:
+        return job
+    jobs = BulkOperationJob.objects.filter(pk=job.pk)
+    jobs.update(state=BulkOperationJob.STATE_RUNNING, updated_at=timezone.now())
+
+    def record_progress(processed: int, chunk_affected: int, touched: Set[int]) -> None:
+        jobs.update(
+            processed=processed,
+            affected=F("affected") + chunk_affected,
+            mechanism_ids=sorted(touched),
+            updated_at=timezone.now(),
+        )
+
+    try:
+        apply_bulk_operation(
+            job.action,
+            job.obligation_numbers,
+            start=job.processed,
+            mechanism_ids=job.mechanism_ids,
+            on_chunk=record_progress,
+        )
+    except Exception as e:  # pylint: disable=broad-except
+        logger.exception("Bulk operation job %s failed", job.pk)
+        jobs.update(
+            state=BulkOperationJob.STATE_FAILED, error=str(e), updated_at=timezone.now()
+        )
+    else:
+        jobs.update(state=BulkOperationJob.STATE_SUCCEEDED, updated_at=timezone.now())
+    job.refresh_from_db()
+    return job
+
+
+def _run_in_background(job_id) -> None:
+    try:
+        run_bulk_job(job_id)
+    finally:
+        # Worker threads hold their own connections; don't leak them
+        close_old_connections()
+
+
+def start_bulk_job(action: str, ids: Iterable[object], user=None) -> BulkOperationJob:
+    """
+    Queue a bulk operation to run in the background.
+
+    The job is handed to the worker thread once the current transaction
+    commits, so the worker always sees the job row.
+
+    Args:
+        action: One of ``BULK_ACTIONS``
+        ids: Obligation numbers
+        user: User who requested the operation
+
+    Returns:
+        BulkOperationJob: The queued job; poll it for progress
+    """
+    if action not in BULK_ACTIONS:
+        raise ValueError(f"Unknown bulk action '{action}'")
+    numbers = unique_obligation_numbers(ids)
+    job = BulkOperationJob.objects.create(
+        action=action,
+        obligation_numbers=numbers,
+        total=len(numbers),
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+    transaction.on_commit(lambda: _executor.submit(_run_in_background, job.pk))
+    return job
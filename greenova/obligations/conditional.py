@@ -0,0 +1,100 @@
+"""
+Conditional GET for views that show a project's obligation data.
+
+HTMX polls the chart partials and JSON endpoints repeatedly while the data
+behind them rarely changes. ``project_conditional`` gives such a view an
+ETag derived from one small aggregate over the project's obligations (row
+count and latest ``updated_at``), the project's mechanism chart version
+(``chart_version``) and today's date, since overdue counts change at
+midnight without any write. Django's ``condition`` decorator compares it
+with ``If-None-Match`` and answers ``304 Not Modified`` before the view
+runs any of its own queries.
+
+No ``Last-Modified`` is sent: deleting an obligation does not move the
+latest ``updated_at``, so a date alone could not detect it.
+"""
+
+import hashlib
+from typing import Any, Callable, Optional
+
+from django.db.models import Count, Max
+from django.http import HttpRequest
+from django.utils import timezone
+from django.views.decorators.http import condition
+from mechanisms.models import chart_version
+
+from .models import Obligation
+
+ProjectIdGetter = Callable[..., Optional[Any]]
+
+
+def project_validator(project_id: Any) -> str:
+    """
+    Return a value that changes whenever a project's obligation data does.
+
+    Args:
+        project_id: Project primary key
+
+    Returns:
+        str: Opaque validator, stable while nothing about the project changes
+    """
+    state = Obligation.objects.filter(project_id=project_id).aggregate(
+        count=Count("pk"), updated=Max("updated_at")
+    )
+    updated = state["updated"].timestamp() if state["updated"] else 0
+    parts = [
+        project_id,
+        chart_version(project_id),
+        state["count"],
+        updated,
+        timezone.localdate().isoformat(),
+    ]
+    return hashlib.sha1(
+        ":".join(str(part) for part in parts).encode(), usedforsecurity=False
+    ).hexdigest()
+
+
+def project_id_from_query(
+    request: HttpRequest, *args: Any, **kwargs: Any
+) -> Optional[int]:
+    """Read a numeric ``project_id`` from the query string."""
+    project_id = request.GET.get("project_id", "")
+    return int(project_id) if project_id.isdigit() else None
+
+
+def project_id_from_url(
+    request: HttpRequest, *args: Any, **kwargs: Any
+) -> Optional[int]:
+    """Read a numeric ``project_id`` captured by the URL pattern."""
+    project_id = str(kwargs.get("project_id", ""))
+    return int(project_id) if project_id.isdigit() else None
+
+
+def project_conditional(
+    get_project_id: ProjectIdGetter = project_id_from_query,
+) -> Callable:
+    """
+    Decorate a view so unchanged project data is answered with a 304.
+
+    Requests without a valid project id, or from anonymous users, are passed
+    through untouched so the view can reject them as it normally would.
+
+    Args:
+        get_project_id: Called with the view's arguments; returns the project
+            primary key, or None
+
+    Returns:
+        Callable: View decorator
+    """
+
+    def etag(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[str]:
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            return None
+        project_id = get_project_id(request, *args, **kwargs)
+        if project_id is None:
+            return None
+        # Scoped to the user, since rendered partials can differ between users
+        return f"{project_validator(project_id)}-{user.pk}"
+
+    return condition(etag_func=etag)
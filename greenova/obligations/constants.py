@@ -13,6 +13,9 @@
     (STATUS_COMPLETED, 'Completed')
 ]
 
+# Prefix for generated obligation numbers (PCEMP-XXX)
+OBLIGATION_NUMBER_PREFIX = 'PCEMP-'
+
 # Due date periods for filtering
 DUE_PERIOD_OVERDUE = 'overdue'
 DUE_PERIOD_THIS_WEEK = 'this_week'
@@ -75,3 +78,76 @@
     FREQUENCY_BIANNUAL: 182,  # Approximate
     FREQUENCY_ANNUAL: 365,  # Approximate
 }
+
+# Register spreadsheet headers -> import column names used by
+# clean_csv_to_import and import_obligations
+IMPORT_COLUMN_MAPPING = {
+    'Project_Name': 'project__name',
+    'Primary_Environmental_Mechanism': 'primary__environmental__mechanism',
+    'Procedure': 'procedure',
+    'Environmental_Aspect': 'environmental__aspect',
+    'Obligation Number': 'obligation__number',
+    'Obligation': 'obligation',
+    'Accountability': 'accountability',
+    'Responsibility': 'responsibility',
+    'ProjectPhase': 'project_phase',
+    'Action_DueDate': 'action__due_date',
+    'Close_Out_Date': 'close__out__date',
+    'Status': 'status',
+    'Supporting Information': 'supporting__information',
+    'General Comments': 'general__comments',
+    'Compliance Comments': 'compliance__comments',
+    'NonConformance Comments': 'non_conformance__comments',
+    'Evidence': 'evidence',
+    'Recurring Obligation': 'recurring__obligation',
+    'Recurring Frequency': 'recurring__frequency',
+    'Recurring Status': 'recurring__status',
+    'Recurring Forcasted Date': 'recurring__forcasted__date',
+    'Inspection': 'inspection',
+    'Inspection Frequency': 'inspection__frequency',
+    'Site or Desktop': 'site_or__desktop',
+    'New Control, action required ': 'new__control__action_required',
+    'Obligation type': 'obligation_type',
+    'Gap Analysis': 'gap__analysis',
+    'Notes for Gap Analysis': 'notes_for__gap__analysis'
+}
+
+# Register spreadsheet headers -> Obligation lookups written by the export
+# view; the headers match IMPORT_COLUMN_MAPPING so exports can be re-imported
+EXPORT_COLUMNS: List[Tuple[str, str]] = [
+    ('Project_Name', 'project__name'),
+    ('Primary_Environmental_Mechanism', 'primary_environmental_mechanism__name'),
+    ('Procedure', 'procedure'),
+    ('Environmental_Aspect', 'environmental_aspect'),
+    ('Obligation Number', 'obligation_number'),
+    ('Obligation', 'obligation'),
+    ('Accountability', 'accountability'),
+    ('Responsibility', 'responsibility'),
+    ('ProjectPhase', 'project_phase'),
+    ('Action_DueDate', 'action_due_date'),
+    ('Close_Out_Date', 'close_out_date'),
+    ('Status', 'status'),
+    ('Supporting Information', 'supporting_information'),
+    ('General Comments', 'general_comments'),
+    ('Compliance Comments', 'compliance_comments'),
+    ('NonConformance Comments', 'non_conformance_comments'),
+    ('Evidence', 'evidence_notes'),
+    ('Recurring Obligation', 'recurring_obligation'),
+    ('Recurring Frequency', 'recurring_frequency'),
+    ('Recurring Status', 'recurring_status'),
+    ('Recurring Forcasted Date', 'recurring_forcasted_date'),
+    ('Inspection', 'inspection'),
+    ('Inspection Frequency', 'inspection_frequency'),
+    ('Site or Desktop', 'site_or_desktop'),
+    ('New Control, action required ', 'new_control_action_required'),
+    ('Obligation type', 'obligation_type'),
+    ('Gap Analysis', 'gap_analysis'),
+    ('Notes for Gap Analysis', 'notes_for_gap_analysis'),
+]
+
+# Evidence file limits, shared by the upload form and chunked uploads
+EVIDENCE_EXTENSIONS: List[str] = [
+    'pdf', 'doc', 'docx', 'xls', 'xlsx', 'png', 'jpg', 'jpeg', 'gif', 'txt', 'csv',
+]
+EVIDENCE_MAX_SIZE = 25 * 1024 * 1024  # 25MB
+EVIDENCE_MAX_FILES = 5
@@ -6,3 +6,9 @@
 FREQUENCY_DISPLAY_NAMES: dict[str, str]
 FREQUENCY_ALIASES: dict[str, str]
 FREQUENCY_DAYS: dict[str, int]
+OBLIGATION_NUMBER_PREFIX: str
+IMPORT_COLUMN_MAPPING: dict[str, str]
+EXPORT_COLUMNS: List[Tuple[str, str]]
+EVIDENCE_EXTENSIONS: List[str]
+EVIDENCE_MAX_SIZE: int
+EVIDENCE_MAX_FILES: int
@@ -0,0 +1,242 @@
+"""
+Streaming CSV and XLSX export of obligation querysets.
+
+Rows are read with ``values_list(...).iterator()``, so no model instances are
+built and only one database chunk is held at a time, and they are encoded
+and yielded as they arrive. The XLSX writer emits the workbook as a zip
+stream instead of assembling it in memory (which openpyxl requires), so
+the first bytes reach the client before the last row has been read.
+
+Text that a spreadsheet would evaluate as a formula (starting with ``=``,
+``+``, ``-``, ``@``, tab or carriage return) is written with a leading
+``'``, so a crafted obligation cannot run a formula on the reader's machine.
+"""
+
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from django.db.models import QuerySet
+
+from .constants import EXPORT_COLUMNS
+
+# Rows fetched per database round trip
+EXPORT_CHUNK_SIZE = 2000
+# Encoded bytes buffered before yielding a chunk to the response
+STREAM_BUFFER_SIZE = 64 * 1024
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Characters XML 1.0 cannot represent, even escaped
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+# Excel's serial day zero (with its 1900 leap-year bug folded in)
+_EXCEL_EPOCH = date(1899, 12, 30)
+# Leading characters that make spreadsheet applications read text as a formula
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_formula(value: Any) -> Any:
+    """Prefix text a spreadsheet would evaluate as a formula with ``'``.
+
+    Only strings are changed, so numbers and dates keep their sign.
+    """
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_export_rows(
+    queryset: QuerySet,
+    columns: Sequence[Tuple[str, str]] = EXPORT_COLUMNS,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[Tuple[Any, ...]]:
+    """Yield one value tuple per obligation, in ``columns`` order."""
+    lookups = [lookup for _, lookup in columns]
+    return queryset.values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+def stream_csv(
+    rows: Iterable[Sequence[Any]], headers: Sequence[str]
+) -> Iterator[bytes]:
+    """
+    Encode rows as UTF-8 CSV (with a BOM so Excel detects the encoding).
+
+    Args:
+        rows: Value tuples
+        headers: Header row
+
+    Yields:
+        bytes: CSV data in chunks of roughly ``STREAM_BUFFER_SIZE``
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(headers)
+    for row in rows:
+        writer.writerow(
+            ["" if value is None else escape_formula(value) for value in row]
+        )
+        if buffer.tell() >= STREAM_BUFFER_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+class _ZipStream:
+    """Write-only file object that hands zip output back in chunks.
+
+    ``zipfile`` falls back to data descriptors when it cannot seek, which
+    lets each member be written once, front to back.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    "</Types>"
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats'
+    '.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats'
+    '.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/><Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+    'styles" Target="styles.xml"/></Relationships>'
+)
+# Style 1 is the built-in short date format (numFmtId 14)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+    '<borders count="1"><border/></borders>'
+    '<cellStyleXfs count="1"><xf/></cellStyleXfs>'
+    '<cellXfs count="2"><xf/><xf numFmtId="14" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/>'
+    "</cellStyles></styleSheet>"
+)
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "<sheetData>"
+)
+_SHEET_END = "</sheetData></worksheet>"
+
+
+def _xlsx_cell(value: Any) -> str:
+    if value is None or value == "":
+        return "<c/>"
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f"<c><v>{value}</v></c>"
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return f'<c s="1"><v>{(value - _EXCEL_EPOCH).days}</v></c>'
+    text = escape(_INVALID_XML_CHARS.sub("", str(escape_formula(value))))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values: Iterable[Any]) -> str:
+    return "<row>" + "".join(_xlsx_cell(value) for value in values) + "</row>"
+
+
+def stream_xlsx(
+    rows: Iterable[Sequence[Any]],
+    headers: Sequence[str],
+    sheet_name: Optional[str] = "Obligations",
+) -> Iterator[bytes]:
+    """
+    Encode rows as a single-sheet XLSX workbook, streamed as it is written.
+
+    Dates become real Excel dates, booleans real booleans, and text is
+    written as inline strings, so no shared-string table has to be held
+    in memory.
+
+    Args:
+        rows: Value tuples
+        headers: Header row
+        sheet_name: Worksheet name
+
+    Yields:
+        bytes: Zip data in chunks of roughly ``STREAM_BUFFER_SIZE``
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as workbook:
+        workbook.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        workbook.writestr("_rels/.rels", _ROOT_RELS)
+        workbook.writestr(
+            "xl/workbook.xml",
+            _WORKBOOK.format(name=escape(sheet_name or "Sheet1", {'"': "&quot;"})),
+        )
+        workbook.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        workbook.writestr("xl/styles.xml", _STYLES)
+        yield stream.drain()
+
+        with workbook.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((_SHEET_START + _xlsx_row(headers)).encode("utf-8"))
+            pending: List[str] = []
+            pending_size = 0
+            for row in rows:
+                xml = _xlsx_row(row)
+                pending.append(xml)
+                pending_size += len(xml)
+                if pending_size >= STREAM_BUFFER_SIZE:
+                    sheet.write("".join(pending).encode("utf-8"))
+                    pending.clear()
+                    pending_size = 0
+                    yield stream.drain()
+            sheet.write(("".join(pending) + _SHEET_END).encode("utf-8"))
+    yield stream.drain()
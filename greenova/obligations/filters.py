@@ -0,0 +1,85 @@
+"""
+Obligation filter specifications for charts.
+
+Chart views used to materialize the filtered obligations as a list of
+primary keys and hand it back to the chart query as ``pk__in``, which grows
+with the filter result and is one more query per chart. An
+``ObligationFilterSpec`` instead describes the filter itself; chart
+functions compile it with ``as_q`` into the WHERE clause of their own
+aggregate query, so a filtered chart is a single query of any size.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Mapping, Optional
+
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from .utils import overdue_q
+
+# Look-ahead windows accepted in request parameters, in days
+LOOKAHEAD_WINDOWS: Dict[str, int] = {"14days": 14, "30days": 30}
+
+
+@dataclass(frozen=True)
+class ObligationFilterSpec:
+    """Filters on obligations, compiled into a query predicate.
+
+    Empty values mean "no filter". Due-date filters are evaluated against
+    ``reference_date`` (today when not given).
+    """
+
+    phase: str = ""
+    responsibility: str = ""
+    status: str = ""
+    due_within_days: Optional[int] = None
+    overdue_only: bool = False
+    reference_date: Optional[date] = None
+
+    @classmethod
+    def from_params(cls, params: Mapping[str, Any]) -> "ObligationFilterSpec":
+        """Build a spec from a chart view's request parameters.
+
+        Reads ``phase``, ``responsibility``, ``status``, ``lookahead``
+        (``14days`` or ``30days``) and ``overdue`` (``true``).
+        """
+        return cls(
+            phase=params.get("phase", ""),
+            responsibility=params.get("responsibility", ""),
+            status=params.get("status", ""),
+            due_within_days=LOOKAHEAD_WINDOWS.get(params.get("lookahead", "")),
+            overdue_only=params.get("overdue", "") == "true",
+        )
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.phase
+            or self.responsibility
+            or self.status
+            or self.due_within_days is not None
+            or self.overdue_only
+        )
+
+    def as_q(self) -> Q:
+        """Return the predicate matching obligations that pass every filter."""
+        today = self.reference_date or timezone.now().date()
+        condition = Q()
+        if self.phase:
+            condition &= Q(project_phase=self.phase)
+        if self.responsibility:
+            condition &= Q(responsibility=self.responsibility)
+        if self.status:
+            condition &= Q(status=self.status)
+        if self.due_within_days is not None:
+            condition &= Q(
+                action_due_date__gte=today,
+                action_due_date__lte=today + timedelta(days=self.due_within_days),
+            )
+        if self.overdue_only:
+            condition &= overdue_q(today)
+        return condition
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        """Filter an obligation queryset by this spec."""
+        return queryset.filter(self.as_q()) if self else queryset
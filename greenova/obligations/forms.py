@@ -10,6 +10,9 @@
 from responsibility.models import Responsibility
 
 from .constants import (
+    EVIDENCE_EXTENSIONS,
+    EVIDENCE_MAX_FILES,
+    EVIDENCE_MAX_SIZE,
     FREQUENCY_CHOICES,  # Import RESPONSIBILITY_ROLES
     STATUS_CHOICES,
     STATUS_COMPLETED,
@@ -678,29 +681,15 @@ def clean_file(self):
         file = self.cleaned_data.get("file")
         if file:
             # Validate file size (25MB limit)
-            if file.size > 26214400:  # 25MB in bytes
+            if file.size > EVIDENCE_MAX_SIZE:
                 raise ValidationError("File size must be under 25MB")
 
             # Validate file extension
-            allowed_extensions = [
-                "pdf",
-                "doc",
-                "docx",
-                "xls",
-                "xlsx",
-                "png",
-                "jpg",
-                "jpeg",
-                "gif",
-                "txt",
-                "csv",
-            ]
-
             file_ext = file.name.split(".")[-1].lower()
-            if file_ext not in allowed_extensions:
+            if file_ext not in EVIDENCE_EXTENSIONS:
                 raise ValidationError(
                     f"File type not allowed. Allowed types: "
-                    f"{', '.join(allowed_extensions)}"
+                    f"{', '.join(EVIDENCE_EXTENSIONS)}"
                 )
 
             # Check if this obligation already has 5 files
@@ -709,7 +698,7 @@ def clean_file(self):
                     ObligationEvidence.objects.filter(
                         obligation=self.instance.obligation
                     ).count()
-                    >= 5
+                    >= EVIDENCE_MAX_FILES
                 ):
                     raise ValidationError(
                         "Maximum of 5 evidence files allowed per obligation"
@@ -0,0 +1,31 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from obligations.constants import OBLIGATION_NUMBER_PREFIX
+from obligations.models import ObligationNumberSequence
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Seed the obligation number sequence from existing obligations'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prefix',
+            default=OBLIGATION_NUMBER_PREFIX,
+            help=f'Obligation number prefix to seed (default: {OBLIGATION_NUMBER_PREFIX})'
+        )
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+
+        self.stdout.write(f"Seeding obligation number sequence for '{prefix}'...")
+
+        highest = ObligationNumberSequence.highest_existing_number(prefix)
+        sequence = ObligationNumberSequence.seed(prefix)
+
+        self.stdout.write(f"Highest existing number: {highest}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Sequence '{prefix}' now at {sequence.last_value}; "
+            f"next number is {prefix}{sequence.last_value + 1:03d}"
+        ))
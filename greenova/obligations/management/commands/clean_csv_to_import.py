@@ -1,8 +1,11 @@
+import codecs
 import logging
 import os
-import re
+from itertools import islice
 
 from django.core.management.base import BaseCommand
+from obligations.constants import IMPORT_COLUMN_MAPPING
+from obligations.utils import OPENPYXL_AVAILABLE, iter_xlsx_rows
 
 # Set up logger at module level
 logger = logging.getLogger(__name__)
@@ -19,6 +22,23 @@
         "pip install pandas numpy"
     )
 
+# pyarrow is only needed for --format parquet
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+XLSX_SUFFIXES = ('.xlsx', '.xlsm')
+
+# Rows per DataFrame when an XLSX file is cleaned without --chunk-size
+XLSX_DEFAULT_CHUNK_SIZE = 10000
+
+BOOLEAN_COLUMNS = [
+    'recurring__obligation', 'inspection', 'new__control__action_required'
+]
+
 
 class Command(BaseCommand):
     """
@@ -28,11 +48,16 @@ class Command(BaseCommand):
     """
     help = 'Clean CSV data to match Django models schema'
 
+    # Per-column diagnostics are only printed for the first chunk
+    _report_details = True
+
     def add_arguments(self, parser):
         """
         Add command line arguments.
         """
-        parser.add_argument('input_file', type=str, help='Path to the dirty CSV file')
+        parser.add_argument(
+            'input_file', type=str, help='Path to the dirty CSV or XLSX file'
+        )
         parser.add_argument(
             '--output',
             dest='output_file',
@@ -40,6 +65,34 @@ def add_arguments(self, parser):
             help='Path where the cleaned CSV will be saved',
             default='clean_output_with_nulls.csv'
         )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help=(
+                'Stream the input in chunks of this many rows so memory is '
+                'bounded by the chunk size rather than the file size'
+            )
+        )
+        parser.add_argument(
+            '--format',
+            dest='output_format',
+            choices=['csv', 'parquet'],
+            default='csv',
+            help='Output format; parquet requires pyarrow (default: csv)'
+        )
+        parser.add_argument(
+            '--sheet',
+            type=str,
+            default=None,
+            help='XLSX worksheet name or zero-based index (default: active sheet)'
+        )
+        parser.add_argument(
+            '--header-row',
+            type=int,
+            default=None,
+            help='1-based XLSX header row (default: detected)'
+        )
 
     def handle(self, *args, **options):
         """
@@ -60,6 +113,25 @@ def handle(self, *args, **options):
 
         file_path = options['input_file']
         out_path = options['output_file']
+        output_format = options.get('output_format', 'csv')
+
+        if file_path.lower().endswith(XLSX_SUFFIXES) and not OPENPYXL_AVAILABLE:
+            self.stderr.write(
+                self.style.ERROR(
+                    "Reading XLSX requires openpyxl. "
+                    "Please install it with: pip install openpyxl"
+                )
+            )
+            return
+
+        if output_format == 'parquet' and not ARROW_AVAILABLE:
+            self.stderr.write(
+                self.style.ERROR(
+                    "Parquet output requires pyarrow. "
+                    "Please install it with: pip install pyarrow"
+                )
+            )
+            return
 
         if not os.path.exists(file_path):
             self.stderr.write(
@@ -68,7 +140,14 @@ def handle(self, *args, **options):
             return
 
         try:
-            self.clean_csv(file_path, out_path)
+            self.clean_csv(
+                file_path,
+                out_path,
+                chunk_size=options.get('chunk_size'),
+                output_format=output_format,
+                sheet=options.get('sheet'),
+                header_row=options.get('header_row'),
+            )
             self.stdout.write(
                 self.style.SUCCESS(
                     f"Successfully cleaned CSV data and saved to {out_path}"
@@ -92,30 +171,114 @@ def handle(self, *args, **options):
                 self.style.ERROR(f"Unexpected error cleaning CSV: {str(e)}")
             )
 
-    def clean_csv(self, filepath: str, outpath: str) -> None:
+    def clean_csv(
+        self,
+        filepath: str,
+        outpath: str,
+        chunk_size: int | None = None,
+        output_format: str = 'csv',
+        sheet: str | None = None,
+        header_row: int | None = None
+    ) -> None:
         """
         Clean and format CSV data to match Django models schema.
 
+        With ``chunk_size`` the input is read and cleaned one chunk at a time
+        and each cleaned chunk is appended to the output, so peak memory is
+        bounded by the chunk size instead of the file size.
+
         Args:
-            filepath: Path to the dirty CSV file
-            outpath: Path where the cleaned CSV will be saved
+            filepath: Path to the dirty CSV or XLSX file
+            outpath: Path where the cleaned output will be saved
+            chunk_size: Rows per chunk, or None to clean the file in one pass
+            output_format: 'csv' or 'parquet'
+            sheet: XLSX worksheet name or zero-based index
+            header_row: 1-based XLSX header row, detected if None
         """
-        logger.info("Reading CSV file from %s", filepath)
+        logger.info("Reading input file from %s", filepath)
 
-        # Read the dirty CSV file, handling potential encoding issues
+        if filepath.lower().endswith(XLSX_SUFFIXES):
+            chunks = self._read_xlsx_chunks(
+                filepath, chunk_size or XLSX_DEFAULT_CHUNK_SIZE, sheet, header_row
+            )
+        else:
+            # Read the dirty CSV file, handling potential encoding issues. Every
+            # column is read as text so chunks cannot infer different dtypes.
+            encoding = self._detect_encoding(filepath)
+            read_options = {'encoding': encoding, 'dtype': str}
+            if chunk_size:
+                chunks = pd.read_csv(filepath, chunksize=chunk_size, **read_options)
+            else:
+                chunks = iter([pd.read_csv(filepath, **read_options)])
+
+        writer = _ChunkWriter(outpath, output_format)
+        rows = 0
+        columns: list[str] = []
+        self._report_details = True
         try:
-            df = pd.read_csv(filepath, encoding='utf-8')
-        except UnicodeDecodeError:
-            # Try with another common encoding if utf-8 fails
-            df = pd.read_csv(filepath, encoding='ISO-8859-1')
+            for index, df in enumerate(chunks):
+                # Skip header row if it contains instructions instead of data
+                if index == 0 and self._is_instruction_row(df):
+                    self.stdout.write("Skipping instruction row")
+                    df = df.iloc[1:].reset_index(drop=True)
+
+                df = self._clean_frame(df)
+                if index == 0:
+                    columns = df.columns.tolist()
+                else:
+                    df = df.reindex(columns=columns)
+
+                writer.write(df)
+                rows += len(df)
+                self._report_details = False
+                if chunk_size:
+                    self.stdout.write(f"Cleaned {rows} rows")
+        finally:
+            writer.close()
 
-        # Skip header row if it contains instructions instead of data
-        if (df.shape[0] > 0 and
-                ('project name' in str(df.iloc[0].values).lower() or
-                 'this is now the project name' in str(df.iloc[0].values).lower())):
-            self.stdout.write("Skipping instruction row")
-            df = df.iloc[1:].reset_index(drop=True)
+        logger.info("Cleaned data exported to %s", outpath)
+        self.stdout.write(
+            f"{output_format.upper()} exported {rows} rows and {len(columns)} columns"
+        )
 
+    def _read_xlsx_chunks(
+        self,
+        filepath: str,
+        chunk_size: int,
+        sheet: str | None,
+        header_row: int | None
+    ):
+        """Yield DataFrames of streamed worksheet rows, shaped like read_csv's."""
+        rows = iter_xlsx_rows(filepath, sheet=sheet, header_row=header_row)
+        while chunk := list(islice(rows, chunk_size)):
+            # Empty cells come back as '', read_csv would give NaN
+            yield pd.DataFrame(chunk, dtype=str).replace({'': np.nan})
+
+    def _detect_encoding(self, filepath: str) -> str:
+        """Return 'utf-8' if the whole file decodes as UTF-8, else ISO-8859-1."""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            with open(filepath, 'rb') as fh:
+                for block in iter(lambda: fh.read(1 << 20), b''):
+                    decoder.decode(block)
+                decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            # Fall back to another common encoding if utf-8 fails
+            return 'ISO-8859-1'
+        return 'utf-8'
+
+    def _is_instruction_row(self, df) -> bool:
+        """Check whether the first data row holds template instructions."""
+        if df.shape[0] == 0:
+            return False
+        first_row = str(df.iloc[0].values).lower()
+        return (
+            'project name' in first_row
+            or 'this is now the project name' in first_row
+        )
+
+    def _clean_frame(self, df):
+        """Run every cleaning pass over a DataFrame or chunk."""
         df = self._map_columns(df)
         df = self._clean_text_fields(df)
         df = self._process_boolean_fields(df)
@@ -127,66 +290,35 @@ def clean_csv(self, filepath: str, outpath: str) -> None:
         df = self._clean_email_addresses(df)
         df = self._format_obligation_numbers(df)
         df = self._apply_defaults_and_nulls(df)
-
-        # Export the cleaned data to a new CSV file with proper date formatting
-        df.to_csv(outpath, index=False, date_format='%Y-%m-%d')
-        logger.info("Cleaned data exported to %s", outpath)
-        self.stdout.write(f"CSV exported {len(df)} rows and {len(df.columns)} columns")
+        return df
 
     def _map_columns(self, df):
         """Map original column names to our expected format."""
-        # Define the column mapping based on clean_output_with_nulls.csv
-        column_mapping = {
-            'Project_Name': 'project__name',
-            'Primary_Environmental_Mechanism': 'primary__environmental__mechanism',
-            'Procedure': 'procedure',
-            'Environmental_Aspect': 'environmental__aspect',
-            'Obligation Number': 'obligation__number',
-            'Obligation': 'obligation',
-            'Accountability': 'accountability',
-            'Responsibility': 'responsibility',
-            'ProjectPhase': 'project_phase',
-            'Action_DueDate': 'action__due_date',
-            'Close_Out_Date': 'close__out__date',
-            'Status': 'status',
-            'Supporting Information': 'supporting__information',
-            'General Comments': 'general__comments',
-            'Compliance Comments': 'compliance__comments',
-            'NonConformance Comments': 'non_conformance__comments',
-            'Evidence': 'evidence',
-            'Recurring Obligation': 'recurring__obligation',
-            'Recurring Frequency': 'recurring__frequency',
-            'Recurring Status': 'recurring__status',
-            'Recurring Forcasted Date': 'recurring__forcasted__date',
-            'Inspection': 'inspection',
-            'Inspection Frequency': 'inspection__frequency',
-            'Site or Desktop': 'site_or__desktop',
-            'New Control, action required ': 'new__control__action_required',
-            'Obligation type': 'obligation_type',
-            'Gap Analysis': 'gap__analysis',
-            'Notes for Gap Analysis': 'notes_for__gap__analysis'
-        }
-
-        # Print available columns in the CSV for debugging
-        self.stdout.write(f"Available columns in CSV: {df.columns.tolist()}")
-
-        # Check if all expected columns exist
-        for original_col in column_mapping:
-            if original_col not in df.columns:
-                self.stdout.write(
-                    self.style.WARNING(f"Column not found in CSV: '{original_col}'")
-                )
+        column_mapping = IMPORT_COLUMN_MAPPING
+
+        if self._report_details:
+            # Print available columns in the CSV for debugging
+            self.stdout.write(f"Available columns in CSV: {df.columns.tolist()}")
+
+            # Check if all expected columns exist
+            for original_col, col in column_mapping.items():
+                if original_col not in df.columns and col not in df.columns:
+                    self.stdout.write(self.style.WARNING(
+                        f"Column not found in CSV: '{original_col}'"
+                    ))
 
         # Rename the columns
         df.rename(columns=column_mapping, inplace=True)
 
         # Explicitly check for missing required columns and add them
-        required_columns = set(column_mapping.values())
-        missing_columns = required_columns - set(df.columns)
+        missing_columns = [
+            col for col in column_mapping.values() if col not in df.columns
+        ]
 
         for col in missing_columns:
             df[col] = None
-            logger.warning("Added missing column: %s", col)
+            if self._report_details:
+                logger.warning("Added missing column: %s", col)
 
         return df
 
@@ -201,46 +333,48 @@ def _clean_text_fields(self, df):
         for col in text_columns:
             if col in df.columns:
                 # Replace line breaks with dash and clean special characters
-                df[col] = df[col].astype(str).apply(
-                    lambda x: re.sub(r'[\r\n•\u2022\u2013\u2019]', '-', x)
-                    if pd.notna(x) and x != 'nan' else ''
+                text = df[col].astype(str)
+                df[col] = (
+                    text.str.replace(r'[\r\n•\u2022\u2013\u2019]', '-', regex=True)
+                    .where(text != 'nan', '')
                 )
         return df
 
     def _process_boolean_fields(self, df):
         """Process fields with boolean values."""
-        bool_columns = [
-            'recurring__obligation', 'inspection', 'new__control__action_required'
-        ]
-
-        # Define conv. values outside loop to avoid cell variable defined loop error
-        true_values = ['yes', 'y', 'true', '1', 'yes ', 'y ', 'true ']
-        false_values = ['no', 'n', 'false', '0', 'no ', 'n ', 'false ', '']
+        true_values = ['yes', 'y', 'true', '1']
+        false_values = ['no', 'n', 'false', '0', '']
 
-        for col in bool_columns:
+        for col in BOOLEAN_COLUMNS:
             if col in df.columns:
-                self.stdout.write(f"Processing boolean column: {col}")
                 # Convert to string first to handle various input types
-                df[col] = df[col].astype(str).str.strip().str.lower()
-                # Print unique values for debugging
-                unique_vals = df[col].unique()
-                self.stdout.write(f"Unique values in {col}: {unique_vals}")
+                text = df[col].astype(str).str.strip().str.lower()
+                if self._report_details:
+                    self.stdout.write(f"Processing boolean column: {col}")
+                    # Print unique values for debugging
+                    self.stdout.write(f"Unique values in {col}: {text.unique()}")
 
                 # Convert various boolean indicators to Python boolean values
-                df[col] = df[col].apply(
-                    lambda x: True if x in true_values else
-                    False if x in false_values else None
+                df[col] = pd.Series(
+                    np.select(
+                        [text.isin(true_values), text.isin(false_values)],
+                        [True, False],
+                        default=None,
+                    ),
+                    index=df.index,
+                    dtype=object,
                 )
 
-                # Count values after conversion
-                true_count = (df[col] is True).sum()
-                false_count = (df[col] is False).sum()
-                null_count = df[col].isna().sum()
+                if self._report_details:
+                    # Count values after conversion
+                    true_count = df[col].eq(True).sum()
+                    false_count = df[col].eq(False).sum()
+                    null_count = df[col].isna().sum()
 
-                self.stdout.write(
-                    f"After conversion: True={true_count}, False={false_count}, "
-                    f"Null={null_count}"
-                )
+                    self.stdout.write(
+                        f"After conversion: True={true_count}, False={false_count}, "
+                        f"Null={null_count}"
+                    )
         return df
 
     def _clean_date_fields(self, df):
@@ -253,16 +387,15 @@ def _clean_date_fields(self, df):
 
         for col in date_columns:
             if col in df.columns:
-                df[col] = (pd.to_datetime(df[col], errors='coerce')
+                # Parse per value so every chunk reads dates the same way,
+                # rather than inferring one format from each chunk's first row
+                df[col] = (pd.to_datetime(df[col], errors='coerce', format='mixed')
                            .dt.strftime('%Y-%m-%d'))
         return df
 
     def _normalize_status_values(self, df):
         """Normalize status values to match model choices."""
         if 'status' in df.columns:
-            # Convert to lowercase and handle slight variations
-            df['status'] = df['status'].astype(str).str.lower().str.strip()
-
             # Replace variations with standardized values
             status_mapping = {
                 'in progress': 'in progress',
@@ -273,13 +406,13 @@ def _normalize_status_values(self, df):
                 'not started': 'not started',
                 'notstarted': 'not started',
                 'not-started': 'not started',
-                'null': 'not started',
-                'nan': 'not started',
-                '': 'not started'
             }
 
-            df['status'] = df['status'].apply(
-                lambda x: status_mapping.get(x, 'not started')
+            # Anything unmapped, including blanks and NULL, is not started
+            df['status'] = (
+                df['status'].astype(str).str.lower().str.strip()
+                .map(status_mapping)
+                .fillna('not started')
             )
         return df
 
@@ -287,29 +420,36 @@ def _clean_project_phases(self, df):
         """Clean and standardize project phase values."""
         if 'project_phase' in df.columns:
             # Define valid phases for validation
-            valid_phases = {
+            valid_phases = [
                 'Pre-Construction',
                 'Construction',
                 'Operation',
                 'Throughout the project'
-            }
-
-            # Map variations to standardized values
-            df['project_phase'] = df['project_phase'].astype(str).apply(
-                lambda x: 'Construction'
-                if 'construction' in x.lower() or 'design and construction' in x.lower()
-                else 'Pre-Construction'
-                if any(term in x.lower() for term in ['pre', 'design'])
-                else 'Operation'
-                if 'operation' in x.lower()
-                else 'Throughout the project'
-                if 'throughout' in x.lower()
-                else x if (pd.notna(x) and
-                           x != 'nan' and
-                           x != 'NULL' and
-                           x != '' and
-                           x in valid_phases)
-                else None
+            ]
+
+            # Map variations to standardized values, first match wins
+            text = df['project_phase'].astype(str)
+            lowered = text.str.lower()
+            df['project_phase'] = pd.Series(
+                np.select(
+                    [
+                        lowered.str.contains('construction', regex=False),
+                        lowered.str.contains('pre|design', regex=True),
+                        lowered.str.contains('operation', regex=False),
+                        lowered.str.contains('throughout', regex=False),
+                        text.isin(valid_phases),
+                    ],
+                    [
+                        'Construction',
+                        'Pre-Construction',
+                        'Operation',
+                        'Throughout the project',
+                        text.to_numpy(dtype=object),
+                    ],
+                    default=None,
+                ),
+                index=df.index,
+                dtype=object,
             )
         return df
 
@@ -317,53 +457,71 @@ def _clean_environmental_aspects(self, df):
         """Clean and standardize environmental aspect values."""
         if 'environmental__aspect' in df.columns:
             # Define valid aspects for validation
-            valid_aspects = {
+            valid_aspects = [
                 'Soil', 'Water', 'Air', 'Noise', 'Hazardous Materials',
                 'Waste', 'Flora', 'Fauna', 'Heritage', 'Community', 'Other'
-            }
+            ]
 
             # Convert to proper format and validate against valid aspects
-            df['environmental__aspect'] = df['environmental__aspect'].astype(str).apply(
-                lambda x: x.title()
-                if (pd.notna(x) and
-                    x != 'nan' and
-                    x != 'NULL' and
-                    x != '' and
-                    x.title() in valid_aspects)
-                else 'Other'
+            titled = df['environmental__aspect'].astype(str).str.title()
+            df['environmental__aspect'] = titled.where(
+                titled.isin(valid_aspects), 'Other'
             )
         return df
 
     def _clean_site_desktop_values(self, df):
         """Clean and standardize site or desktop values."""
         if 'site_or__desktop' in df.columns:
-            df['site_or__desktop'] = df['site_or__desktop'].astype(str).apply(
-                lambda x: 'Site' if 'site' in x.lower()
-                else 'Desktop' if 'desktop' in x.lower()
-                else None if pd.isna(x) or x == 'nan' or x == 'NULL' or x == ''
-                else x
+            text = df['site_or__desktop'].astype(str)
+            lowered = text.str.lower()
+            df['site_or__desktop'] = pd.Series(
+                np.select(
+                    [
+                        lowered.str.contains('site', regex=False),
+                        lowered.str.contains('desktop', regex=False),
+                        text.isin(['nan', 'NULL', '']),
+                    ],
+                    ['Site', 'Desktop', None],
+                    default=text.to_numpy(dtype=object),
+                ),
+                index=df.index,
+                dtype=object,
             )
         return df
 
     def _clean_email_addresses(self, df):
         """Clean email addresses."""
         if 'person_email' in df.columns:
-            df['person_email'] = df['person_email'].astype(str).apply(
-                lambda x: x.strip()
-                if pd.notna(x) and x != 'nan' and '@' in x
-                else None
+            text = df['person_email'].astype(str)
+            df['person_email'] = (
+                text.str.strip()
+                .where(text.str.contains('@', regex=False), None)
             )
         return df
 
     def _format_obligation_numbers(self, df):
         """Format obligation numbers consistently."""
         if 'obligation__number' in df.columns:
-            df['obligation__number'] = df['obligation__number'].apply(
-                lambda x: f"PCEMP-{x.split('-')[1]}"
-                if isinstance(x, str) and '-' in x
-                else f"PCEMP-{x}"
-                if isinstance(x, str) and x.isdigit()
-                else x
+            numbers = df['obligation__number']
+            present = numbers.notna()
+            text = numbers.astype(str)
+            df['obligation__number'] = pd.Series(
+                np.select(
+                    [
+                        present & text.str.contains('-', regex=False),
+                        present & text.str.isdigit(),
+                    ],
+                    [
+                        # fillna: a chunk where no number has a dash splits to
+                        # all-NaN floats, which cannot be added to a string
+                        ('PCEMP-' + text.str.split('-').str[1].fillna(''))
+                        .to_numpy(dtype=object),
+                        ('PCEMP-' + text).to_numpy(dtype=object),
+                    ],
+                    default=numbers.to_numpy(dtype=object),
+                ),
+                index=df.index,
+                dtype=object,
             )
         return df
 
@@ -371,13 +529,55 @@ def _apply_defaults_and_nulls(self, df):
         """Apply default values and handle nulls."""
         # Fill missing values with appropriate defaults
         if 'status' in df.columns:
-            df['status'].fillna('not started', inplace=True)
+            df['status'] = df['status'].fillna('not started')
 
         # Replace remaining NaN values with None/NULL
         df = df.replace({np.nan: None})
         return df
 
 
+class _ChunkWriter:
+    """Append cleaned DataFrame chunks to a CSV or Parquet file."""
+
+    def __init__(self, outpath: str, output_format: str) -> None:
+        self.outpath = outpath
+        self.output_format = output_format
+        self._started = False
+        self._parquet_writer = None
+        self._schema = None
+
+    def write(self, df) -> None:
+        """Append one chunk, writing the header/schema with the first."""
+        if self.output_format == 'parquet':
+            self._write_parquet(df)
+        else:
+            df.to_csv(
+                self.outpath,
+                mode='a' if self._started else 'w',
+                header=not self._started,
+                index=False,
+                date_format='%Y-%m-%d',
+            )
+        self._started = True
+
+    def _write_parquet(self, df) -> None:
+        if self._schema is None:
+            # Text everywhere except the cleaned booleans keeps the schema
+            # identical across chunks, whatever values each one holds
+            self._schema = pa.schema([
+                (col, pa.bool_() if col in BOOLEAN_COLUMNS else pa.string())
+                for col in df.columns
+            ])
+            self._parquet_writer = pq.ParquetWriter(self.outpath, self._schema)
+        table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        self._parquet_writer.write_table(table)
+
+    def close(self) -> None:
+        """Flush the Parquet footer; CSV output needs no finalisation."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
 # This will only run if script is executed directly, not when as a Django command
 if __name__ == "__main__":
     logging.basicConfig(
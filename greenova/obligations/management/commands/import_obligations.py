@@ -1,21 +1,42 @@
 import csv
+import hashlib
+import json
 import logging
 import os
+import time
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import chain, islice
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, TypedDict, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+    Union,
+)
 
 import django
-from django.core.management.base import BaseCommand, CommandParser
-from django.db import DatabaseError, connection, transaction
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DatabaseError, transaction
 from django.db.models import Manager  # Add this import for type hinting
 from django.db.models import Model
 from django.utils import timezone
 from django.utils.dateparse import parse_date
-
-from ....mechanisms.models import EnvironmentalMechanism
-from ....obligations.models import Obligation
-from ....obligations.utils import normalize_frequency
-from ....projects.models import Project  # Ensure this is the correct import path
+from mechanisms.models import EnvironmentalMechanism, recount_mechanisms
+from obligations.models import Obligation, ObligationNumberSequence
+from obligations.utils import OPENPYXL_AVAILABLE, iter_xlsx_rows, normalize_frequency
+from projects.models import Project  # Ensure this is the correct import path
 
 if not hasattr(Project, 'objects') or not isinstance(Project.objects, Manager):
     raise ImportError("The Project model is missing a valid 'objects' manager. "
@@ -43,8 +64,19 @@ class EnvironmentalMechanismT(EnvironmentalMechanism, DjangoModel):
     class ObligationT(Obligation, DjangoModel):
         ...
 
+# pyarrow is only needed to read Parquet output of clean_csv_to_import
+try:
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 1000
+
+XLSX_SUFFIXES = ('.xlsx', '.xlsm')
+
 # Define TypedDict for obligation data structure
 class ObligationData(TypedDict, total=False):
     """Type definition for obligation data dictionary."""
@@ -75,6 +107,108 @@ class ObligationData(TypedDict, total=False):
     gap_analysis: bool
     notes_for_gap_analysis: str
 
+class ImportStats(TypedDict):
+    """Running totals for a batched import."""
+    created: int
+    updated: int
+    unchanged: int
+    skipped: int
+    errors: int
+
+# Fields written by bulk_update for obligations that already exist
+BULK_UPDATE_FIELDS: List[str] = [
+    field for field in ObligationData.__annotations__ if field != 'obligation_number'
+] + ['import_fingerprint', 'updated_at']
+
+class ValidationIssue(TypedDict):
+    """A single problem found by the --dry-run validation pass."""
+    row: int
+    obligation_number: str
+    field: str
+    severity: str  # 'error' or 'warning'
+    message: str
+
+class RowCheck(TypedDict):
+    """Validation result for one row."""
+    row: int
+    obligation_number: str
+    mechanism: str
+    issues: List[ValidationIssue]
+
+# Model field -> CSV column for dates that process_row parses leniently
+DATE_COLUMNS: Dict[str, str] = {
+    'action_due_date': 'action__due_date',
+    'close_out_date': 'close__out__date',
+    'recurring_forcasted_date': 'recurring__forcasted__date',
+}
+
+# Field validation codes the import tolerates: it does not run full_clean
+# and stores empty values as they are
+IGNORED_CODES = {'blank', 'null'}
+
+# How many issues the dry run prints before pointing at --report
+MAX_PRINTED_ISSUES = 50
+
+def validate_rows(
+    task: Tuple[List[Tuple[int, Dict[str, Any]]], Project, FrozenSet[str]]
+) -> List[RowCheck]:
+    """
+    Validate a chunk of numbered rows without touching the database.
+
+    Module level so ProcessPoolExecutor can pickle it. Mechanism lookups
+    are answered from the names prefetched by the parent process; unknown
+    mechanisms become unsaved instances instead of being created.
+
+    Args:
+        task: (rows, project, known mechanism names) where rows are
+            (row number, CSV row) pairs
+
+    Returns:
+        List[RowCheck]: One result per row, in input order
+    """
+    rows, project, mechanism_names = task
+    command = Command()
+    command._validate_only = True
+    command._mechanism_cache = {
+        name: EnvironmentalMechanism(
+            name=name, project=project, primary_environmental_mechanism=name
+        )
+        for name in mechanism_names
+    }
+    return [command.validate_row(number, row, project) for number, row in rows]
+
+def new_import_stats() -> ImportStats:
+    """Return zeroed import totals."""
+    return {'created': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'errors': 0}
+
+def compute_fingerprint(data: ObligationData) -> str:
+    """
+    Hash the normalized obligation data of an imported row.
+
+    Related objects are reduced to their primary keys and dates to ISO
+    strings, so the digest only changes when a stored value would. The
+    obligation number is the lookup key and is left out.
+
+    The digest records what the last import wrote, not what is stored now:
+    an obligation edited in the app after an import keeps that edit when
+    the same row is re-imported with --update, until the row itself changes.
+
+    Args:
+        data: Normalized row as returned by Command.process_row
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    payload: Dict[str, Any] = {}
+    for key, value in data.items():
+        if key == 'obligation_number':
+            continue
+        if isinstance(value, Model):
+            value = value.pk
+        payload[key] = value
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
 class Command(BaseCommand):
     OBLIGATION_PREFIX_MAPPING: Dict[str, str] = {
         'PREFIX1': 'NormalizedPrefix1',
@@ -82,12 +216,29 @@ class Command(BaseCommand):
         # Add other mappings as needed
     }
 
+    # Per-project name -> mechanism cache, populated for the length of an import
+    _mechanism_cache: Optional[Dict[str, EnvironmentalMechanism]] = None
+    # Set by validate_rows so unknown mechanisms are never written
+    _validate_only = False
+
     def handle(self, *args: Any, **options: Any) -> None:
         """Import obligations from a CSV file into the database."""
         csv_path = Path(options['csv_file'])
         if not csv_path.exists():
             self.stderr.write(f"CSV file not found: {csv_path}")
             return
+        if csv_path.suffix.lower() == '.parquet' and not ARROW_AVAILABLE:
+            self.stderr.write(
+                "Reading Parquet requires pyarrow. "
+                "Please install it with: pip install pyarrow"
+            )
+            return
+        if csv_path.suffix.lower() in XLSX_SUFFIXES and not OPENPYXL_AVAILABLE:
+            self.stderr.write(
+                "Reading XLSX requires openpyxl. "
+                "Please install it with: pip install openpyxl"
+            )
+            return
 
         try:
             # Get or create project
@@ -96,34 +247,483 @@ def handle(self, *args: Any, **options: Any) -> None:
                 self.stderr.write("Project name is required")
                 return
 
-            project = self._get_or_create_project(project_name)
+            if options['dry_run']:
+                # Validation must not write, not even the project
+                project = (
+                    Project.objects.filter(name=project_name).first()
+                    or Project(name=project_name)
+                )
+            else:
+                project = self._get_or_create_project(project_name)
             if not project:
                 self.stderr.write(f"Failed to get/create project: {project_name}")
                 return
 
             # Process CSV file
-            with csv_path.open('r', encoding='utf-8') as csv_file:
-                reader = csv.DictReader(csv_file)
+            with self._open_rows(csv_path, options) as reader:
 
                 if options['dry_run']:
                     self.stdout.write("DRY RUN - No changes will be made")
-
-                for row in reader:
-                    try:
-                        with transaction.atomic():
-                            self._process_obligation_row(row, project, options)
-                    except (ValueError, DatabaseError, KeyError) as e:
-                        error_msg = f"Error processing row: {e}"
-                        if options['continue_on_error']:
-                            self.stderr.write(error_msg)
-                            continue
-                        raise
+                    self._validate(reader, project, options)
+                    return
+                if options['batch']:
+                    stats = self._import_batched(reader, project, options)
+                    self._write_summary(stats)
+                    return
+
+                stats = new_import_stats()
+                # Fingerprints and the project's mechanisms are loaded once, so
+                # skipped and unchanged rows are decided without a query; only
+                # rows that are written open a savepoint
+                fingerprints = dict(Obligation.objects.values_list(
+                    'obligation_number', 'import_fingerprint'
+                ))
+                self._prime_mechanism_cache(project)
+                try:
+                    for row in reader:
+                        try:
+                            status = self._process_obligation_row(
+                                row, project, options, fingerprints
+                            )
+                        except (ValueError, DatabaseError, KeyError) as e:
+                            stats['errors'] += 1
+                            error_msg = f"Error processing row: {e}"
+                            if options['continue_on_error']:
+                                self.stderr.write(error_msg)
+                                continue
+                            raise
+                        if status in stats:
+                            stats[status] += 1  # type: ignore[literal-required]
+                        elif status:
+                            stats['errors'] += 1
+                finally:
+                    self._mechanism_cache = None
 
         except (OSError, csv.Error, DatabaseError) as e:
             self.stderr.write(f"Failed to import obligations: {e}")
             return
 
-        self.stdout.write(self.style.SUCCESS("Successfully imported obligations"))
+        self._write_summary(stats)
+
+    def _write_summary(self, stats: ImportStats) -> None:
+        """Print the created/updated/unchanged/skipped totals."""
+        self.stdout.write(self.style.SUCCESS(
+            "Successfully imported obligations: "
+            f"{stats['created']} created, {stats['updated']} updated, "
+            f"{stats['unchanged']} unchanged, {stats['skipped']} skipped, "
+            f"{stats['errors']} errors"
+        ))
+
+    @contextmanager
+    def _open_rows(
+        self, path: Path, options: Dict[str, Any]
+    ) -> Iterator[Iterator[Dict[str, Any]]]:
+        """
+        Yield an iterator of row dicts for a CSV, XLSX or Parquet file.
+
+        Workbooks are streamed read-only from the selected --sheet, and
+        Parquet files written by clean_csv_to_import record batch by record
+        batch. Both are rendered back to the strings a CSV row would hold,
+        so every source shares process_row.
+        """
+        suffix = path.suffix.lower()
+        if suffix in XLSX_SUFFIXES:
+            rows = iter_xlsx_rows(
+                path, sheet=options.get('sheet'), header_row=options.get('header_row')
+            )
+            try:
+                # Surface a missing sheet or header before any row is processed
+                first_row = next(rows, None)
+            except ValueError as e:
+                raise CommandError(str(e)) from e
+            yield chain([first_row], rows) if first_row is not None else iter(())
+            return
+        if suffix != '.parquet':
+            with path.open('r', encoding='utf-8') as csv_file:
+                yield csv.DictReader(csv_file)
+            return
+
+        parquet_file = pq.ParquetFile(path)
+        try:
+            yield (
+                {key: '' if value is None else str(value) for key, value in row.items()}
+                for batch in parquet_file.iter_batches(batch_size=DEFAULT_BATCH_SIZE)
+                for row in batch.to_pylist()
+            )
+        finally:
+            parquet_file.close()
+
+    def _import_batched(
+        self,
+        reader: Iterable[Dict[str, Any]],
+        project: Project,
+        options: Dict[str, Any]
+    ) -> ImportStats:
+        """
+        Import rows in chunks using bulk_create/bulk_update.
+
+        Existing obligation numbers, their import fingerprints and the
+        project's mechanisms are loaded once up front, so each chunk costs a
+        handful of queries regardless of its size and rows whose fingerprint
+        is unchanged are not written at all. Bulk writes do not send save
+        signals, which keeps the per-row mechanism counter and sequence
+        bookkeeping out of the hot loop; both are reconciled once after the
+        last chunk.
+
+        Args:
+            reader: Iterable of CSV rows
+            project: Project the rows are imported into
+            options: Command options
+
+        Returns:
+            ImportStats: Totals for the whole import
+        """
+        batch_size: int = options['batch_size']
+        stats = new_import_stats()
+
+        # obligation_number is the primary key, so existence is global
+        existing: Dict[str, Tuple[Optional[int], str]] = {
+            number: (mechanism_id, fingerprint)
+            for number, mechanism_id, fingerprint in Obligation.objects.values_list(
+                'obligation_number',
+                'primary_environmental_mechanism_id',
+                'import_fingerprint',
+            )
+        }
+        self._prime_mechanism_cache(project)
+        touched_mechanisms: Set[int] = set()
+
+        started = time.monotonic()
+        processed = 0
+        try:
+            for chunk in self._iter_chunks(reader, batch_size):
+                # Bookkeeping for this chunk is merged only once it commits,
+                # so a rolled-back chunk leaves no trace of its rows
+                chunk_existing = ChainMap({}, existing)
+                chunk_touched: Set[int] = set()
+                mechanisms = dict(self._mechanism_cache or {})
+                chunk_stats = new_import_stats()
+                try:
+                    with transaction.atomic():
+                        self._write_batch(
+                            chunk, project, options, chunk_existing,
+                            chunk_touched, chunk_stats
+                        )
+                except DatabaseError as e:
+                    self._mechanism_cache = mechanisms
+                    stats['errors'] += len(chunk)
+                    if not options['continue_on_error']:
+                        raise
+                    self.stderr.write(f"Error writing batch: {e}")
+                else:
+                    existing.update(chunk_existing.maps[0])
+                    touched_mechanisms |= chunk_touched
+                    for key, value in chunk_stats.items():
+                        stats[key] += value  # type: ignore[literal-required]
+
+                processed += len(chunk)
+                elapsed = max(time.monotonic() - started, 1e-6)
+                self.stdout.write(
+                    f"Processed {processed} rows ({processed / elapsed:.0f} rows/s)"
+                )
+        finally:
+            self._mechanism_cache = None
+            self._finalize_batched_import(touched_mechanisms)
+
+        return stats
+
+    def _iter_chunks(self, rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+        """Yield lists of at most ``size`` rows."""
+        iterator = iter(rows)
+        while chunk := list(islice(iterator, size)):
+            yield chunk
+
+    def _prime_mechanism_cache(self, project: Project) -> None:
+        """Load every mechanism of the project into the lookup cache."""
+        self._mechanism_cache = {
+            mechanism.name: mechanism
+            for mechanism in EnvironmentalMechanism.objects.filter(project=project)
+        }
+
+    def _write_batch(
+        self,
+        chunk: List[Dict[str, Any]],
+        project: Project,
+        options: Dict[str, Any],
+        existing: MutableMapping[str, Tuple[Optional[int], str]],
+        touched_mechanisms: Set[int],
+        stats: ImportStats
+    ) -> None:
+        """Build obligations for one chunk and write them with bulk queries."""
+        now = timezone.now()
+        supplied = [
+            (row.get('obligation__number') or '').strip() for row in chunk
+        ]
+        missing = supplied.count('')
+        if missing:
+            # Move the sequence past numbers supplied in this chunk first so
+            # the reserved block cannot collide with rows not yet written
+            suffixes = [
+                int(number.rsplit('-', 1)[-1]) for number in supplied
+                if number.rsplit('-', 1)[-1].isdigit()
+            ]
+            if suffixes:
+                ObligationNumberSequence.observe(
+                    Obligation.format_obligation_number(str(max(suffixes)))
+                )
+        reserved = iter(
+            Obligation.reserve_obligation_numbers(missing) if missing else []
+        )
+
+        to_create: Dict[str, Obligation] = {}
+        to_update: Dict[str, Obligation] = {}
+        for row in chunk:
+            try:
+                if not (row.get('obligation__number') or '').strip():
+                    row = {**row, 'obligation__number': next(reserved)}
+                data = self.process_row(row, project)
+            except (ValueError, KeyError) as e:
+                stats['errors'] += 1
+                if not options['continue_on_error']:
+                    raise
+                self.stderr.write(f"Error processing row: {e}")
+                continue
+
+            fingerprint = compute_fingerprint(data)
+            obligation = Obligation(**data, import_fingerprint=fingerprint)
+            number = Obligation.format_obligation_number(obligation.obligation_number)
+            obligation.obligation_number = number
+            mechanism_id = obligation.primary_environmental_mechanism_id
+
+            if number in existing:
+                if not options['update']:
+                    stats['skipped'] += 1
+                    continue
+                old_mechanism_id, old_fingerprint = existing[number]
+                if old_fingerprint == fingerprint:
+                    stats['unchanged'] += 1
+                    continue
+                if old_mechanism_id is not None:
+                    touched_mechanisms.add(old_mechanism_id)
+                if number in to_create:
+                    # Repeated within this chunk: the later row is inserted
+                    to_create[number] = obligation
+                    stats['updated'] += 1
+                else:
+                    obligation.updated_at = now
+                    to_update[number] = obligation
+            else:
+                to_create[number] = obligation
+
+            existing[number] = (mechanism_id, fingerprint)
+            if mechanism_id is not None:
+                touched_mechanisms.add(mechanism_id)
+
+        for obligation in to_create.values():
+            # bulk_create skips the pre_save signal that sets this per row
+            obligation.update_recurring_forecasted_date()
+        Obligation.objects.bulk_create(to_create.values(), batch_size=len(chunk))
+        if to_update:
+            Obligation.objects.bulk_update(
+                to_update.values(), BULK_UPDATE_FIELDS, batch_size=len(chunk)
+            )
+        stats['created'] += len(to_create)
+        stats['updated'] += len(to_update)
+
+    def _finalize_batched_import(self, mechanism_ids: Set[int]) -> None:
+        """Resync the number sequence and recount the touched mechanisms."""
+        ObligationNumberSequence.seed()
+        recount_mechanisms(mechanism_ids)
+
+    def _validate(
+        self,
+        reader: Iterable[Dict[str, Any]],
+        project: Project,
+        options: Dict[str, Any]
+    ) -> List[ValidationIssue]:
+        """
+        Check every row the import would process, across a process pool.
+
+        The only queries are the two reference lookups (existing obligation
+        numbers and the project's mechanism names); the row checks run in
+        worker processes on chunks of --batch-size rows. Row numbers count
+        the header as row 1, matching spreadsheet row numbers.
+
+        Args:
+            reader: Iterable of CSV rows
+            project: Project the rows would be imported into (may be unsaved)
+            options: Command options
+
+        Returns:
+            List[ValidationIssue]: All issues, ordered by row
+        """
+        started = time.monotonic()
+        existing = set(Obligation.objects.values_list('obligation_number', flat=True))
+        mechanism_names: FrozenSet[str] = frozenset(
+            EnvironmentalMechanism.objects.filter(project=project)
+            .values_list('name', flat=True)
+        ) if project.pk else frozenset()
+
+        numbered_rows = enumerate(reader, start=2)
+        tasks = (
+            (chunk, project, mechanism_names)
+            for chunk in self._iter_chunks(numbered_rows, options['batch_size'])
+        )
+        workers = options['workers'] or os.cpu_count() or 1
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(validate_rows, tasks))
+        else:
+            results = [validate_rows(task) for task in tasks]
+
+        issues: List[ValidationIssue] = []
+        first_seen: Dict[str, int] = {}
+        new_mechanisms: Set[str] = set()
+        rows = would_create = would_update = would_skip = 0
+        for check in (check for chunk in results for check in chunk):
+            rows += 1
+            issues.extend(check['issues'])
+            if check['mechanism'] and check['mechanism'] not in mechanism_names:
+                new_mechanisms.add(check['mechanism'])
+
+            number = check['obligation_number']
+            if not number:
+                would_create += 1
+            elif number in first_seen:
+                issues.append({
+                    'row': check['row'],
+                    'obligation_number': number,
+                    'field': 'obligation_number',
+                    'severity': 'error',
+                    'message': f"duplicate of row {first_seen[number]}",
+                })
+            else:
+                first_seen[number] = check['row']
+                if number not in existing:
+                    would_create += 1
+                elif options['update']:
+                    would_update += 1
+                else:
+                    would_skip += 1
+        issues.sort(key=lambda issue: issue['row'])
+
+        for issue in issues[:MAX_PRINTED_ISSUES]:
+            self.stdout.write(
+                f"Row {issue['row']} [{issue['severity']}] "
+                f"{issue['field'] or 'row'}: {issue['message']}"
+            )
+        if len(issues) > MAX_PRINTED_ISSUES:
+            self.stdout.write(
+                f"... {len(issues) - MAX_PRINTED_ISSUES} more, use --report for all"
+            )
+        if options.get('report'):
+            self._write_report(options['report'], rows, issues)
+
+        errors = sum(1 for issue in issues if issue['severity'] == 'error')
+        elapsed = max(time.monotonic() - started, 1e-6)
+        summary = (
+            f"Validated {rows} rows in {elapsed:.1f}s: {errors} errors, "
+            f"{len(issues) - errors} warnings; would create {would_create}, "
+            f"update {would_update}, skip {would_skip}; "
+            f"{len(new_mechanisms)} new mechanisms"
+        )
+        self.stdout.write(
+            self.style.ERROR(summary) if errors else self.style.SUCCESS(summary)
+        )
+        return issues
+
+    def _write_report(
+        self, path: str, rows: int, issues: List[ValidationIssue]
+    ) -> None:
+        """Write the validation issues to a JSON file."""
+        report = {
+            'rows': rows,
+            'errors': sum(1 for issue in issues if issue['severity'] == 'error'),
+            'warnings': sum(1 for issue in issues if issue['severity'] == 'warning'),
+            'issues': issues,
+        }
+        with open(path, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2)
+        self.stdout.write(f"Validation report written to {path}")
+
+    def validate_row(
+        self, row_number: int, row: Dict[str, Any], project: Project
+    ) -> RowCheck:
+        """
+        Run process_row on a CSV row and collect everything it would get wrong.
+
+        Besides exceptions from process_row this reports values the import
+        silently drops or rewrites (unparseable dates, unknown statuses) and
+        runs each concrete non-relation field's clean() on the result.
+
+        Args:
+            row_number: Spreadsheet row number, used in the report
+            row: Dictionary containing CSV row data
+            project: Project instance
+
+        Returns:
+            RowCheck: The normalized obligation number and any issues
+        """
+        issues: List[ValidationIssue] = []
+        raw_number = (row.get('obligation__number') or '').strip()
+        mechanism = (row.get('primary__environmental__mechanism') or '').strip()
+
+        def add(field: str, severity: str, message: str) -> None:
+            issues.append({
+                'row': row_number,
+                'obligation_number': raw_number,
+                'field': field,
+                'severity': severity,
+                'message': message,
+            })
+
+        try:
+            data = self.process_row(row, project)
+        except (ValueError, KeyError, AttributeError, TypeError) as e:
+            add('', 'error', str(e))
+            return {
+                'row': row_number, 'obligation_number': '',
+                'mechanism': mechanism, 'issues': issues,
+            }
+
+        number = ''
+        if raw_number:
+            number = Obligation.format_obligation_number(data['obligation_number'])
+        else:
+            add('obligation_number', 'warning', 'missing, a number will be generated')
+
+        for field_name, column in DATE_COLUMNS.items():
+            raw_date = (row.get(column) or '').strip()
+            if raw_date and data.get(field_name) is None:
+                add(
+                    field_name, 'error',
+                    f"invalid date '{raw_date}', expected YYYY-MM-DD"
+                )
+
+        raw_status = (row.get('status') or '').strip().lower()
+        if raw_status and raw_status != data['status']:
+            add(
+                'status', 'warning',
+                f"unknown status '{raw_status}', imported as '{data['status']}'"
+            )
+
+        values: Dict[str, Any] = {**data, 'obligation_number': number}
+        for field in Obligation._meta.concrete_fields:
+            if field.is_relation or field.name not in values:
+                continue
+            if field.primary_key and not number:
+                continue
+            try:
+                field.clean(values[field.name], None)
+            except ValidationError as e:
+                for error in e.error_list:
+                    if error.code not in IGNORED_CODES:
+                        add(field.name, 'error', error.messages[0])
+
+        return {
+            'row': row_number, 'obligation_number': number,
+            'mechanism': mechanism, 'issues': issues,
+        }
 
     def _get_or_create_project(self, project_name: str) -> Optional[Project]:
         """Get existing project or create new one."""
@@ -148,20 +748,18 @@ def _process_obligation_row(
         self,
         row: Dict[str, Any],
         project: Project,
-        options: Dict[str, Any]
-    ) -> None:
-        """Process a single row from the CSV file."""
-        if options['dry_run']:
-            self.stdout.write(f"Would process row: {row}")
-            return
-
+        options: Dict[str, Any],
+        fingerprints: Optional[Dict[str, str]] = None
+    ) -> str:
+        """Process a single row from the CSV file and return the action taken."""
         # Process the row data
         obligation_data = self.process_row(row, project)
 
         # Create or update the obligation
         result, status = self.create_or_update_obligation(
             obligation_data,
-            force_update=options['update']
+            force_update=options['update'],
+            fingerprints=fingerprints
         )
 
         if result:
@@ -169,6 +767,7 @@ def _process_obligation_row(
             self.stdout.write(
                 f"{action} obligation: {obligation_data['obligation_number']}"
             )
+        return status
 
     help = 'Import obligations from CSV file'
 
@@ -182,7 +781,22 @@ def add_arguments(self, parser: CommandParser) -> None:
         parser.add_argument(
             'csv_file',
             type=str,
-            help='Path to the CSV file containing obligations data',
+            help=(
+                'Path to the CSV or XLSX file containing obligations data, or '
+                'a .parquet file written by clean_csv_to_import'
+            ),
+        )
+        parser.add_argument(
+            '--sheet',
+            type=str,
+            default=None,
+            help='XLSX worksheet name or zero-based index (default: active sheet)',
+        )
+        parser.add_argument(
+            '--header-row',
+            type=int,
+            default=None,
+            help='1-based XLSX header row (default: detected)',
         )
         parser.add_argument(
             '--project',
@@ -192,18 +806,50 @@ def add_arguments(self, parser: CommandParser) -> None:
         parser.add_argument(
             '--update',
             action='store_true',
-            help='Update existing obligations instead of skipping',
+            help=(
+                'Update existing obligations instead of skipping. Rows '
+                'unchanged since the last import are left alone, keeping '
+                'edits made in the app since then'
+            ),
         )
         parser.add_argument(
             '--dry-run',
             action='store_true',
-            help='Show what would be imported without actually importing',
+            help=(
+                'Validate every row and report what would be imported, '
+                'without writing to the database'
+            ),
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Worker processes for --dry-run validation (default: CPU count)',
+        )
+        parser.add_argument(
+            '--report',
+            type=str,
+            help='Write the --dry-run validation issues to this JSON file',
         )
         parser.add_argument(
             '--continue-on-error',
             action='store_true',
             help='Continue processing rows even if some fail',
         )
+        parser.add_argument(
+            '--batch',
+            action='store_true',
+            help=(
+                'Write rows in chunks with bulk queries and recount mechanisms '
+                'once at the end (recommended for large files)'
+            ),
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows per chunk in --batch mode (default: {DEFAULT_BATCH_SIZE})',
+        )
         parser.add_argument(
             '--no-transaction',
             action='store_true',
@@ -252,6 +898,28 @@ def get_or_create_mechanism(
 
         mechanism_name = mechanism_name.strip()
 
+        if self._mechanism_cache is not None:
+            cached = self._mechanism_cache.get(mechanism_name)
+            if cached is not None:
+                missing_code = not cached.primary_environmental_mechanism
+                if missing_code and not self._validate_only:
+                    # Same backfill as _retrieve_mechanism, for mechanisms in use
+                    cached.primary_environmental_mechanism = mechanism_name
+                    cached.save(update_fields=['primary_environmental_mechanism'])
+                return cached, False
+            if self._validate_only:
+                mechanism = EnvironmentalMechanism(
+                    name=mechanism_name,
+                    project=project,
+                    primary_environmental_mechanism=mechanism_name,
+                )
+                self._mechanism_cache[mechanism_name] = mechanism
+                return mechanism, True
+            mechanism, created = self._create_mechanism(mechanism_name, project)
+            if mechanism is not None:
+                self._mechanism_cache[mechanism_name] = mechanism
+            return mechanism, created
+
         mechanism = self._retrieve_mechanism(mechanism_name, project)
         if mechanism:
             return mechanism, False
@@ -288,11 +956,12 @@ def _create_mechanism(
     ) -> Tuple[Optional[EnvironmentalMechanism], bool]:
         """Create a new mechanism."""
         try:
-            mechanism = EnvironmentalMechanism.objects.create(  # type: ignore
-                name=mechanism_name,
-                project=project,
-                primary_environmental_mechanism=mechanism_name
-            )
+            with transaction.atomic():
+                mechanism = EnvironmentalMechanism.objects.create(  # type: ignore
+                    name=mechanism_name,
+                    project=project,
+                    primary_environmental_mechanism=mechanism_name
+                )
             logger.info(
                 'Created new mechanism: %s for project %s',
                 mechanism.name,
@@ -462,7 +1131,8 @@ def _get_or_generate_obligation_number(
     def create_or_update_obligation(
         self,
         obligation_data: ObligationData,
-        force_update: bool = False
+        force_update: bool = False,
+        fingerprints: Optional[Dict[str, str]] = None
     ) -> Tuple[Union[Obligation, bool, None], str]:
         """
         Create or update an obligation record.
@@ -470,57 +1140,63 @@ def create_or_update_obligation(
         Args:
             obligation_data: Dictionary containing obligation data
             force_update: Whether to force update existing records
+            fingerprints: Import fingerprints of every stored obligation by
+                number, kept current by this method. When given, only rows
+                that are written cost queries.
 
         Returns:
             Tuple containing (result, status) where result is the created/updated
-            obligation or False if skipped, and status is a string indicating
-            the action taken
+            obligation or False if skipped or unchanged, and status is a string
+            indicating the action taken
         """
         obligation_number = obligation_data.get('obligation_number', '')
+        fingerprint = compute_fingerprint(obligation_data)
 
         try:
-            existing = Obligation.objects.filter(  # type: ignore[attr-defined]
-                obligation_number=obligation_number
-            ).first()
+            if fingerprints is None:
+                existing = Obligation.objects.filter(  # type: ignore[attr-defined]
+                    obligation_number=obligation_number
+                ).first()
+            else:
+                number = Obligation.format_obligation_number(obligation_number)
+                stored = fingerprints.get(number)
+                if stored is not None and not force_update:
+                    return False, "skipped"
+                if stored == fingerprint:
+                    return False, "unchanged"
+                existing = (
+                    Obligation.objects.filter(obligation_number=number).first()
+                    if stored is not None else None
+                )
 
             if existing and not force_update:
                 return False, "skipped"
 
-            if existing:
-                # Update existing obligation
-                for key, value in obligation_data.items():
-                    if key != 'obligation_number':  # Don't update the primary key
-                        setattr(existing, key, value)
-                existing.save()
-                existing_t = cast(ObligationT, existing) if TYPE_CHECKING else existing
-                with connection.cursor() as cursor:
-                    cursor.execute(
-                        (
-                            "UPDATE obligations_obligation "
-                            "SET updated_at = NOW() "
-                            "WHERE id = %s"
-                        ),
-                        [existing_t.id]
-                    )
-                return existing, "updated"
-            # Create new obligation
-            new_obligation = Obligation(**obligation_data)
-            new_obligation.save()
-            new_obligation_t = (
-                cast(ObligationT, new_obligation)
-                if TYPE_CHECKING
-                else new_obligation
-            )
-            with connection.cursor() as cursor:
-                cursor.execute(
-                    (
-                        "UPDATE obligations_obligation "
-                        "SET created_at = NOW() "
-                        "WHERE id = %s"
-                    ),
-                    [new_obligation_t.id]  # type: ignore[attr-defined]
+            if existing and existing.import_fingerprint == fingerprint:
+                return False, "unchanged"
+
+            # Savepoint so a failed write doesn't poison an outer transaction
+            with transaction.atomic():
+                if existing:
+                    # Update existing obligation
+                    for key, value in obligation_data.items():
+                        # Don't update the primary key
+                        if key != 'obligation_number':
+                            setattr(existing, key, value)
+                    existing.import_fingerprint = fingerprint
+                    # updated_at is maintained by auto_now
+                    existing.save()
+                    if fingerprints is not None:
+                        fingerprints[existing.obligation_number] = fingerprint
+                    return existing, "updated"
+                # Create new obligation
+                new_obligation = Obligation(
+                    **obligation_data, import_fingerprint=fingerprint
                 )
-            return new_obligation, "created"
+                new_obligation.save()
+                if fingerprints is not None:
+                    fingerprints[new_obligation.obligation_number] = fingerprint
+                return new_obligation, "created"
 
         except DatabaseError as e:
             logger.error(
@@ -0,0 +1,51 @@
+import logging
+from typing import Any
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandParser
+from obligations.models import ObligationEvidence
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = (
+        'Move evidence files uploaded before content-addressed storage into it, '
+        'recording their digest, size and MIME type and merging duplicates'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List the files that would be moved without changing anything',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Re-store every evidence row that has no recorded digest."""
+        pending = ObligationEvidence.objects.filter(sha256='').exclude(file='')
+        storage = ObligationEvidence._meta.get_field('file').storage
+
+        moved = missing = 0
+        for evidence in pending.iterator():
+            legacy_name = evidence.file.name
+            if not storage.exists(legacy_name):
+                missing += 1
+                self.stderr.write(f"{evidence.pk}: {legacy_name} is missing")
+                continue
+            if options['dry_run']:
+                self.stdout.write(f"{evidence.pk}: {legacy_name}")
+                moved += 1
+                continue
+            with storage.open(legacy_name, 'rb') as handle:
+                # Saving an uncommitted file hashes it into the blob store and
+                # releases the legacy file
+                evidence.file = File(handle, name=evidence.display_name)
+                evidence.save()
+            moved += 1
+            self.stdout.write(f"{evidence.pk}: {legacy_name} -> {evidence.file.name}")
+        logger.info("Migrated %s evidence files (%s missing)", moved, missing)
+
+        verb = 'Would move' if options['dry_run'] else 'Moved'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {moved} evidence files; {missing} missing"
+        ))
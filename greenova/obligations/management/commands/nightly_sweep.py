@@ -0,0 +1,71 @@
+import logging
+from datetime import date
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+from mechanisms.chart_artifacts import (
+    collect_chart_artifacts,
+    render_all_chart_artifacts,
+)
+from mechanisms.models import refresh_overdue_counts
+from obligations.models import Obligation, sweep_evidence_files
+from obligations.uploads import expire_uploads
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = (
+        'Roll stale recurring forecast dates forward, refresh mechanism '
+        'overdue counters and status charts, discard abandoned evidence '
+        'uploads and delete unreferenced evidence files; schedule daily, '
+        'e.g. "5 0 * * * manage.py nightly_sweep"'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--date',
+            type=date.fromisoformat,
+            default=None,
+            help='Run as if today were this date (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk UPDATE of forecast dates (default: 1000)',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Run the daily sweep."""
+        today = options['date'] or timezone.now().date()
+
+        forecasts = Obligation.objects.refresh_recurring_forecasts(
+            reference_date=today, batch_size=options['batch_size']
+        )
+        logger.info("Rolled forward %s recurring forecast dates", forecasts)
+
+        # Run after the forecast sweep so both use the same reference date
+        mechanisms = refresh_overdue_counts(reference_date=today)
+        logger.info("Refreshed overdue counts for %s mechanisms", mechanisms)
+
+        # Overdue counts changed without a write, so render charts here
+        charts = render_all_chart_artifacts()
+        stale_charts = collect_chart_artifacts()
+        logger.info(
+            "Rendered %s mechanism charts, removed %s stale ones", charts, stale_charts
+        )
+
+        uploads = expire_uploads()
+        logger.info("Discarded %s abandoned evidence uploads", uploads)
+
+        evidence_files = sweep_evidence_files()
+        logger.info("Deleted %s unreferenced evidence files", evidence_files)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Nightly sweep for {today}: {forecasts} forecast dates rolled forward, "
+            f"{mechanisms} mechanism overdue counts refreshed, "
+            f"{charts} mechanism charts rendered, "
+            f"{uploads} abandoned evidence uploads discarded, "
+            f"{evidence_files} unreferenced evidence files deleted"
+        ))
@@ -0,0 +1,32 @@
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+from obligations.search import ensure_search_index
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = (
+        'Create or rebuild the obligation full-text search index (FTS5 on '
+        'SQLite, a GIN tsvector index on PostgreSQL)'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database alias to index (default: "default")',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Drop and repopulate the search index."""
+        using = options['database']
+        if not ensure_search_index(using=using, rebuild=True):
+            raise CommandError(
+                f"Full-text search is not supported on database '{using}'; "
+                'searches will use substring matching'
+            )
+        logger.info("Rebuilt obligation search index on %s", using)
+        self.stdout.write(self.style.SUCCESS('Obligation search index rebuilt'))
@@ -0,0 +1,52 @@
+import logging
+import uuid
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from obligations.bulk import run_bulk_job
+from obligations.models import BulkOperationJob
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = (
+        'Run queued bulk obligation operations, resuming any interrupted by '
+        'a restart from their last completed chunk'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--job',
+            type=uuid.UUID,
+            default=None,
+            help='Run only this job id (including failed jobs)',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Run pending bulk operation jobs in creation order."""
+        if options['job']:
+            jobs = BulkOperationJob.objects.filter(pk=options['job'])
+            if not jobs.exists():
+                raise CommandError(f"Bulk operation job {options['job']} not found")
+        else:
+            jobs = BulkOperationJob.objects.filter(
+                state__in=[
+                    BulkOperationJob.STATE_QUEUED,
+                    BulkOperationJob.STATE_RUNNING,
+                ]
+            )
+
+        succeeded = failed = 0
+        for job_id in list(jobs.order_by('created_at').values_list('pk', flat=True)):
+            job = run_bulk_job(job_id)
+            if job.state == BulkOperationJob.STATE_SUCCEEDED:
+                succeeded += 1
+                self.stdout.write(f"{job.pk}: {job.affected}/{job.total} affected")
+            else:
+                failed += 1
+                self.stderr.write(f"{job.pk}: failed - {job.error}")
+        logger.info("Ran %s bulk jobs (%s failed)", succeeded + failed, failed)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Bulk jobs: {succeeded} succeeded, {failed} failed"
+        ))
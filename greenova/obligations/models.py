@@ -1,20 +1,34 @@
 import logging
+import os
 import re
-from datetime import date
-from typing import Any
+import uuid
+from datetime import date, timedelta
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from core.utils.roles import get_responsibility_choices
+from core.utils.thumbnails import delete_derivatives
 from dateutil.relativedelta import relativedelta
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import FileExtensionValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, IntegerField, Max, Q, Value, When
+from django.db.models.functions import Cast, Substr
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
+from mechanisms.models import (
+    CounterState,
+    apply_counter_transition,
+    get_counter_buckets,
+)
 from projects.models import Project
 from responsibility.models import Responsibility
 
 from .constants import (
+    EVIDENCE_EXTENSIONS,
     FREQUENCY_ANNUAL,
     FREQUENCY_BIANNUAL,
     FREQUENCY_DAILY,
@@ -22,14 +36,322 @@
     FREQUENCY_MONTHLY,
     FREQUENCY_QUARTERLY,
     FREQUENCY_WEEKLY,
+    OBLIGATION_NUMBER_PREFIX,
     STATUS_CHOICES,
     STATUS_COMPLETED,
     STATUS_NOT_STARTED,
+    STATUS_OVERDUE,
+    STATUS_UPCOMING,
+)
+from .search import search_q
+from .storage import (
+    ContentAddressedStorage,
+    digest_from_name,
+    evidence_storage,
+    gc_grace_seconds,
+    guess_content_type,
 )
-from .utils import normalize_frequency
+from .utils import normalize_frequency, overdue_q
 
 logger = logging.getLogger(__name__)
 
+# Stored fields the pre_save hooks compare against the previous row
+COUNTER_SNAPSHOT_FIELDS = (
+    "primary_environmental_mechanism_id",
+    "status",
+    "action_due_date",
+)
+RECURRING_SNAPSHOT_FIELDS = (
+    "recurring_obligation",
+    "recurring_frequency",
+    "status",
+    "action_due_date",
+)
+
+# Window used by get_obligation_status to flag an obligation as upcoming
+UPCOMING_WINDOW_DAYS = 14
+
+# Interval between occurrences for each normalized recurring frequency
+FREQUENCY_DELTAS: dict[str, relativedelta] = {
+    FREQUENCY_DAILY: relativedelta(days=1),
+    FREQUENCY_WEEKLY: relativedelta(weeks=1),
+    FREQUENCY_FORTNIGHTLY: relativedelta(weeks=2),
+    FREQUENCY_MONTHLY: relativedelta(months=1),
+    FREQUENCY_QUARTERLY: relativedelta(months=3),
+    FREQUENCY_BIANNUAL: relativedelta(months=6),
+    FREQUENCY_ANNUAL: relativedelta(years=1),
+}
+
+
+@lru_cache(maxsize=4096)
+def next_recurring_date(base_date: date, frequency: str) -> date:
+    """
+    Return the occurrence following ``base_date`` for a recurring frequency.
+
+    Unrecognized frequencies fall back to monthly. Results are cached, so
+    a sweep over many obligations sharing a base date and frequency only
+    computes each distinct date once.
+
+    Args:
+        base_date: Date to step forward from
+        frequency: Raw recurring frequency, normalized before lookup
+
+    Returns:
+        date: The next occurrence
+    """
+    delta = FREQUENCY_DELTAS.get(normalize_frequency(frequency))
+    if delta is None:
+        # Default to monthly if we don't recognize the frequency
+        logger.warning(
+            "Unrecognized frequency '%s' - defaulting to monthly", frequency
+        )
+        delta = FREQUENCY_DELTAS[FREQUENCY_MONTHLY]
+    return base_date + delta
+
+
+class ObligationQuerySet(models.QuerySet):
+    """QuerySet expressing the obligation status rules as database predicates.
+
+    These mirror ``obligations.utils.is_obligation_overdue`` and
+    ``get_obligation_status`` so that overdue filters and counts run as a
+    single query instead of iterating obligations in Python.
+    """
+
+    def active(self) -> "ObligationQuerySet":
+        """Return obligations that have not been completed."""
+        return self.exclude(status=STATUS_COMPLETED)
+
+    def overdue(self, reference_date: date | None = None) -> "ObligationQuerySet":
+        """Return obligations that are overdue on the reference date.
+
+        Args:
+            reference_date: Date to compare against (defaults to today)
+        """
+        return self.filter(overdue_q(reference_date))
+
+    def upcoming(
+        self, days: int = UPCOMING_WINDOW_DAYS, reference_date: date | None = None
+    ) -> "ObligationQuerySet":
+        """Return active obligations falling due within the next ``days`` days.
+
+        Args:
+            days: Size of the look-ahead window in days
+            reference_date: Start of the window (defaults to today)
+        """
+        if reference_date is None:
+            reference_date = timezone.now().date()
+        return self.active().filter(
+            action_due_date__gte=reference_date,
+            action_due_date__lte=reference_date + timedelta(days=days),
+        )
+
+    def with_effective_status(
+        self, reference_date: date | None = None
+    ) -> "ObligationQuerySet":
+        """Annotate each obligation with its ``effective_status``.
+
+        The annotation matches ``get_obligation_status``: completed wins,
+        then overdue, then upcoming, otherwise the stored status.
+
+        Args:
+            reference_date: Date to evaluate against (defaults to today)
+        """
+        if reference_date is None:
+            reference_date = timezone.now().date()
+        upcoming_end = reference_date + timedelta(days=UPCOMING_WINDOW_DAYS)
+        return self.annotate(
+            effective_status=Case(
+                When(status=STATUS_COMPLETED, then=Value(STATUS_COMPLETED)),
+                When(overdue_q(reference_date), then=Value(STATUS_OVERDUE)),
+                When(
+                    Q(action_due_date__gte=reference_date)
+                    & Q(action_due_date__lte=upcoming_end),
+                    then=Value(STATUS_UPCOMING),
+                ),
+                default=F("status"),
+                output_field=models.CharField(max_length=20),
+            )
+        )
+
+    def search(self, term: str) -> "ObligationQuerySet":
+        """Filter to every obligation matching ``term``.
+
+        Uses the full-text index from ``obligations.search`` as an uncapped
+        subquery, falling back to ``icontains`` over the same fields when
+        the database has no index. Ranked, limited hits with snippets come
+        from ``obligations.search.search_obligations`` instead.
+
+        Args:
+            term: User-entered search text
+        """
+        return self.filter(search_q(term, using=self.db))
+
+    def refresh_recurring_forecasts(
+        self, reference_date: date | None = None, batch_size: int = 1000
+    ) -> int:
+        """Roll stale recurring forecast dates forward in bulk.
+
+        Only recurring obligations whose forecast is missing or already in
+        the past are touched, so running this daily is idempotent. New dates
+        come from ``next_recurring_date`` (cached per distinct base date and
+        frequency) and are written with ``bulk_update``, so no ``save()`` or
+        signal runs per row. ``updated_at`` is stamped explicitly because
+        ``auto_now`` only fires on ``save()``, and ETags derived from it must
+        change when a forecast does.
+
+        Args:
+            reference_date: Date treated as today (defaults to today)
+            batch_size: Rows per bulk UPDATE
+
+        Returns:
+            int: Number of obligations whose forecast date changed
+        """
+        if reference_date is None:
+            reference_date = timezone.now().date()
+        stale = (
+            self.filter(recurring_obligation=True)
+            .exclude(recurring_frequency__isnull=True)
+            .exclude(recurring_frequency="")
+            .filter(
+                Q(recurring_forcasted_date__isnull=True)
+                | Q(recurring_forcasted_date__lt=reference_date)
+            )
+            .values_list(
+                "pk",
+                "recurring_frequency",
+                "recurring_forcasted_date",
+                "action_due_date",
+            )
+        )
+
+        changed = []
+        now = timezone.now()
+        # Materialized before writing so the UPDATEs never race an open cursor
+        for pk, frequency, forecast, due_date in list(stale):
+            # Same base as calculate_next_recurring_date
+            base_date = max(forecast or due_date or reference_date, reference_date)
+            next_date = next_recurring_date(base_date, frequency)
+            if next_date != forecast:
+                changed.append(
+                    self.model(
+                        pk=pk, recurring_forcasted_date=next_date, updated_at=now
+                    )
+                )
+
+        with transaction.atomic():
+            self.model.objects.bulk_update(
+                changed,
+                ["recurring_forcasted_date", "updated_at"],
+                batch_size=batch_size,
+            )
+        return len(changed)
+
+
+class ObligationNumberSequence(models.Model):
+    """Per-prefix counter used to hand out obligation numbers.
+
+    Allocation is a single ``UPDATE ... SET last_value = last_value + n`` on
+    one row, so it is O(1) and serialised by the database row lock rather
+    than by scanning existing obligations.
+    """
+
+    prefix: Any = models.CharField(max_length=20, unique=True)
+    last_value: Any = models.PositiveBigIntegerField(default=0)
+    updated_at: Any = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Obligation Number Sequence"
+        verbose_name_plural = "Obligation Number Sequences"
+        app_label = "obligations"
+
+    def __str__(self) -> str:
+        return f"{self.prefix}{self.last_value:03d}"
+
+    @staticmethod
+    def highest_existing_number(prefix: str = OBLIGATION_NUMBER_PREFIX) -> int:
+        """Return the highest numeric suffix already used for ``prefix``.
+
+        Computed with a single aggregate query so it can seed the sequence
+        without loading obligations into Python.
+        """
+        result = (
+            Obligation.objects.filter(
+                obligation_number__regex=rf"^{re.escape(prefix)}[0-9]+$"
+            )
+            .annotate(
+                number_value=Cast(
+                    Substr("obligation_number", len(prefix) + 1), IntegerField()
+                )
+            )
+            .aggregate(highest=Max("number_value"))
+        )
+        return result["highest"] or 0
+
+    @classmethod
+    def seed(
+        cls, prefix: str = OBLIGATION_NUMBER_PREFIX
+    ) -> "ObligationNumberSequence":
+        """Create or fast-forward the sequence to cover existing obligations."""
+        highest = cls.highest_existing_number(prefix)
+        with transaction.atomic():
+            sequence, created = cls.objects.select_for_update().get_or_create(
+                prefix=prefix, defaults={"last_value": highest}
+            )
+            if not created and highest > sequence.last_value:
+                sequence.last_value = highest
+                sequence.save(update_fields=["last_value", "updated_at"])
+        return sequence
+
+    @classmethod
+    def allocate(
+        cls, count: int = 1, prefix: str = OBLIGATION_NUMBER_PREFIX
+    ) -> int:
+        """Atomically reserve ``count`` consecutive numbers for ``prefix``.
+
+        Args:
+            count: Size of the block to reserve
+            prefix: Obligation number prefix
+
+        Returns:
+            int: The first number of the reserved block
+        """
+        if count < 1:
+            raise ValueError("count must be a positive integer")
+
+        with transaction.atomic():
+            updated = cls.objects.filter(prefix=prefix).update(
+                last_value=F("last_value") + count, updated_at=timezone.now()
+            )
+            if not updated:
+                # First use of this prefix: seed from existing data, then retry
+                cls.seed(prefix)
+                cls.objects.filter(prefix=prefix).update(
+                    last_value=F("last_value") + count, updated_at=timezone.now()
+                )
+            last_value = (
+                cls.objects.filter(prefix=prefix)
+                .values_list("last_value", flat=True)
+                .get()
+            )
+        return last_value - count + 1
+
+    @classmethod
+    def observe(
+        cls, obligation_number: str, prefix: str = OBLIGATION_NUMBER_PREFIX
+    ) -> None:
+        """Fast-forward the sequence past an explicitly supplied number."""
+        match = re.match(rf"^{re.escape(prefix)}(\d+)$", obligation_number or "")
+        if not match:
+            return
+        value = int(match.group(1))
+        behind = cls.objects.filter(prefix=prefix, last_value__lt=value)
+        updated = behind.update(last_value=value, updated_at=timezone.now())
+        if not updated and not cls.objects.filter(prefix=prefix).exists():
+            # The number may not be written yet, so seeding alone can miss it
+            cls.seed(prefix)
+            behind.update(last_value=value, updated_at=timezone.now())
+
+
 class Obligation(models.Model):
     """Represents an environmental obligation."""
 
@@ -210,9 +532,18 @@ class Obligation(models.Model):
     )
     gap_analysis: Any = models.BooleanField(default=False)
     notes_for_gap_analysis: Any = models.TextField(blank=True, null=True)
+    import_fingerprint: Any = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="SHA-256 of the normalized row this obligation was last imported from",
+    )
     created_at: Any = models.DateTimeField(auto_now_add=True)
     updated_at: Any = models.DateTimeField(auto_now=True)
 
+    objects = ObligationQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Obligation"
         verbose_name_plural = "Obligations"
@@ -221,6 +552,10 @@ class Meta:
             models.Index(fields=["status"]),
             models.Index(fields=["action_due_date"]),
             models.Index(fields=["project"]),
+            # Covers the overdue/upcoming predicates scoped to a project
+            models.Index(fields=["project", "status", "action_due_date"]),
+            # Latest change per project, for conditional GET validators
+            models.Index(fields=["project", "updated_at"]),
         ]
         app_label = "obligations"
 
@@ -249,30 +584,7 @@ def calculate_next_recurring_date(self) -> date | None:
         today = timezone.now().date()
         base_date = max(base_date, today)
 
-        # Normalize frequency
-        normalized_frequency = normalize_frequency(self.recurring_frequency)
-
-        # Calculate next date based on frequency
-        if normalized_frequency == FREQUENCY_DAILY:
-            return base_date + relativedelta(days=1)
-        elif normalized_frequency == FREQUENCY_WEEKLY:
-            return base_date + relativedelta(weeks=1)
-        elif normalized_frequency == FREQUENCY_FORTNIGHTLY:
-            return base_date + relativedelta(weeks=2)
-        elif normalized_frequency == FREQUENCY_MONTHLY:
-            return base_date + relativedelta(months=1)
-        elif normalized_frequency == FREQUENCY_QUARTERLY:
-            return base_date + relativedelta(months=3)
-        elif normalized_frequency == FREQUENCY_BIANNUAL:
-            return base_date + relativedelta(months=6)
-        elif normalized_frequency == FREQUENCY_ANNUAL:
-            return base_date + relativedelta(years=1)
-        # Default to monthly if we don't recognize the frequency
-        logger.warning(
-            "Unrecognized frequency '%s' - defaulting to monthly",
-            self.recurring_frequency,
-        )
-        return base_date + relativedelta(months=1)
+        return next_recurring_date(base_date, self.recurring_frequency)
 
     def update_recurring_forecasted_date(self) -> bool:
         """
@@ -297,39 +609,48 @@ def update_recurring_forecasted_date(self) -> bool:
     @classmethod
     def get_next_obligation_number(cls) -> str:
         """
-        Generate the next sequential obligation number in the format PCEMP-XXX.
+        Allocate the next sequential obligation number in the format PCEMP-XXX.
+
+        Each call consumes a number from ``ObligationNumberSequence``, so two
+        concurrent creates never receive the same value.
 
         Returns:
             str: The next obligation number (e.g., PCEMP-101)
         """
-        prefix = "PCEMP-"
+        return cls.reserve_obligation_numbers(1)[0]
 
-        # Extract the highest numeric value from all obligation numbers
-        highest_number = 0
+    @classmethod
+    def reserve_obligation_numbers(cls, count: int) -> list[str]:
+        """
+        Reserve a block of consecutive obligation numbers, e.g. for bulk imports.
 
-        # Query all obligation numbers
-        all_obligations = cls.objects.all()
+        Args:
+            count: How many numbers to reserve
 
-        for obligation in all_obligations:
-            if obligation.obligation_number and obligation.obligation_number.startswith(
-                prefix
-            ):
-                try:
-                    # Extract numeric part after the prefix
-                    number_part = obligation.obligation_number[len(prefix) :]
-                    current_number = int(number_part)
+        Returns:
+            list[str]: The reserved obligation numbers in ascending order
+        """
+        first = ObligationNumberSequence.allocate(count)
+        return [
+            f"{OBLIGATION_NUMBER_PREFIX}{number:03d}"
+            for number in range(first, first + count)
+        ]
 
-                    # Update highest if we found a larger number
-                    highest_number = max(highest_number, current_number)
-                except (ValueError, IndexError):
-                    # Skip if we can't parse the number
-                    continue
+    @staticmethod
+    def format_obligation_number(obligation_number: str) -> str:
+        """
+        Coerce an obligation number onto the PCEMP- prefix.
 
-        # Increment by 1 for the next number
-        next_number = highest_number + 1
+        Args:
+            obligation_number: Raw obligation number (e.g. "OBL-12" or "12")
 
-        # Format with leading zeros (e.g., PCEMP-001)
-        return f"{prefix}{next_number:03d}"
+        Returns:
+            str: The number with the PCEMP- prefix (e.g. "PCEMP-12")
+        """
+        if obligation_number.startswith(OBLIGATION_NUMBER_PREFIX):
+            return obligation_number
+        suffix = obligation_number.split("-")[-1]
+        return f"{OBLIGATION_NUMBER_PREFIX}{suffix}"
 
     def clean(self) -> None:
         """Validate the obligation number format."""
@@ -346,23 +667,70 @@ def clean(self) -> None:
                 )
 
     def save(self, *args: Any, **kwargs: Any) -> None:
-        """Override save to update mechanism counts and ensure proper obligation number format."""
+        """Override save to ensure proper obligation number format."""
         # Generate a new obligation number if one isn't provided
         if not self.obligation_number or self.obligation_number.strip() == "":
             self.obligation_number = self.get_next_obligation_number()
 
         # Ensure the format is correct (prefix + number)
-        if not self.obligation_number.startswith("PCEMP-"):
-            self.obligation_number = f"PCEMP-{self.obligation_number.split('-')[-1] if '-' in self.obligation_number else self.obligation_number}"
+        self.obligation_number = self.format_obligation_number(self.obligation_number)
 
+        adding = self._state.adding
         try:
             super().save(*args, **kwargs)
         except Exception as exc:
             logger.error("Error saving obligation: %s", str(exc))
+        else:
+            # Keep the sequence ahead of explicitly numbered (e.g. imported) rows
+            if adding:
+                ObligationNumberSequence.observe(self.obligation_number)
+            self._snapshot_loaded_values(kwargs.get("update_fields"))
 
-        # Update mechanism counts
-        if self.primary_environmental_mechanism:
-            self.primary_environmental_mechanism.update_obligation_counts()
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded field values so later saves can diff against them."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def refresh_from_db(self, *args: Any, **kwargs: Any) -> None:
+        """Reload from the database and re-snapshot the reloaded fields."""
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot_loaded_values(kwargs.get("fields"))
+
+    def _snapshot_loaded_values(self, fields=None) -> None:
+        """Record the current values of ``fields`` (default: all loaded) as stored."""
+        deferred = self.get_deferred_fields()
+        snapshot = self.__dict__.setdefault("_loaded_values", {})
+        for field in self._meta.concrete_fields:
+            if field.attname in deferred:
+                continue
+            if fields is None or field.name in fields or field.attname in fields:
+                snapshot[field.attname] = getattr(self, field.attname)
+
+    @property
+    def loaded_values(self) -> Mapping[str, Any]:
+        """Field values as last loaded or saved, keyed by attname.
+
+        Empty for instances that were never read from or written to the
+        database, since nothing is known about their stored row.
+        """
+        return MappingProxyType(self.__dict__.get("_loaded_values", {}))
+
+    def changed_fields(self) -> frozenset[str] | None:
+        """Return attnames whose value differs from the last load or save.
+
+        Returns:
+            frozenset[str] | None: Changed attnames, or None when the
+            instance has no snapshot to compare against
+        """
+        loaded = self.__dict__.get("_loaded_values")
+        if loaded is None:
+            return None
+        return frozenset(
+            attname for attname, value in loaded.items()
+            if getattr(self, attname) != value
+        )
 
     @property
     def is_overdue(self) -> bool:
@@ -371,57 +739,85 @@ def is_overdue(self) -> bool:
             return self.action_due_date < timezone.now().date()
         return False
 
+    def get_counter_state(self) -> CounterState:
+        """Return the mechanism counter buckets this obligation contributes to."""
+        return (
+            self.primary_environmental_mechanism_id,
+            get_counter_buckets(self.status, self.action_due_date),
+        )
+
+
+# Signal handlers to keep mechanism counts in step incrementally
+@receiver(pre_save, sender=Obligation)
+def capture_counter_state_on_save(sender, instance, **kwargs):
+    """Record which counter buckets the stored row occupied before this write."""
+    instance._counter_state_before = None
+    if instance._state.adding:
+        # obligation_number is set before insert, so pk cannot tell new rows
+        return
+    loaded = instance.loaded_values
+    if all(field in loaded for field in COUNTER_SNAPSHOT_FIELDS):
+        previous = tuple(loaded[field] for field in COUNTER_SNAPSHOT_FIELDS)
+    else:
+        # Not loaded through the ORM, so read what is stored
+        previous = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list(*COUNTER_SNAPSHOT_FIELDS)
+            .first()
+        )
+    if previous:
+        mechanism_id, status, due_date = previous
+        instance._counter_state_before = (
+            mechanism_id,
+            get_counter_buckets(status, due_date),
+        )
+
 
-# Signal handlers to update mechanism counts
 @receiver(post_save, sender=Obligation)
 def update_mechanism_counts_on_save(sender, instance, **kwargs):
-    """Update mechanism counts when an obligation is saved."""
+    """Apply the counter delta for an obligation that was saved."""
     try:
-        if instance.primary_environmental_mechanism:
-            instance.primary_environmental_mechanism.update_obligation_counts()
-            logger.info(
-                "Updated counts for mechanism %s",
-                instance.primary_environmental_mechanism.name,
-            )
+        apply_counter_transition(
+            getattr(instance, "_counter_state_before", None),
+            instance.get_counter_state(),
+        )
     except Exception as e:
         logger.error("Error updating mechanism counts on save: %s", str(e))
 
 
 @receiver(post_delete, sender=Obligation)
 def update_mechanism_counts_on_delete(sender, instance, **kwargs):
-    """Update mechanism counts when an obligation is deleted."""
-    if instance.primary_environmental_mechanism:
-        instance.primary_environmental_mechanism.update_obligation_counts()
+    """Remove a deleted obligation from its mechanism's counters."""
+    apply_counter_transition(instance.get_counter_state(), None)
 
 
 class ObligationEvidence(models.Model):
-    """Model to store multiple evidence files for an obligation."""
+    """Model to store multiple evidence files for an obligation.
+
+    Files live in content-addressed storage, so identical uploads share one
+    blob. The digest, size and MIME type are copied onto the row when the
+    file is saved, and the blob is deleted once no row refers to it.
+    """
 
     obligation: Any = models.ForeignKey(
         "Obligation", on_delete=models.CASCADE, related_name="evidences"
     )
     file: Any = models.FileField(
-        upload_to="evidence_files/%Y/%m/%d/",
+        upload_to="evidence/",
+        storage=evidence_storage,
         validators=[
-            FileExtensionValidator(
-                allowed_extensions=[
-                    "pdf",
-                    "doc",
-                    "docx",
-                    "xls",
-                    "xlsx",
-                    "png",
-                    "jpg",
-                    "jpeg",
-                    "gif",
-                    "txt",
-                    "csv",
-                ]
-            )
+            FileExtensionValidator(allowed_extensions=EVIDENCE_EXTENSIONS)
         ],
         max_length=255,
+        db_index=True,
         help_text="Upload evidence documents (25MB max)",
     )
+    original_name: Any = models.CharField(max_length=255, blank=True)
+    sha256: Any = models.CharField(
+        max_length=64, blank=True, db_index=True, editable=False
+    )
+    size: Any = models.PositiveBigIntegerField(null=True, editable=False)
+    content_type: Any = models.CharField(max_length=100, blank=True, editable=False)
     uploaded_at: Any = models.DateTimeField(auto_now_add=True)
     description: Any = models.CharField(max_length=255, blank=True)
 
@@ -431,11 +827,36 @@ class Meta:
         verbose_name_plural = "Evidence Files"
 
     def __str__(self) -> str:
-        return f"Evidence for {self.obligation} - {self.file.name}"
+        return f"Evidence for {self.obligation} - {self.display_name}"
+
+    @property
+    def display_name(self) -> str:
+        """Name the file was uploaded as (the blob name for legacy rows)."""
+        return self.original_name or os.path.basename(self.file.name or "")
+
+    def save(self, *args, **kwargs) -> None:
+        """Store a newly attached file and record its digest, size and type."""
+        replaced = None
+        if self.file and not self.file._committed:
+            if self.pk is not None:
+                replaced = (
+                    ObligationEvidence.objects.filter(pk=self.pk)
+                    .values_list("file", flat=True)
+                    .first()
+                )
+            # Read these from the upload; afterwards they would hit storage
+            self.original_name = os.path.basename(self.file.name)[:255]
+            self.size = self.file.size
+            self.file.save(self.file.name, self.file.file, save=False)
+            self.sha256 = digest_from_name(self.file.name)
+            self.content_type = guess_content_type(self.original_name)
+        super().save(*args, **kwargs)
+        if replaced and replaced != self.file.name:
+            release_evidence_file(replaced)
 
     def file_size(self) -> str:
         """Return the file size in a human-readable format."""
-        size = self.file.size
+        size = self.size if self.size is not None else self.file.size
         if size < 1024:
             return f"{size} bytes"
         elif size < 1024 * 1024:
@@ -444,41 +865,228 @@ def file_size(self) -> str:
             return f"{size / (1024 * 1024):.1f} MB"
 
 
+def _delete_evidence_blob(name: str, grace: float) -> bool:
+    """Delete an unreferenced blob and its derivatives; True if it was deleted."""
+    storage = ObligationEvidence._meta.get_field("file").storage
+    try:
+        if isinstance(storage, ContentAddressedStorage):
+            # Deduplicated blobs may be reused by an upload still in flight
+            if not storage.delete_unless_recent(name, grace):
+                return False
+        else:
+            storage.delete(name)
+        delete_derivatives(name)
+    except OSError as e:
+        logger.warning("Could not delete evidence file %s: %s", name, e)
+        return False
+    return True
+
+
+def release_evidence_file(name: str) -> None:
+    """
+    Delete an evidence blob once no evidence row references it.
+
+    The check runs after the surrounding transaction commits, so a rolled
+    back delete never loses a file. A blob stored or reused within the GC
+    grace period is left for ``sweep_evidence_files``.
+
+    Args:
+        name: Storage name of the file that lost a reference
+    """
+    if not name:
+        return
+
+    def delete_if_unreferenced() -> None:
+        if ObligationEvidence.objects.filter(file=name).exists():
+            return
+        _delete_evidence_blob(name, gc_grace_seconds())
+
+    transaction.on_commit(delete_if_unreferenced)
+
+
+def sweep_evidence_files(grace: float | None = None) -> int:
+    """
+    Delete stored evidence blobs that no row references.
+
+    Collects the blobs ``release_evidence_file`` spared because they were
+    reused recently, and any orphaned by a crash. Blobs used within the
+    grace period are still left alone.
+
+    Args:
+        grace: Seconds a blob must go unused (defaults to the setting)
+
+    Returns:
+        int: Number of blobs deleted
+    """
+    storage = ObligationEvidence._meta.get_field("file").storage
+    if not isinstance(storage, ContentAddressedStorage):
+        return 0
+    if grace is None:
+        grace = gc_grace_seconds()
+    referenced = set(ObligationEvidence.objects.values_list("file", flat=True))
+    return sum(
+        _delete_evidence_blob(name, grace)
+        for name in storage.blob_names()
+        if name not in referenced
+    )
+
+
+@receiver(post_delete, sender=ObligationEvidence)
+def release_evidence_on_delete(sender, instance, **kwargs):
+    """Drop the deleted row's reference to its evidence blob."""
+    release_evidence_file(instance.file.name)
+
+
+class BulkOperationJob(models.Model):
+    """Progress record for a bulk operation too large to finish in one request.
+
+    Chunks are idempotent, so an interrupted job can be resumed from
+    ``processed`` (see the ``run_bulk_jobs`` command).
+    """
+
+    ACTION_COMPLETE = "complete"
+    ACTION_DELETE = "delete"
+    ACTION_CHOICES = [
+        (ACTION_COMPLETE, "Mark complete"),
+        (ACTION_DELETE, "Delete"),
+    ]
+
+    STATE_QUEUED = "queued"
+    STATE_RUNNING = "running"
+    STATE_SUCCEEDED = "succeeded"
+    STATE_FAILED = "failed"
+    STATE_CHOICES = [
+        (STATE_QUEUED, "Queued"),
+        (STATE_RUNNING, "Running"),
+        (STATE_SUCCEEDED, "Succeeded"),
+        (STATE_FAILED, "Failed"),
+    ]
+
+    id: Any = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    action: Any = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    state: Any = models.CharField(
+        max_length=20, choices=STATE_CHOICES, default=STATE_QUEUED
+    )
+    obligation_numbers: Any = models.JSONField(default=list)
+    # Mechanisms touched so far, recounted once when the job finishes
+    mechanism_ids: Any = models.JSONField(default=list)
+    total: Any = models.PositiveIntegerField(default=0)
+    processed: Any = models.PositiveIntegerField(default=0)
+    affected: Any = models.PositiveIntegerField(default=0)
+    error: Any = models.TextField(blank=True)
+    created_by: Any = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_at: Any = models.DateTimeField(auto_now_add=True)
+    updated_at: Any = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.get_action_display()} {self.total} obligations ({self.state})"
+
+    @property
+    def progress(self) -> float:
+        """Fraction of obligation numbers processed, from 0.0 to 1.0."""
+        return self.processed / self.total if self.total else 1.0
+
+
+class EvidenceUpload(models.Model):
+    """A chunked evidence upload in progress (see ``obligations.uploads``).
+
+    ``received`` is the number of bytes spooled so far, so a client that
+    lost its connection resumes from there. Completed uploads keep a link
+    to the evidence they created, which makes a repeated completion
+    request return the same file.
+    """
+
+    STATE_OPEN = "open"
+    STATE_COMPLETE = "complete"
+    STATE_CHOICES = [
+        (STATE_OPEN, "Open"),
+        (STATE_COMPLETE, "Complete"),
+    ]
+
+    id: Any = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    obligation: Any = models.ForeignKey(
+        "Obligation", on_delete=models.CASCADE, related_name="evidence_uploads"
+    )
+    filename: Any = models.CharField(max_length=255)
+    description: Any = models.CharField(max_length=255, blank=True)
+    size: Any = models.PositiveBigIntegerField()
+    # Client-supplied SHA-256 the assembled file must match
+    sha256: Any = models.CharField(max_length=64)
+    received: Any = models.PositiveBigIntegerField(default=0)
+    state: Any = models.CharField(
+        max_length=20, choices=STATE_CHOICES, default=STATE_OPEN
+    )
+    evidence: Any = models.ForeignKey(
+        ObligationEvidence,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_by: Any = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_at: Any = models.DateTimeField(auto_now_add=True)
+    updated_at: Any = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.received}/{self.size} bytes, {self.state})"
+
+
 @receiver(pre_save, sender="obligations.Obligation")
 def update_forecasted_date_on_change(sender, instance, **kwargs):
     """Signal handler to update forecasted date when relevant fields change."""
-    # If this is a new instance, skip this check
-    if not instance.pk:
-        # For new instances, just make sure the date is calculated
+    # New rows have nothing stored to compare against, so just calculate the
+    # date (obligation_number is set before insert, so pk cannot tell them)
+    if instance._state.adding:
         instance.update_recurring_forecasted_date()
         return
 
-    try:
-        # Get the existing record to compare changes
-        old_instance = sender.objects.get(pk=instance.pk)
-
-        # Check if relevant fields changed
-        if (
-            instance.recurring_obligation != old_instance.recurring_obligation
-            or instance.recurring_frequency != old_instance.recurring_frequency
-            or instance.status != old_instance.status
-            or instance.action_due_date != old_instance.action_due_date
-        ):
-            instance.update_recurring_forecasted_date()
-
-        # If status changed to completed, handle recurring logic
-        if (
-            instance.status == STATUS_COMPLETED
-            and old_instance.status != STATUS_COMPLETED
-            and instance.recurring_obligation
-        ):
-            # When a recurring obligation is completed, reset status and calculate next date
-            instance.status = STATUS_NOT_STARTED
-            instance.update_recurring_forecasted_date()
-
-    except sender.DoesNotExist:
-        # This shouldn't happen but just in case
-        pass
+    loaded = instance.loaded_values
+    if all(field in loaded for field in RECURRING_SNAPSHOT_FIELDS):
+        old_values = {field: loaded[field] for field in RECURRING_SNAPSHOT_FIELDS}
+    else:
+        # Not loaded through the ORM, so read what is stored
+        old_values = (
+            sender.objects.filter(pk=instance.pk)
+            .values(*RECURRING_SNAPSHOT_FIELDS)
+            .first()
+        )
+        if old_values is None:
+            return
+
+    # Check if relevant fields changed
+    if any(
+        getattr(instance, field) != old_values[field]
+        for field in RECURRING_SNAPSHOT_FIELDS
+    ):
+        instance.update_recurring_forecasted_date()
+
+    # If status changed to completed, handle recurring logic
+    if (
+        instance.status == STATUS_COMPLETED
+        and old_values["status"] != STATUS_COMPLETED
+        and instance.recurring_obligation
+    ):
+        # When a recurring obligation is completed, reset status and calculate next date
+        instance.status = STATUS_NOT_STARTED
+        instance.update_recurring_forecasted_date()
 
 
 @receiver(pre_save, sender="obligations.Obligation")
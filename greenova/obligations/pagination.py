@@ -0,0 +1,219 @@
+"""
+Keyset (cursor) pagination for obligation lists.
+
+Pages are fetched with a seek predicate on ``(sort field, obligation_number)``
+instead of ``OFFSET``, so page 500 costs the same as page 1, and the total is
+counted only up to ``COUNT_LIMIT`` rows. Cursor tokens are signed, so they
+are opaque to clients and cannot be edited to inject filter values.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import F, Model, Q, QuerySet
+
+logger = logging.getLogger(__name__)
+
+# Exact counts stop here; larger result sets report an estimate instead
+COUNT_LIMIT = 1000
+
+_CURSOR_SALT = "obligations.pagination.cursor"
+
+
+@dataclass
+class KeysetPage:
+    """One page of results plus the tokens for its neighbours."""
+
+    object_list: List[Model]
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+    count: int = 0
+    count_is_estimate: bool = False
+    per_page: int = 0
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking past the last row of the previous page.
+
+    The queryset is ordered by ``sort`` (a model field name, prefixed with
+    ``-`` for descending) with NULLs last, then by primary key as a unique
+    tie-breaker. Unknown sort fields fall back to the primary key.
+
+    Args:
+        queryset: Filtered obligations; any existing ordering is replaced
+        per_page: Rows per page
+        sort: Field to order by, e.g. ``"-action_due_date"``
+        count_limit: Rows to count exactly before switching to an estimate
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        per_page: int,
+        sort: str = "pk",
+        count_limit: int = COUNT_LIMIT,
+    ):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.count_limit = count_limit
+        self.descending = sort.startswith("-")
+        self.pk_name = queryset.model._meta.pk.name
+        name = sort.lstrip("-")
+        if name == "pk":
+            name = self.pk_name
+        try:
+            self.sort_field = queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            self.sort_field = None
+        if self.sort_field is not None and (
+            self.sort_field.is_relation or not self.sort_field.concrete
+        ):
+            self.sort_field = None
+        if self.sort_field is None:
+            self.sort_field = queryset.model._meta.pk
+            self.descending = False
+        # Sorting on the key itself needs no separate tie-breaker
+        self.sort_name = self.sort_field.attname
+        self.single_key = self.sort_field.primary_key
+        self.sort = f"{'-' if self.descending else ''}{self.sort_name}"
+
+    def _ordering(self, reverse: bool = False) -> List[Any]:
+        descending = self.descending != reverse
+        if self.single_key:
+            return [f"-{self.pk_name}" if descending else self.pk_name]
+        # NULLs sort last going forward, so first when walking backwards
+        nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+        expression = F(self.sort_name)
+        order = expression.desc(**nulls) if descending else expression.asc(**nulls)
+        return [order, f"-{self.pk_name}" if reverse else self.pk_name]
+
+    def _seek(self, value: Any, pk: Any, after: bool) -> Q:
+        """Rows strictly after (or before) ``(value, pk)`` in page order."""
+        pk_cmp = "gt" if after else "lt"
+        if self.single_key:
+            if self.descending:
+                pk_cmp = "lt" if after else "gt"
+            return Q(**{f"{self.pk_name}__{pk_cmp}": pk})
+
+        name = self.sort_name
+        value_cmp = "gt" if after != self.descending else "lt"
+        same_value = Q(**{name: value, f"{self.pk_name}__{pk_cmp}": pk})
+        if value is None:
+            null_tail = Q(**{f"{name}__isnull": True, f"{self.pk_name}__{pk_cmp}": pk})
+            return null_tail if after else Q(**{f"{name}__isnull": False}) | null_tail
+        seek = Q(**{f"{name}__{value_cmp}": value}) | same_value
+        if after:
+            seek |= Q(**{f"{name}__isnull": True})
+        return seek
+
+    def _key(self, obj: Model) -> Tuple[Any, Any]:
+        return getattr(obj, self.sort_name), obj.pk
+
+    def _encode(self, obj: Model, direction: str) -> str:
+        value, pk = self._key(obj)
+        payload = {
+            "s": self.sort,
+            "d": direction,
+            "v": self.sort_field.value_to_string(obj) if value is not None else None,
+            "k": pk,
+        }
+        return signing.dumps(payload, salt=_CURSOR_SALT, compress=True)
+
+    def _decode(self, cursor: Optional[str]) -> Optional[Tuple[str, Any, Any]]:
+        if not cursor:
+            return None
+        try:
+            payload = signing.loads(cursor, salt=_CURSOR_SALT)
+            if payload["s"] != self.sort or payload["d"] not in ("n", "p"):
+                # Sort changed since the link was rendered; start over
+                return None
+            value = payload["v"]
+            if value is not None:
+                value = self.sort_field.to_python(value)
+            return payload["d"], value, payload["k"]
+        except (signing.BadSignature, KeyError, TypeError, ValueError) as e:
+            logger.debug("Ignoring invalid pagination cursor: %s", e)
+            return None
+
+    def count(self) -> Tuple[int, bool]:
+        """
+        Count matching rows without scanning past ``count_limit``.
+
+        Returns:
+            Tuple[int, bool]: The count and whether it is an estimate
+        """
+        queryset = self.queryset.order_by()
+        capped = queryset[: self.count_limit + 1].count()
+        if capped <= self.count_limit:
+            return capped, False
+        return max(self._planner_estimate(queryset), self.count_limit), True
+
+    @staticmethod
+    def _planner_estimate(queryset: QuerySet) -> int:
+        if connections[queryset.db].vendor != "postgresql":
+            return 0
+        try:
+            plan = json.loads(queryset.explain(format="json"))
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug("Planner row estimate unavailable: %s", e)
+            return 0
+
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        """
+        Return the page identified by ``cursor`` (the first page if None).
+
+        Args:
+            cursor: A ``next_cursor`` or ``previous_cursor`` token
+
+        Returns:
+            KeysetPage: The rows, neighbour tokens and (estimated) total
+        """
+        position = self._decode(cursor)
+        backwards = position is not None and position[0] == "p"
+        queryset = self.queryset
+        if position is not None:
+            _, value, pk = position
+            queryset = queryset.filter(self._seek(value, pk, after=not backwards))
+        rows = list(queryset.order_by(*self._ordering(reverse=backwards))[
+            : self.per_page + 1
+        ])
+        more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+
+        has_next = position is not None if backwards else more
+        has_previous = more if backwards else position is not None
+        count, estimated = self.count()
+        return KeysetPage(
+            object_list=rows,
+            next_cursor=self._encode(rows[-1], "n") if rows and has_next else None,
+            previous_cursor=(
+                self._encode(rows[0], "p") if rows and has_previous else None
+            ),
+            count=count,
+            count_is_estimate=estimated,
+            per_page=self.per_page,
+        )
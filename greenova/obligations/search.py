@@ -0,0 +1,323 @@
+"""
+Full-text search over obligation text.
+
+SQLite deployments get an FTS5 table kept current by triggers on the
+obligations table. Postgres gets a GIN index over the same ``tsvector``
+expression the queries use, which the database maintains itself. Either
+way every write path (``save()``, ``delete()``, ``bulk_create``,
+``bulk_update``, ``QuerySet.update`` and raw SQL) keeps the index in step
+without Python code on the hot path. Other backends, or a database whose
+index has not been created yet, fall back to ``icontains`` filters.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional
+
+from django.db import DatabaseError, connections, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+logger = logging.getLogger(__name__)
+
+# Obligation fields covered by the index, in snippet priority order
+SEARCH_FIELDS = (
+    "obligation_number",
+    "obligation",
+    "supporting_information",
+    "general_comments",
+    "compliance_comments",
+    "non_conformance_comments",
+)
+
+# Upper bound on ranked hits returned by one search
+SEARCH_RESULT_LIMIT = 500
+
+OBLIGATION_TABLE = "obligations_obligation"
+FTS_TABLE = "obligations_obligation_fts"
+# Maps obligation numbers to stable integer FTS rowids; the obligations
+# table has a text primary key, and its implicit rowid may change on VACUUM
+FTS_KEY_TABLE = "obligations_obligation_fts_key"
+PG_INDEX = "obligations_obligation_search_idx"
+PG_CONFIG = "english"
+
+# Snippet highlight markers, swapped for <mark> after HTML escaping
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+_SNIPPET_TOKENS = 12
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A ranked search result. ``snippet`` is escaped HTML with <mark> tags."""
+
+    obligation_number: str
+    rank: float
+    snippet: str
+
+
+def _columns_sql(prefix: str = "") -> str:
+    return ", ".join(f"{prefix}{field}" for field in SEARCH_FIELDS)
+
+
+def _coalesced_sql(prefix: str = "") -> str:
+    return ", ".join(f"COALESCE({prefix}{field}, '')" for field in SEARCH_FIELDS)
+
+
+def _pg_document_sql(alias: str = "") -> str:
+    # Must match the indexed expression exactly for the planner to use it
+    prefix = f"{alias}." if alias else ""
+    joined = " || ' ' || ".join(
+        f"COALESCE({prefix}{field}, '')" for field in SEARCH_FIELDS
+    )
+    return f"({joined})"
+
+
+def _pg_vector_sql(alias: str = "") -> str:
+    return f"to_tsvector('{PG_CONFIG}', {_pg_document_sql(alias)})"
+
+
+def _sqlite_statements() -> List[str]:
+    fields = _columns_sql()
+    new_values = _coalesced_sql("NEW.")
+    key_for = "(SELECT id FROM {key} WHERE obligation_number = {row}.obligation_number)"
+    new_key = key_for.format(key=FTS_KEY_TABLE, row="NEW")
+    old_key = key_for.format(key=FTS_KEY_TABLE, row="OLD")
+    return [
+        f"CREATE TABLE IF NOT EXISTS {FTS_KEY_TABLE} ("
+        "id INTEGER PRIMARY KEY, obligation_number TEXT NOT NULL UNIQUE)",
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{fields}, tokenize = 'unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai "
+        f"AFTER INSERT ON {OBLIGATION_TABLE} "
+        f"BEGIN "
+        f"INSERT OR IGNORE INTO {FTS_KEY_TABLE}(obligation_number) "
+        f"VALUES (NEW.obligation_number); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {fields}) VALUES ({new_key}, {new_values}); "
+        f"END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au "
+        f"AFTER UPDATE ON {OBLIGATION_TABLE} "
+        f"BEGIN "
+        f"DELETE FROM {FTS_TABLE} WHERE rowid = {old_key}; "
+        f"UPDATE {FTS_KEY_TABLE} SET obligation_number = NEW.obligation_number "
+        f"WHERE obligation_number = OLD.obligation_number; "
+        f"INSERT INTO {FTS_TABLE}(rowid, {fields}) VALUES ({new_key}, {new_values}); "
+        f"END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad "
+        f"AFTER DELETE ON {OBLIGATION_TABLE} "
+        f"BEGIN "
+        f"DELETE FROM {FTS_TABLE} WHERE rowid = {old_key}; "
+        f"DELETE FROM {FTS_KEY_TABLE} WHERE obligation_number = OLD.obligation_number; "
+        f"END",
+    ]
+
+
+def ensure_search_index(using: str = "default", rebuild: bool = False) -> bool:
+    """
+    Create the full-text index for the connection's backend if missing.
+
+    Safe to call repeatedly; it runs after every ``migrate`` through the
+    app's post_migrate hook. With ``rebuild`` the SQLite index is dropped and
+    repopulated from the obligations table (the Postgres index needs no
+    repopulation and is only reindexed).
+
+    Args:
+        using: Database alias
+        rebuild: Drop and rebuild the index contents
+
+    Returns:
+        bool: True if the backend supports the index and it is in place
+    """
+    connection = connections[using]
+    if OBLIGATION_TABLE not in connection.introspection.table_names():
+        return False
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            if rebuild:
+                for suffix in ("ai", "au", "ad"):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+                cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+                cursor.execute(f"DROP TABLE IF EXISTS {FTS_KEY_TABLE}")
+            try:
+                for statement in _sqlite_statements():
+                    cursor.execute(statement)
+            except DatabaseError as e:
+                # SQLite builds without FTS5 keep the icontains fallback
+                logger.warning("Full-text search unavailable: %s", e)
+                return False
+            # Index rows written before the triggers existed
+            cursor.execute(
+                f"INSERT OR IGNORE INTO {FTS_KEY_TABLE}(obligation_number) "
+                f"SELECT obligation_number FROM {OBLIGATION_TABLE}"
+            )
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}(rowid, {_columns_sql()}) "
+                f"SELECT k.id, {_coalesced_sql('o.')} "
+                f"FROM {OBLIGATION_TABLE} o "
+                f"JOIN {FTS_KEY_TABLE} k ON k.obligation_number = o.obligation_number "
+                f"WHERE k.id NOT IN (SELECT rowid FROM {FTS_TABLE})"
+            )
+            return True
+
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON {OBLIGATION_TABLE} "
+                f"USING GIN ({_pg_vector_sql()})"
+            )
+            if rebuild:
+                cursor.execute(f"REINDEX INDEX {PG_INDEX}")
+            return True
+
+    return False
+
+
+def _fts5_query(term: str) -> str:
+    # Quote every token so user input can't inject FTS5 syntax; the last
+    # token is a prefix match to support search-as-you-type
+    tokens = _TOKEN_RE.findall(term)
+    quoted = [f'"{token}"' for token in tokens]
+    if quoted:
+        quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _tsquery(term: str) -> str:
+    tokens = _TOKEN_RE.findall(term)
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def _highlight(snippet: Optional[str]) -> str:
+    text = escape(snippet or "")
+    return text.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def text_search_q(term: str) -> Q:
+    """Return the ``icontains`` filter used when no full-text index is available."""
+    query = Q()
+    for field in SEARCH_FIELDS:
+        query |= Q(**{f"{field}__icontains": term})
+    return query
+
+
+def search_q(term: str, using: str = "default") -> Q:
+    """
+    Return a filter matching every obligation that ``term`` matches.
+
+    Unlike ``search_obligations`` there is no ranking and no limit: the
+    full-text match is a subquery of the filtered queryset, so list and
+    export views combine it with their other filters and return every
+    match.
+
+    Args:
+        term: User-entered search text
+        using: Database alias the filter will run against
+
+    Returns:
+        Q: Full-text subquery filter, or ``text_search_q`` when the
+        database has no full-text index
+    """
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        if not _TOKEN_RE.search(term):
+            return Q(pk__in=[])
+        return Q(pk__in=RawSQL(
+            f"SELECT obligation_number FROM {OBLIGATION_TABLE} "
+            f"WHERE {_pg_vector_sql()} @@ to_tsquery('{PG_CONFIG}', %s)",
+            [_tsquery(term)],
+        ))
+    if (
+        connection.vendor == "sqlite"
+        and FTS_TABLE in connection.introspection.table_names()
+    ):
+        if not _TOKEN_RE.search(term):
+            return Q(pk__in=[])
+        return Q(pk__in=RawSQL(
+            f"SELECT k.obligation_number FROM {FTS_TABLE} "
+            f"JOIN {FTS_KEY_TABLE} k ON k.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s",
+            [_fts5_query(term)],
+        ))
+    return text_search_q(term)
+
+
+def search_obligations(
+    term: str,
+    queryset: "Optional[QuerySet]" = None,
+    limit: int = SEARCH_RESULT_LIMIT,
+) -> Optional[List[SearchHit]]:
+    """
+    Rank obligations matching ``term`` with highlighted snippets.
+
+    The candidate queryset is pushed down as a subquery, so project and
+    status filters apply before the limit rather than after it.
+
+    Args:
+        term: User-entered search text
+        queryset: Obligations to search within (defaults to all)
+        limit: Maximum number of hits
+
+    Returns:
+        Optional[List[SearchHit]]: Hits, best first, or None if the
+        database has no full-text index and callers should fall back to
+        ``text_search_q``
+    """
+    from .models import Obligation
+
+    if queryset is None:
+        queryset = Obligation.objects.all()
+    connection = connections[queryset.db]
+    if connection.vendor not in ("sqlite", "postgresql"):
+        return None
+    if not _TOKEN_RE.search(term):
+        return []
+
+    candidates_sql, candidates_params = (
+        queryset.order_by().values("pk").query.sql_with_params()
+    )
+    if connection.vendor == "sqlite":
+        sql = (
+            f"SELECT k.obligation_number, bm25({FTS_TABLE}), "
+            f"snippet({FTS_TABLE}, -1, %s, %s, '…', {_SNIPPET_TOKENS}) "
+            f"FROM {FTS_TABLE} JOIN {FTS_KEY_TABLE} k ON k.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND k.obligation_number IN ({candidates_sql}) "
+            f"ORDER BY bm25({FTS_TABLE}) LIMIT %s"
+        )
+        params = [_MARK_START, _MARK_END, _fts5_query(term), *candidates_params, limit]
+    else:
+        headline_options = (
+            f"StartSel={_MARK_START}, StopSel={_MARK_END}, "
+            f"MaxWords={_SNIPPET_TOKENS * 2}, MinWords={_SNIPPET_TOKENS}"
+        )
+        sql = (
+            f"SELECT o.obligation_number, ts_rank({_pg_vector_sql('o')}, q), "
+            f"ts_headline('{PG_CONFIG}', {_pg_document_sql('o')}, q, %s) "
+            f"FROM {OBLIGATION_TABLE} o, to_tsquery('{PG_CONFIG}', %s) q "
+            f"WHERE {_pg_vector_sql('o')} @@ q "
+            f"AND o.obligation_number IN ({candidates_sql}) "
+            f"ORDER BY 2 DESC LIMIT %s"
+        )
+        params = [headline_options, _tsquery(term), *candidates_params, limit]
+
+    try:
+        # Savepoint so a missing index doesn't poison an outer transaction
+        with transaction.atomic(using=queryset.db), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+    except DatabaseError as e:
+        logger.warning("Full-text search failed, falling back to icontains: %s", e)
+        return None
+
+    # bm25 is lower-is-better; flip it so rank always sorts descending
+    sign = -1.0 if connection.vendor == "sqlite" else 1.0
+    return [
+        SearchHit(number, sign * float(rank), _highlight(snippet))
+        for number, rank, snippet in rows
+    ]
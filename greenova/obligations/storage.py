@@ -0,0 +1,166 @@
+"""
+Content-addressed storage for obligation evidence files.
+
+Uploads are hashed with SHA-256 while they are streamed to a temporary file
+and then moved into place under their digest, so the same permit PDF
+attached to fifty obligations is stored once. ``ObligationEvidence`` rows
+record the digest, size and MIME type, which lets evidence be listed
+without touching storage, and a blob is deleted only when the last row
+referencing it is gone.
+
+Deduplication and deletion race: an upload can find a blob already stored
+just as the last row referencing it is deleted, and commit its own row
+after the blob is gone. Reusing a blob therefore refreshes its mtime, and
+a blob is only deleted once it has gone ``EVIDENCE_GC_GRACE_SECONDS``
+without being stored or reused. Blobs spared that way are collected by
+``sweep_evidence_files`` (run from the ``nightly_sweep`` command).
+"""
+
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import tempfile
+import time
+import uuid
+from typing import Any, Iterator, Optional
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, InvalidStorageError, storages
+
+logger = logging.getLogger(__name__)
+
+# Key in settings.STORAGES for evidence files
+EVIDENCE_STORAGE_ALIAS = "evidence"
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+# Seconds a blob must go unused before it may be deleted; far longer than
+# any upload takes to commit the row that reuses it
+DEFAULT_GC_GRACE_SECONDS = 60 * 60
+
+_DIGEST_NAME = re.compile(r"^([0-9a-f]{64})(?:\.[A-Za-z0-9]+)?$")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names each file after the SHA-256 of its bytes.
+
+    Files are stored as ``<prefix>/ab/cd/<digest><ext>``; the name passed to
+    ``save`` only contributes its extension, so browsers and web servers
+    still pick the right content type. Saving content that is already
+    stored returns the existing name without writing anything.
+
+    Args:
+        prefix: Directory under the storage root that holds the blobs
+        **kwargs: Passed to ``FileSystemStorage``
+    """
+
+    def __init__(self, prefix: str = "evidence", **kwargs: Any):
+        super().__init__(**kwargs)
+        self.prefix = prefix.strip("/")
+
+    def blob_name(self, digest: str, extension: str = "") -> str:
+        """Return the storage name for content with this digest."""
+        return f"{self.prefix}/{digest[:2]}/{digest[2:4]}/{digest}{extension.lower()}"
+
+    def get_available_name(self, name: str, max_length: Optional[int] = None) -> str:
+        # The final name is chosen from the content in _save, and an existing
+        # file with that name already holds the same bytes
+        return name
+
+    def _save(self, name: str, content: Any) -> str:
+        extension = os.path.splitext(name)[1]
+        spool_dir = self.path(self.prefix)
+        os.makedirs(spool_dir, exist_ok=True)
+        # Spool beside the blobs so the final move is an atomic rename
+        fd, spool_path = tempfile.mkstemp(dir=spool_dir, prefix=".upload-")
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, "wb") as spool:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    spool.write(chunk)
+            blob = self.blob_name(digest.hexdigest(), extension)
+            blob_path = self.path(blob)
+            try:
+                # Mark the blob as in use so delete_unless_recent spares it
+                os.utime(blob_path)
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.chmod(spool_path, self.file_permissions_mode or 0o644)
+                os.replace(spool_path, blob_path)
+            else:
+                logger.debug("Deduplicated upload %s as %s", name, blob)
+                os.remove(spool_path)
+        except BaseException:
+            if os.path.exists(spool_path):
+                os.remove(spool_path)
+            raise
+        return blob
+
+    def delete_unless_recent(self, name: str, grace: float) -> bool:
+        """
+        Delete a blob unless it was stored or reused in the last ``grace`` seconds.
+
+        The blob is first renamed aside and its mtime checked again, so an
+        upload that reuses it between the check and the rename either
+        finds it gone and writes its own copy, or gets it put back.
+
+        Args:
+            name: Storage name of the blob
+            grace: Seconds since the last store or reuse to spare the blob
+
+        Returns:
+            bool: True if the blob was deleted
+        """
+        path = self.path(name)
+        cutoff = time.time() - grace
+        tombstone = os.path.join(
+            os.path.dirname(path), f".delete-{uuid.uuid4().hex}"
+        )
+        try:
+            if os.stat(path).st_mtime > cutoff:
+                return False
+            os.replace(path, tombstone)
+        except FileNotFoundError:
+            return False
+        if os.stat(tombstone).st_mtime > cutoff:
+            # Reused in the meantime; the content is the same either way
+            os.replace(tombstone, path)
+            return False
+        os.remove(tombstone)
+        return True
+
+    def blob_names(self) -> Iterator[str]:
+        """Yield the storage name of every stored blob."""
+        root = self.path(self.prefix)
+        for directory, _, files in os.walk(root):
+            for filename in files:
+                if _DIGEST_NAME.match(filename):
+                    relative = os.path.relpath(os.path.join(directory, filename), root)
+                    yield f"{self.prefix}/{relative.replace(os.sep, '/')}"
+
+
+def gc_grace_seconds() -> float:
+    """Return how long a blob must go unused before it may be deleted."""
+    return getattr(settings, "EVIDENCE_GC_GRACE_SECONDS", DEFAULT_GC_GRACE_SECONDS)
+
+
+def evidence_storage() -> FileSystemStorage:
+    """Return the storage for evidence files (the ``evidence`` alias if set)."""
+    try:
+        return storages[EVIDENCE_STORAGE_ALIAS]
+    except InvalidStorageError:
+        return ContentAddressedStorage()
+
+
+def digest_from_name(name: str) -> str:
+    """Return the SHA-256 encoded in a blob name, or "" for other names."""
+    match = _DIGEST_NAME.match(os.path.basename(name or ""))
+    return match.group(1) if match else ""
+
+
+def guess_content_type(name: str) -> str:
+    """Guess a MIME type from a file name's extension."""
+    return mimetypes.guess_type(name)[0] or DEFAULT_CONTENT_TYPE
@@ -1,20 +1,67 @@
+import csv
+import hashlib
+import io
 import json
 import os
+import re
+import time
+import zipfile
 from datetime import date, timedelta
+from xml.etree import ElementTree
 
 import pytest
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
-from mechanisms.models import EnvironmentalMechanism
+from mechanisms.models import (
+    EnvironmentalMechanism,
+    recount_mechanisms,
+    refresh_overdue_counts,
+)
+from obligations.bulk import (
+    BulkResult,
+    apply_bulk_operation,
+    run_bulk_job,
+    start_bulk_job,
+)
+from obligations.constants import EXPORT_COLUMNS
+from obligations.export import stream_xlsx
 from obligations.forms import EvidenceUploadForm, ObligationForm
-from obligations.models import Obligation, ObligationEvidence
+from obligations.models import (
+    BulkOperationJob,
+    EvidenceUpload,
+    Obligation,
+    ObligationEvidence,
+    ObligationNumberSequence,
+    sweep_evidence_files,
+)
+from obligations.pagination import KeysetPaginator
+from obligations.search import ensure_search_index, search_obligations
+from obligations.storage import DEFAULT_GC_GRACE_SECONDS
 from obligations.utils import (
     get_obligation_status,
     is_obligation_overdue,
+    iter_xlsx_rows,
     normalize_frequency,
 )
+from obligations.uploads import (
+    UploadError,
+    append_chunk,
+    complete_upload,
+    expire_uploads,
+    spool_path,
+    start_upload,
+)
+from obligations.views import (
+    ObligationExportView,
+    ObligationFilterMixin,
+    TotalOverdueObligationsView,
+)
 from projects.models import Project
 from responsibility.models import Responsibility
 
@@ -213,6 +260,401 @@ def test_update_recurring_forecasted_date(self, test_obligation) -> None:  # pyl
         assert test_obligation.recurring_forecasted_date == expected_date
 
 
+@pytest.mark.django_db
+class TestObligationQuerySet:
+    """Test the SQL-side status predicates on the Obligation manager."""
+
+    @staticmethod
+    def _create(project, mechanism, number, status, due_date):
+        return Obligation.objects.create(
+            obligation_number=number,
+            project=project,
+            primary_environmental_mechanism=mechanism,
+            environmental_aspect="Air",
+            obligation="Queryset obligation",
+            accountability="SCJV",
+            responsibility="SCJV - HSSE Manager",
+            action_due_date=due_date,
+            status=status,
+        )
+
+    def test_overdue_matches_python_rule(self, test_project, test_mechanism) -> None:  # pylint: disable=redefined-outer-name
+        """Test that overdue() agrees with is_obligation_overdue."""
+        today = timezone.now().date()
+        self._create(test_project, test_mechanism, "PCEMP-201", "in progress",
+                     today - timedelta(days=3))
+        self._create(test_project, test_mechanism, "PCEMP-202", "completed",
+                     today - timedelta(days=3))
+        self._create(test_project, test_mechanism, "PCEMP-203", "not started",
+                     today + timedelta(days=3))
+        self._create(test_project, test_mechanism, "PCEMP-204", "not started", None)
+
+        expected = {
+            o.obligation_number for o in Obligation.objects.all()
+            if is_obligation_overdue(o)
+        }
+        actual = set(
+            Obligation.objects.overdue().values_list("obligation_number", flat=True)
+        )
+        assert actual == expected == {"PCEMP-201"}
+        assert Obligation.objects.active().count() == 3
+
+    def test_upcoming_and_effective_status(self, test_project, test_mechanism) -> None:  # pylint: disable=redefined-outer-name
+        """Test upcoming() and the effective_status annotation."""
+        today = timezone.now().date()
+        self._create(test_project, test_mechanism, "PCEMP-211", "not started",
+                     today + timedelta(days=5))
+        self._create(test_project, test_mechanism, "PCEMP-212", "in progress",
+                     today - timedelta(days=1))
+        self._create(test_project, test_mechanism, "PCEMP-213", "not started",
+                     today + timedelta(days=60))
+
+        upcoming = Obligation.objects.upcoming(7)
+        assert list(upcoming.values_list("obligation_number", flat=True)) == [
+            "PCEMP-211"
+        ]
+
+        statuses = dict(
+            Obligation.objects.with_effective_status().values_list(
+                "obligation_number", "effective_status"
+            )
+        )
+        for obligation in Obligation.objects.all():
+            assert statuses[obligation.obligation_number] == get_obligation_status(
+                obligation
+            )
+
+    def test_refresh_recurring_forecasts(self, test_project, test_mechanism) -> None:  # pylint: disable=redefined-outer-name
+        """Test the bulk sweep only rolls stale forecasts forward, once."""
+        today = timezone.now().date()
+        forecasts = {
+            "PCEMP-221": ("weekly", today - timedelta(days=10)),
+            "PCEMP-222": ("monthly", today + timedelta(days=3)),
+            "PCEMP-223": ("weekly", None),
+        }
+        for number, (frequency, forecast) in forecasts.items():
+            obligation = self._create(test_project, test_mechanism, number,
+                                      "not started", None)
+            Obligation.objects.filter(pk=obligation.pk).update(
+                recurring_obligation=True,
+                recurring_frequency=frequency,
+                recurring_forcasted_date=forecast,
+            )
+        stamped = timezone.now() - timedelta(days=1)
+        Obligation.objects.update(updated_at=stamped)
+
+        assert Obligation.objects.refresh_recurring_forecasts(today) == 2
+        assert set(
+            Obligation.objects.filter(updated_at__gt=stamped).values_list(
+                "obligation_number", flat=True
+            )
+        ) == {"PCEMP-221", "PCEMP-223"}
+        assert dict(Obligation.objects.values_list(
+            "obligation_number", "recurring_forcasted_date"
+        )) == {
+            "PCEMP-221": today + timedelta(days=7),
+            "PCEMP-222": today + timedelta(days=3),
+            "PCEMP-223": today + timedelta(days=7),
+        }
+        assert Obligation.objects.refresh_recurring_forecasts(today) == 0
+
+    def test_refresh_overdue_counts(self, test_project, test_mechanism) -> None:  # pylint: disable=redefined-outer-name
+        """Test the grouped overdue refresh picks up obligations aging past due."""
+        today = timezone.now().date()
+        self._create(test_project, test_mechanism, "PCEMP-231", "not started",
+                     today + timedelta(days=1))
+        self._create(test_project, test_mechanism, "PCEMP-232", "completed",
+                     today + timedelta(days=1))
+        test_mechanism.refresh_from_db()
+        assert test_mechanism.overdue_count == 0
+
+        refresh_overdue_counts(today + timedelta(days=5))
+        test_mechanism.refresh_from_db()
+        assert test_mechanism.overdue_count == 1
+
+        refresh_overdue_counts(today)
+        test_mechanism.refresh_from_db()
+        assert test_mechanism.overdue_count == 0
+
+    def test_search(self, test_project, test_mechanism) -> None:  # pylint: disable=redefined-outer-name
+        """Test full-text search stays in sync with saves, updates and deletes."""
+        ensure_search_index()
+        dust = self._create(test_project, test_mechanism, "PCEMP-241", "not started",
+                            None)
+        dust.obligation = "Suppress dust on haul roads"
+        dust.save()
+        noise = self._create(test_project, test_mechanism, "PCEMP-242",
+                             "not started", None)
+        noise.compliance_comments = "Noise <monitoring> logged weekly"
+        noise.save()
+
+        assert list(Obligation.objects.search("dust")) == [dust]
+        assert list(Obligation.objects.search("monitor")) == [noise]
+        assert list(Obligation.objects.search("PCEMP-242")) == [noise]
+
+        Obligation.objects.filter(pk=dust.pk).update(obligation="Water the roads")
+        assert not Obligation.objects.search("dust").exists()
+        assert list(
+            Obligation.objects.exclude(pk=dust.pk).search("roads")
+        ) == []
+
+        hits = search_obligations("monitor")
+        if hits is not None:
+            assert hits[0].snippet.count("<mark>") == 1
+            assert "&lt;" in hits[0].snippet
+
+        noise.delete()
+        assert not Obligation.objects.search("monitor").exists()
+
+    def test_search_filter_is_not_capped(self, test_project, test_mechanism) -> None:  # pylint: disable=redefined-outer-name
+        """Test list filtering keeps every search match, whatever its rank."""
+        ensure_search_index()
+        today = timezone.now().date()
+        Obligation.objects.bulk_create(
+            Obligation(
+                obligation_number=f"PCEMP-{9000 + i}",
+                project=test_project,
+                primary_environmental_mechanism=test_mechanism,
+                environmental_aspect="Air",
+                obligation="Suppress dust " * (1 + i % 5),
+                action_due_date=today + timedelta(days=7 if i % 2 else 60),
+                status="not started",
+            )
+            for i in range(600)
+        )
+        assert Obligation.objects.search("dust").count() == 600
+
+        filters = {"search": "dust", "date_filter": "14days"}
+        filtered = ObligationFilterMixin().apply_filters(
+            Obligation.objects.all(), filters
+        )
+        assert filtered.count() == 300
+
+
+@pytest.mark.django_db
+class TestBulkOperations:
+    """Test chunked bulk operations and their single recount pass."""
+
+    @staticmethod
+    def _create_many(project, mechanisms, count):
+        today = timezone.now().date()
+        return [
+            Obligation.objects.create(
+                obligation_number=f"PCEMP-5{i:02d}",
+                project=project,
+                primary_environmental_mechanism=mechanisms[i % len(mechanisms)],
+                environmental_aspect="Air",
+                obligation="Bulk obligation",
+                action_due_date=today - timedelta(days=1),
+                status="in progress",
+            )
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def _counts(mechanism):
+        mechanism.refresh_from_db()
+        return (
+            mechanism.not_started_count,
+            mechanism.in_progress_count,
+            mechanism.completed_count,
+            mechanism.overdue_count,
+        )
+
+    def test_complete_in_chunks(self, test_project, test_mechanism) -> None:  # pylint: disable=redefined-outer-name
+        """Test counters are exact after a chunked bulk completion."""
+        other = EnvironmentalMechanism.objects.create(name="Other", project=test_project)
+        obligations = self._create_many(test_project, [test_mechanism, other], 5)
+        recurring = obligations[0]
+        recurring.recurring_obligation = True
+        recurring.recurring_frequency = "monthly"
+        recurring.save()
+
+        result = apply_bulk_operation(
+            "complete", [o.pk for o in obligations] + ["PCEMP-MISSING"], chunk_size=2
+        )
+        assert result == BulkResult(processed=6, affected=5, mechanisms_recounted=2)
+        # The recurring obligation rolls over to its next occurrence instead
+        recurring.refresh_from_db()
+        assert recurring.status == "not started"
+        assert self._counts(test_mechanism) == (1, 0, 2, 1)
+        assert self._counts(other) == (0, 0, 2, 0)
+
+    def test_delete_job_resumes(self, test_project, test_mechanism) -> None:  # pylint: disable=redefined-outer-name
+        """Test a queued delete job resumes from its recorded progress."""
+        obligations = self._create_many(test_project, [test_mechanism], 4)
+        job = start_bulk_job("delete", [o.pk for o in obligations])
+        assert (job.state, job.total, job.progress) == ("queued", 4, 0.0)
+
+        # Simulate a worker that stopped after deleting the first chunk
+        apply_bulk_operation("delete", job.obligation_numbers[:2])
+        BulkOperationJob.objects.filter(pk=job.pk).update(
+            processed=2, mechanism_ids=[test_mechanism.pk]
+        )
+
+        job = run_bulk_job(job.pk)
+        assert (job.state, job.processed, job.affected) == ("succeeded", 4, 2)
+        assert not Obligation.objects.filter(project=test_project).exists()
+        assert self._counts(test_mechanism) == (0, 0, 0, 0)
+
+    def test_recount_mechanisms(self, test_project, test_mechanism) -> None:  # pylint: disable=redefined-outer-name
+        """Test the grouped recount matches update_obligation_counts."""
+        self._create_many(test_project, [test_mechanism], 3)
+        EnvironmentalMechanism.objects.filter(pk=test_mechanism.pk).update(
+            in_progress_count=99, overdue_count=0
+        )
+        assert recount_mechanisms([test_mechanism.pk, None]) == 1
+        recounted = self._counts(test_mechanism)
+        test_mechanism.update_obligation_counts()
+        assert recounted == self._counts(test_mechanism) == (0, 3, 0, 3)
+
+
+@pytest.mark.django_db
+class TestObligationChangeTracking:
+    """Test the loaded-value snapshot used by the pre_save hooks."""
+
+    def test_changed_fields(self, test_project, test_mechanism) -> None:  # pylint: disable=redefined-outer-name
+        """Test changed_fields against the load and after a save."""
+        created = TestObligationQuerySet._create(  # pylint: disable=protected-access
+            test_project, test_mechanism, "PCEMP-241", "not started", None
+        )
+        obligation = Obligation.objects.get(pk=created.pk)
+        assert obligation.changed_fields() == frozenset()
+
+        obligation.status = "in progress"
+        assert obligation.changed_fields() == {"status"}
+        obligation.save()
+        assert obligation.changed_fields() == frozenset()
+        assert Obligation(obligation_number="PCEMP-999").changed_fields() is None
+
+    def test_save_does_not_reread_row(self, test_project, test_mechanism) -> None:  # pylint: disable=redefined-outer-name
+        """Test saving a loaded obligation skips the pre_save SELECTs."""
+        created = TestObligationQuerySet._create(  # pylint: disable=protected-access
+            test_project, test_mechanism, "PCEMP-242", "not started",
+            timezone.now().date() - timedelta(days=1),
+        )
+        obligation = Obligation.objects.get(pk=created.pk)
+        obligation.status = "completed"
+        with CaptureQueriesContext(connection) as queries:
+            obligation.save()
+        assert not [
+            query for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and "obligations_obligation" in query["sql"]
+        ]
+        test_mechanism.refresh_from_db()
+        assert test_mechanism.completed_count == 1
+        assert test_mechanism.overdue_count == 0
+
+    def test_insert_does_not_read_row(self, test_project, test_mechanism) -> None:  # pylint: disable=redefined-outer-name
+        """Test inserting an obligation skips the pre_save SELECTs."""
+        obligation = Obligation(
+            obligation_number="PCEMP-243",
+            project=test_project,
+            primary_environmental_mechanism=test_mechanism,
+            status="not started",
+            recurring_obligation=True,
+            recurring_frequency="monthly",
+        )
+        ObligationNumberSequence.seed()
+        with CaptureQueriesContext(connection) as queries:
+            obligation.save()
+        # Row update/insert, mechanism counter and sequence bump only
+        assert len(queries.captured_queries) == 4
+        assert not [
+            query for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and "obligations_obligation" in query["sql"]
+        ]
+        assert obligation.recurring_forcasted_date is not None
+        test_mechanism.refresh_from_db()
+        assert test_mechanism.not_started_count == 1
+
+
+@pytest.mark.django_db
+class TestObligationNumberSequence:
+    """Test the obligation number allocator."""
+
+    def test_seeds_from_existing_and_skips_explicit_numbers(self, overdue_obligation) -> None:  # pylint: disable=redefined-outer-name
+        """Test the sequence starts after existing numbers and stays ahead."""
+        assert Obligation.get_next_obligation_number() == "PCEMP-003"
+        overdue_obligation.obligation_number = "PCEMP-050"
+        overdue_obligation.pk = "PCEMP-050"
+        overdue_obligation._state.adding = True  # pylint: disable=protected-access
+        overdue_obligation.save()
+        assert Obligation.get_next_obligation_number() == "PCEMP-051"
+
+    def test_reserve_block(self, db) -> None:  # pylint: disable=unused-argument
+        """Test reserving a contiguous block of numbers."""
+        numbers = Obligation.reserve_obligation_numbers(3)
+        assert numbers == ["PCEMP-001", "PCEMP-002", "PCEMP-003"]
+        assert Obligation.get_next_obligation_number() == "PCEMP-004"
+
+    def test_seed_fast_forwards(self, overdue_obligation) -> None:  # pylint: disable=redefined-outer-name,unused-argument
+        """Test seeding moves an existing sequence past imported data."""
+        ObligationNumberSequence.objects.filter(prefix="PCEMP-").update(last_value=0)
+        sequence = ObligationNumberSequence.seed()
+        assert sequence.last_value == 2
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Test cursor pagination over obligations."""
+
+    @pytest.mark.parametrize("sort", ["obligation_number", "-action_due_date"])
+    def test_walks_every_row_once(self, test_project, test_mechanism, sort) -> None:  # pylint: disable=redefined-outer-name
+        """Test paging forward and back visits each row once, NULLs included."""
+        today = timezone.now().date()
+        for i in range(7):
+            Obligation.objects.create(
+                obligation_number=f"PCEMP-3{i:02d}",
+                project=test_project,
+                primary_environmental_mechanism=test_mechanism,
+                environmental_aspect="Air",
+                obligation="Paged obligation",
+                # Duplicate and missing dates exercise the tie-breaker
+                action_due_date=None if i % 3 == 0 else today + timedelta(days=i // 2),
+            )
+        paginator = KeysetPaginator(Obligation.objects.all(), 3, sort=sort)
+        expected = list(
+            Obligation.objects.order_by(*paginator._ordering())  # pylint: disable=protected-access
+        )
+
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+        assert [o for page in pages for o in page] == expected
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert pages[0].count == 7 and not pages[0].count_is_estimate
+
+        back = paginator.page(pages[-1].previous_cursor)
+        assert list(back) == list(pages[1])
+        assert back.has_next() and back.has_previous()
+        assert not paginator.page(pages[1].previous_cursor).has_previous()
+
+    def test_rejects_foreign_cursor(self, overdue_obligation) -> None:  # pylint: disable=redefined-outer-name
+        """Test tampered cursors, or cursors for another sort, restart at page one."""
+        paginator = KeysetPaginator(Obligation.objects.all(), 1)
+        assert list(paginator.page("not-a-cursor")) == [overdue_obligation]
+        other_sort = KeysetPaginator(Obligation.objects.all(), 1, sort="-status")
+        cursor = other_sort._encode(overdue_obligation, "n")  # pylint: disable=protected-access
+        assert list(paginator.page(cursor)) == [overdue_obligation]
+
+    def test_estimated_count(self, overdue_obligation) -> None:  # pylint: disable=redefined-outer-name,unused-argument
+        """Test counts past the limit are reported as estimates."""
+        Obligation.objects.create(
+            obligation_number="PCEMP-399",
+            project=overdue_obligation.project,
+            primary_environmental_mechanism=overdue_obligation.primary_environmental_mechanism,
+            environmental_aspect="Air",
+            obligation="Counted obligation",
+        )
+        page = KeysetPaginator(Obligation.objects.all(), 1, count_limit=1).page()
+        assert page.count_is_estimate
+        assert page.count == 1
+        assert page.has_next() and not page.has_previous()
+
+
 @pytest.mark.django_db
 class TestObligationEvidenceModel:
     """Test the ObligationEvidence model."""
@@ -231,7 +673,8 @@ def test_create_evidence(self, test_obligation) -> None:  # pylint: disable=rede
             description="Test evidence",
         )
         assert evidence.obligation == test_obligation
-        assert "test_file" in evidence.file.name
+        assert evidence.original_name == "test_file.pdf"
+        assert evidence.sha256 in evidence.file.name
         assert evidence.description == "Test evidence"
 
     def test_str_method(self, test_evidence) -> None:  # pylint: disable=redefined-outer-name
@@ -245,6 +688,204 @@ def test_file_size(self, test_evidence) -> None:  # pylint: disable=redefined-ou
         assert "bytes" in size or "KB" in size or "MB" in size
 
 
+@pytest.mark.django_db(transaction=True)
+class TestEvidenceStorage:
+    """Test content-addressed, deduplicated evidence storage."""
+
+    @staticmethod
+    def _upload(name: str, content: bytes) -> SimpleUploadedFile:
+        return SimpleUploadedFile(name=name, content=content)
+
+    def test_identical_uploads_share_one_blob(  # pylint: disable=redefined-outer-name
+        self, settings, tmp_path, overdue_obligation
+    ) -> None:
+        """Test identical content is stored once and described from the row."""
+        settings.MEDIA_ROOT = str(tmp_path)
+        content = b"%PDF-1.4 permit"
+        first = ObligationEvidence.objects.create(
+            obligation=overdue_obligation, file=self._upload("permit.pdf", content)
+        )
+        second = ObligationEvidence.objects.create(
+            obligation=overdue_obligation, file=self._upload("copy.PDF", content)
+        )
+
+        digest = hashlib.sha256(content).hexdigest()
+        assert first.file.name == second.file.name
+        assert first.file.name == f"evidence/{digest[:2]}/{digest[2:4]}/{digest}.pdf"
+        assert (first.sha256, first.size) == (digest, len(content))
+        assert first.content_type == "application/pdf"
+        assert second.display_name == "copy.PDF"
+        blobs = [path for path in tmp_path.rglob("*") if path.is_file()]
+        assert blobs == [tmp_path / first.file.name]
+
+        listed = ObligationEvidence.objects.get(pk=first.pk)
+        listed.file.storage = None  # listing must not reach storage
+        assert listed.file_size() == f"{len(content)} bytes"
+
+    def test_blob_deleted_with_last_reference(  # pylint: disable=redefined-outer-name
+        self, settings, tmp_path, overdue_obligation
+    ) -> None:
+        """Test a blob is kept while referenced and removed after."""
+        settings.MEDIA_ROOT = str(tmp_path)
+        settings.EVIDENCE_GC_GRACE_SECONDS = 0
+        first, second = (
+            ObligationEvidence.objects.create(
+                obligation=overdue_obligation, file=self._upload(name, b"report")
+            )
+            for name in ("a.txt", "b.txt")
+        )
+        blob = tmp_path / first.file.name
+
+        first.delete()
+        assert blob.exists()
+        second.file = self._upload("new.txt", b"revised report")
+        second.save()
+        assert not blob.exists()
+        assert (tmp_path / second.file.name).exists()
+
+        second.delete()
+        assert not any(path.is_file() for path in tmp_path.rglob("*"))
+
+    def test_recently_used_blob_left_for_sweep(  # pylint: disable=redefined-outer-name
+        self, settings, tmp_path, overdue_obligation
+    ) -> None:
+        """Test a blob reused within the grace period outlives its last row."""
+        settings.MEDIA_ROOT = str(tmp_path)
+        evidence = ObligationEvidence.objects.create(
+            obligation=overdue_obligation, file=self._upload("a.txt", b"permit")
+        )
+        blob = tmp_path / evidence.file.name
+        long_ago = time.time() - 2 * DEFAULT_GC_GRACE_SECONDS
+
+        # An upload may still be committing a row that reuses the blob
+        evidence.delete()
+        assert blob.exists()
+        assert sweep_evidence_files() == 0
+
+        os.utime(blob, (long_ago, long_ago))
+        storage = ObligationEvidence._meta.get_field("file").storage
+        assert storage.save("b.txt", self._upload("b.txt", b"permit")) == (
+            evidence.file.name
+        )
+        assert blob.stat().st_mtime > long_ago + DEFAULT_GC_GRACE_SECONDS
+        assert sweep_evidence_files() == 0
+
+        os.utime(blob, (long_ago, long_ago))
+        assert sweep_evidence_files() == 1
+        assert not any(path.is_file() for path in tmp_path.rglob("*"))
+
+
+@pytest.mark.django_db(transaction=True)
+class TestEvidenceUploads:
+    """Test chunked, resumable evidence uploads."""
+
+    CONTENT = b"site inspection report " * 100
+
+    @pytest.fixture(autouse=True)
+    def _storage(self, settings, tmp_path) -> None:
+        settings.MEDIA_ROOT = str(tmp_path / "media")
+        settings.EVIDENCE_UPLOAD_SPOOL_DIR = str(tmp_path / "spool")
+
+    def _start(self, obligation: Obligation, content: bytes = CONTENT):
+        return start_upload(
+            obligation,
+            filename="report.txt",
+            size=len(content),
+            sha256=hashlib.sha256(content).hexdigest(),
+        )
+
+    def test_resumed_upload_is_attached(self, overdue_obligation) -> None:  # pylint: disable=redefined-outer-name
+        """Test chunks resume after a short read and a resend is accepted."""
+        upload = self._start(overdue_obligation)
+        upload = append_chunk(upload, 0, io.BytesIO(self.CONTENT[:1000]), 1000)
+
+        # The connection drops part way through the next chunk
+        with pytest.raises(UploadError):
+            append_chunk(upload, 1000, io.BytesIO(self.CONTENT[1000:1500]), 1000)
+        with pytest.raises(UploadError) as gap:
+            append_chunk(upload, 2000, io.BytesIO(self.CONTENT[2000:]), 300)
+        assert gap.value.status == 409
+
+        # Resume from the reported offset, resending part of the last chunk
+        upload.refresh_from_db()
+        assert upload.received == 1000
+        upload = append_chunk(upload, 500, io.BytesIO(self.CONTENT[500:]), 1800)
+        assert upload.received == len(self.CONTENT)
+
+        evidence = complete_upload(upload)
+        assert evidence.obligation == overdue_obligation
+        assert evidence.sha256 == hashlib.sha256(self.CONTENT).hexdigest()
+        assert evidence.size == len(self.CONTENT)
+        assert evidence.display_name == "report.txt"
+        with evidence.file.open("rb") as stored:
+            assert stored.read() == self.CONTENT
+        assert not os.path.exists(spool_path(upload))
+        # Completing again returns the same evidence
+        assert complete_upload(upload).pk == evidence.pk
+
+    def test_hash_mismatch_discards_bytes(self, overdue_obligation) -> None:  # pylint: disable=redefined-outer-name
+        """Test a file not matching its declared SHA-256 is not attached."""
+        upload = self._start(overdue_obligation)
+        corrupted = self.CONTENT[:-1] + b"!"
+        append_chunk(upload, 0, io.BytesIO(corrupted), len(corrupted))
+
+        with pytest.raises(UploadError) as mismatch:
+            complete_upload(upload)
+        assert mismatch.value.status == 422
+        upload.refresh_from_db()
+        assert upload.received == 0
+        assert upload.state == EvidenceUpload.STATE_OPEN
+        assert not overdue_obligation.evidences.exists()
+
+    def test_lost_spool_restarts_from_zero(self, overdue_obligation) -> None:  # pylint: disable=redefined-outer-name
+        """Test a cleared spool sends the client back to offset 0, stored."""
+        upload = self._start(overdue_obligation)
+        upload = append_chunk(upload, 0, io.BytesIO(self.CONTENT[:1000]), 1000)
+        os.remove(spool_path(upload))
+
+        with pytest.raises(UploadError) as restart:
+            append_chunk(upload, 1000, io.BytesIO(self.CONTENT[1000:2000]), 1000)
+        assert restart.value.status == 409
+        assert "offset 0" in str(restart.value)
+        upload.refresh_from_db()
+        assert upload.received == 0
+
+        upload = append_chunk(upload, 0, io.BytesIO(self.CONTENT), len(self.CONTENT))
+        assert complete_upload(upload).size == len(self.CONTENT)
+
+    def test_complete_with_lost_spool(self, overdue_obligation) -> None:  # pylint: disable=redefined-outer-name
+        """Test completing an upload whose spool vanished asks for it again."""
+        upload = self._start(overdue_obligation)
+        upload = append_chunk(upload, 0, io.BytesIO(self.CONTENT), len(self.CONTENT))
+        os.remove(spool_path(upload))
+
+        with pytest.raises(UploadError) as lost:
+            complete_upload(upload)
+        assert lost.value.status == 409
+        upload.refresh_from_db()
+        assert upload.received == 0
+        assert not overdue_obligation.evidences.exists()
+
+    def test_invalid_uploads_rejected(self, overdue_obligation) -> None:  # pylint: disable=redefined-outer-name
+        """Test uploads that could never become evidence are refused up front."""
+        digest = "0" * 64
+        with pytest.raises(UploadError):
+            start_upload(overdue_obligation, "script.exe", 10, digest)
+        with pytest.raises(UploadError) as too_large:
+            start_upload(overdue_obligation, "big.pdf", 26 * 1024 * 1024, digest)
+        assert too_large.value.status == 413
+        with pytest.raises(UploadError):
+            start_upload(overdue_obligation, "a.pdf", 10, "not-a-digest")
+
+    def test_expire_uploads(self, overdue_obligation) -> None:  # pylint: disable=redefined-outer-name
+        """Test abandoned uploads are discarded."""
+        upload = self._start(overdue_obligation)
+        assert expire_uploads() == 0
+        assert expire_uploads(now=timezone.now() + timedelta(days=2)) == 1
+        assert not EvidenceUpload.objects.filter(pk=upload.pk).exists()
+        assert not os.path.exists(spool_path(upload))
+
+
 # UTILITY TESTS
 class TestUtilities:
     """Test utility functions."""
@@ -509,3 +1150,600 @@ def test_delete_view(self, client, test_admin, test_obligation) -> None:  # pyli
         # Obligation should be deleted
         with pytest.raises(Obligation.DoesNotExist):
             Obligation.objects.get(obligation_number=obligation_number)
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """Test the ETag validators on polled project endpoints."""
+
+    def test_unchanged_project_answers_not_modified(self, rf, overdue_obligation) -> None:  # pylint: disable=redefined-outer-name
+        """Test a matching If-None-Match gets a 304 until the project changes."""
+        url = reverse("obligations:overdue")
+        project_id = overdue_obligation.project_id
+
+        def count(**headers):
+            request = rf.get(url, {"project_id": project_id}, headers=headers)
+            request.user = User(username="poller")
+            return TotalOverdueObligationsView.as_view()(request)
+
+        response = count()
+        assert response.status_code == 200
+        etag = response["ETag"]
+        assert count(if_none_match=etag).status_code == 304
+
+        overdue_obligation.obligation = "Changed"
+        overdue_obligation.save()
+        response = count(if_none_match=etag)
+        assert response.status_code == 200
+        assert json.loads(response.content) == 1
+        assert response["ETag"] != etag
+
+        # Deleting an obligation changes the validator too
+        etag = response["ETag"]
+        overdue_obligation.delete()
+        assert count(if_none_match=etag).status_code == 200
+
+
+@pytest.mark.django_db
+class TestObligationExport:
+    """Test the streaming CSV/XLSX export."""
+
+    def test_csv_export_applies_filters(self, rf, overdue_obligation) -> None:  # pylint: disable=redefined-outer-name
+        """Test the CSV export streams the filtered rows with register headers."""
+        Obligation.objects.create(
+            obligation_number="PCEMP-601",
+            project=overdue_obligation.project,
+            primary_environmental_mechanism=overdue_obligation.primary_environmental_mechanism,
+            environmental_aspect="Air",
+            obligation='Quoted "dust", with commas',
+            status="completed",
+        )
+
+        def export(**params):
+            request = rf.get(reverse("obligations:export"), params)
+            request.user = User(username="exporter")
+            return ObligationExportView.as_view()(request)
+
+        response = export(
+            project_id=overdue_obligation.project_id, status="completed", format="csv"
+        )
+        assert response.status_code == 200
+        assert response.streaming
+        assert "attachment" in response["Content-Disposition"]
+
+        text = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.reader(io.StringIO(text)))
+        assert rows[0] == [header for header, _ in EXPORT_COLUMNS]
+        assert len(rows) == 2
+        record = dict(zip(rows[0], rows[1]))
+        assert record["Obligation Number"] == "PCEMP-601"
+        assert record["Obligation"] == 'Quoted "dust", with commas'
+        assert record["Primary_Environmental_Mechanism"] == "Test Mechanism"
+
+        # Formula-leading text is neutralised, other values are untouched
+        Obligation.objects.filter(obligation_number="PCEMP-601").update(
+            obligation='=HYPERLINK("http://example.com")',
+            general_comments="-1",
+            accountability="@SUM(A1)",
+        )
+        response = export(
+            project_id=overdue_obligation.project_id, status="completed", format="csv"
+        )
+        text = b"".join(response.streaming_content).decode("utf-8-sig")
+        record = dict(zip(*csv.reader(io.StringIO(text))))
+        assert record["Obligation"] == """'=HYPERLINK("http://example.com")"""
+        assert record["General Comments"] == "'-1"
+        assert record["Accountability"] == "'@SUM(A1)"
+        assert record["Obligation Number"] == "PCEMP-601"
+
+        assert export(format="csv").status_code == 400
+        assert export(project_id=1, format="pdf").status_code == 400
+
+    def test_export_keeps_every_search_match(self, rf, overdue_obligation) -> None:  # pylint: disable=redefined-outer-name
+        """Test a searched export is not cut to the ranked search limit."""
+        ensure_search_index()
+        Obligation.objects.bulk_create(
+            Obligation(
+                obligation_number=f"PCEMP-{7000 + i}",
+                project=overdue_obligation.project,
+                primary_environmental_mechanism=overdue_obligation.primary_environmental_mechanism,
+                environmental_aspect="Air",
+                obligation=f"Water haul roads for dust, round {i}",
+                status="not started",
+            )
+            for i in range(750)
+        )
+        request = rf.get(
+            reverse("obligations:export"),
+            {
+                "project_id": overdue_obligation.project_id,
+                "search": "dust",
+                "format": "csv",
+            },
+        )
+        request.user = User(username="exporter")
+        response = ObligationExportView.as_view()(request)
+
+        text = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.reader(io.StringIO(text)))
+        assert len(rows) == 1 + 750
+
+    def test_xlsx_stream_is_a_valid_workbook(self) -> None:
+        """Test the streamed XLSX parses and types its cells."""
+        rows = [("PCEMP-1", date(2025, 1, 31), True, None, "a < b\x01", "+1", -2)] * 3
+        headers = ["No", "Due", "Flag", "Empty", "Text", "Formula", "Number"]
+        data = b"".join(stream_xlsx(iter(rows), headers))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as workbook:
+            assert workbook.testzip() is None
+            sheet = ElementTree.fromstring(workbook.read("xl/worksheets/sheet1.xml"))
+        ns = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+        sheet_rows = sheet.findall(".//x:row", ns)
+        assert len(sheet_rows) == 4
+        cells = sheet_rows[1].findall("x:c", ns)
+        assert cells[1].get("s") == "1"
+        assert cells[1].find("x:v", ns).text == "45688"
+        assert cells[2].get("t") == "b"
+        assert cells[4].find(".//x:t", ns).text == "a < b"
+        assert cells[5].find(".//x:t", ns).text == "'+1"
+        assert cells[6].find("x:v", ns).text == "-2"
+
+
+IMPORT_COLUMNS = [
+    "obligation__number",
+    "primary__environmental__mechanism",
+    "status",
+    "obligation",
+]
+
+
+def _import(path, rows, columns=IMPORT_COLUMNS, **options) -> str:
+    """Write ``rows`` to a CSV at ``path``, import it and return the summary."""
+    with path.open("w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(dict(zip(columns, row, strict=True)) for row in rows)
+    out = io.StringIO()
+    call_command(
+        "import_obligations", str(path), project="Import Project",
+        stdout=out, **options
+    )
+    return out.getvalue().strip().splitlines()[-1]
+
+
+@pytest.mark.django_db
+class TestImportObligations:
+    """Test the import_obligations command."""
+
+    @pytest.mark.parametrize("batch", [False, True])
+    def test_summary_counts(self, tmp_path, batch) -> None:
+        """Test re-imports report created, updated, unchanged and skipped rows."""
+        path = tmp_path / "obligations.csv"
+        first = [
+            ("PCEMP-001", "MS1180", "completed", "Monitor dust"),
+            ("PCEMP-002", "MS1180", "not started", "Report annually"),
+        ]
+        assert _import(path, first, batch=batch).endswith(
+            "2 created, 0 updated, 0 unchanged, 0 skipped, 0 errors"
+        )
+
+        second = [
+            first[0],
+            ("PCEMP-002", "MS1180", "in progress", "Report annually"),
+            ("PCEMP-003", "MS1180", "not started", "Inspect fences"),
+        ]
+        assert _import(path, second, batch=batch, update=True).endswith(
+            "1 created, 1 updated, 1 unchanged, 0 skipped, 0 errors"
+        )
+        assert Obligation.objects.get(pk="PCEMP-002").status == "in progress"
+
+        with CaptureQueriesContext(connection) as queries:
+            summary = _import(path, second, batch=batch)
+        assert summary.endswith(
+            "0 created, 0 updated, 0 unchanged, 3 skipped, 0 errors"
+        )
+        # Existing numbers come from one up-front query, not one per row
+        assert not [
+            query for query in queries.captured_queries
+            if '"obligations_obligation"."obligation_number" =' in query["sql"]
+        ]
+
+
+    @pytest.mark.parametrize("batch", [False, True])
+    def test_unchanged_reimport_cost_is_flat(self, tmp_path, batch) -> None:
+        """Test re-importing unchanged rows costs the same queries for any count."""
+        rows = [
+            (f"PCEMP-{i:03d}", f"MS{i % 3}", "not started", f"Row {i}")
+            for i in range(40)
+        ]
+        _import(tmp_path / "all.csv", rows, batch=batch)
+
+        def cost(count):
+            with CaptureQueriesContext(connection) as queries:
+                summary = _import(
+                    tmp_path / f"{count}.csv", rows[:count], batch=batch, update=True
+                )
+            assert summary.endswith(f"{count} unchanged, 0 skipped, 0 errors")
+            return [query["sql"] for query in queries.captured_queries]
+
+        queries = cost(20)
+        assert len(queries) == len(cost(40))
+        if not batch:
+            # Project, fingerprints and mechanisms; no per-row savepoints
+            assert len(queries) == 3
+
+    def test_batch_reserves_numbers_past_supplied_ones(self, tmp_path) -> None:
+        """Test rows without a number get numbers that skip those in the chunk."""
+        rows = [
+            ("", "MS1180", "not started", "First"),
+            ("PCEMP-005", "MS1180", "not started", "Numbered"),
+            ("", "MS1180", "not started", "Second"),
+        ]
+        assert _import(tmp_path / "numbers.csv", rows, batch=True).endswith(
+            "3 created, 0 updated, 0 unchanged, 0 skipped, 0 errors"
+        )
+        assert dict(Obligation.objects.values_list("obligation", "pk")) == {
+            "First": "PCEMP-006",
+            "Numbered": "PCEMP-005",
+            "Second": "PCEMP-007",
+        }
+        assert Obligation.get_next_obligation_number() == "PCEMP-008"
+
+    @pytest.mark.parametrize(
+        ("update", "summary", "text"),
+        [
+            (False, "1 created, 0 updated, 0 unchanged, 1 skipped", "First"),
+            (True, "1 created, 1 updated, 0 unchanged, 0 skipped", "Second"),
+        ],
+    )
+    def test_batch_duplicate_numbers_in_chunk(
+        self, tmp_path, update, summary, text
+    ) -> None:
+        """Test a number repeated within one chunk is written once."""
+        rows = [
+            ("PCEMP-010", "MS1180", "not started", "First"),
+            ("PCEMP-010", "MS1180", "completed", "Second"),
+        ]
+        assert summary in _import(
+            tmp_path / "duplicates.csv", rows, batch=True, update=update
+        )
+        assert list(Obligation.objects.values_list("obligation", flat=True)) == [text]
+
+    def test_batch_recounts_mechanisms(self, tmp_path) -> None:
+        """Test mechanism counters match the imported rows, including moves."""
+        path = tmp_path / "counters.csv"
+        rows = [
+            ("PCEMP-001", "MS1180", "completed", "One"),
+            ("PCEMP-002", "MS1180", "not started", "Two"),
+            ("PCEMP-003", "W6946", "in progress", "Three"),
+        ]
+        _import(path, rows, batch=True, batch_size=2)
+
+        def counts(name):
+            mechanism = EnvironmentalMechanism.objects.get(name=name)
+            return (
+                mechanism.not_started_count,
+                mechanism.in_progress_count,
+                mechanism.completed_count,
+            )
+
+        assert counts("MS1180") == (1, 0, 1)
+        assert counts("W6946") == (0, 1, 0)
+
+        # Moving an obligation recounts both its old and new mechanism
+        rows[0] = ("PCEMP-001", "W6946", "completed", "One")
+        _import(path, rows, batch=True, batch_size=2, update=True)
+        assert counts("MS1180") == (1, 0, 0)
+        assert counts("W6946") == (0, 1, 1)
+
+    def test_batch_sets_recurring_forecast(self, tmp_path) -> None:
+        """Test batch-created recurring obligations get a forecast like save() does."""
+        due = timezone.now().date() + timedelta(days=10)
+        columns = [
+            *IMPORT_COLUMNS, "action__due_date",
+            "recurring__obligation", "recurring__frequency",
+        ]
+        rows = [
+            ("PCEMP-001", "MS1180", "not started", "Weekly", due.isoformat(),
+             "yes", "weekly"),
+            ("PCEMP-002", "MS1180", "not started", "Once", due.isoformat(), "no", ""),
+        ]
+        _import(tmp_path / "recurring.csv", rows, columns=columns, batch=True)
+
+        forecasts = dict(
+            Obligation.objects.values_list("pk", "recurring_forcasted_date")
+        )
+        assert forecasts == {"PCEMP-001": due + timedelta(days=7), "PCEMP-002": None}
+
+    def test_batch_failed_chunk_leaves_no_bookkeeping(
+        self, tmp_path, monkeypatch
+    ) -> None:
+        """Test rows of a rolled-back chunk are imported again by a later one."""
+        bulk_create = QuerySet.bulk_create
+        calls = []
+
+        def fail_first(queryset, objs, *args, **kwargs):
+            if queryset.model is Obligation and not calls:
+                calls.append(objs)
+                raise DatabaseError("disk full")
+            return bulk_create(queryset, objs, *args, **kwargs)
+
+        monkeypatch.setattr(QuerySet, "bulk_create", fail_first)
+        rows = [
+            ("PCEMP-001", "NEW1", "completed", "One"),
+            ("PCEMP-001", "NEW1", "completed", "One"),
+        ]
+        summary = _import(
+            tmp_path / "retry.csv", rows, batch=True, batch_size=1,
+            continue_on_error=True,
+        )
+        assert summary.endswith(
+            "1 created, 0 updated, 0 unchanged, 0 skipped, 1 errors"
+        )
+        obligation = Obligation.objects.get(pk="PCEMP-001")
+        mechanism = obligation.primary_environmental_mechanism
+        assert mechanism.name == "NEW1"
+        assert mechanism.completed_count == 1
+
+    def test_batch_backfills_only_mechanisms_in_use(self, tmp_path) -> None:
+        """Test the mechanism lookup writes nothing for dry runs or unused rows."""
+        project = Project.objects.create(name="Import Project")
+        for name in ("MS1180", "W6946"):
+            EnvironmentalMechanism.objects.create(
+                name=name, project=project, primary_environmental_mechanism=None
+            )
+
+        def codes():
+            return dict(
+                EnvironmentalMechanism.objects.values_list(
+                    "name", "primary_environmental_mechanism"
+                )
+            )
+
+        path = tmp_path / "codes.csv"
+        rows = [("PCEMP-001", "MS1180", "completed", "One")]
+        _import(path, rows, dry_run=True, workers=1)
+        assert codes() == {"MS1180": None, "W6946": None}
+
+        _import(path, rows, batch=True)
+        assert codes() == {"MS1180": "MS1180", "W6946": None}
+
+
+    def test_dry_run_report(self, tmp_path) -> None:
+        """Test --dry-run writes a structured report and nothing else."""
+        report_path = tmp_path / "report.json"
+        rows = [
+            ("PCEMP-001", "MS1180", "completed", "One", "2025-01-31"),
+            ("", "MS1180", "done", "Two", "31/31/2025"),
+            ("PCEMP-001", "MS1180", "completed", "Again", ""),
+        ]
+        summary = _import(
+            tmp_path / "dry.csv", rows, columns=[*IMPORT_COLUMNS, "action__due_date"],
+            dry_run=True, workers=1, report=str(report_path),
+        )
+        assert "Validated 3 rows" in summary
+        assert summary.endswith(
+            "2 errors, 2 warnings; would create 2, update 0, skip 0; "
+            "1 new mechanisms"
+        )
+
+        report = json.loads(report_path.read_text(encoding="utf-8"))
+        assert (report["rows"], report["errors"], report["warnings"]) == (3, 2, 2)
+        assert [
+            (issue["row"], issue["field"], issue["severity"])
+            for issue in report["issues"]
+        ] == [
+            (3, "obligation_number", "warning"),
+            (3, "action_due_date", "error"),
+            (3, "status", "warning"),
+            (4, "obligation_number", "error"),
+        ]
+        assert report["issues"][3]["message"] == "duplicate of row 2"
+
+        # Validating against a new project name must not create it
+        assert not Project.objects.filter(name="Import Project").exists()
+        assert not EnvironmentalMechanism.objects.exists()
+        assert not Obligation.objects.exists()
+
+
+class TestXlsxRows:
+    """Test reading obligation registers from XLSX workbooks."""
+
+    @pytest.fixture
+    def workbook_path(self, tmp_path):
+        """Write a register with a title block above the header on sheet 2."""
+        openpyxl = pytest.importorskip("openpyxl")
+        workbook = openpyxl.Workbook()
+        workbook.active.title = "Notes"
+        workbook.active.append(["Read me first"])
+        register = workbook.create_sheet("Register")
+        register.append(["PCEMP Obligation Register"])
+        register.append([])
+        register.append(["Obligation Number", "Obligation", "Action_DueDate", "Memo"])
+        register.append(["PCEMP-001", "Monitor dust", date(2025, 1, 31), "x"])
+        register.append([None, None, None, None])
+        register.append(["PCEMP-002", " Report ", None, None])
+        path = tmp_path / "register.xlsx"
+        workbook.save(path)
+        return path
+
+    def test_detects_header_row(self, workbook_path) -> None:
+        """Test the header is found below title rows and unknown columns dropped."""
+        rows = list(iter_xlsx_rows(workbook_path, sheet="Register"))
+        assert rows == [
+            {
+                "obligation__number": "PCEMP-001",
+                "obligation": "Monitor dust",
+                "action__due_date": "2025-01-31",
+            },
+            {
+                "obligation__number": "PCEMP-002",
+                "obligation": "Report",
+                "action__due_date": "",
+            },
+        ]
+
+    def test_explicit_header_row(self, workbook_path) -> None:
+        """Test an explicit header row overrides detection."""
+        detected = list(iter_xlsx_rows(workbook_path, sheet="Register"))
+        assert list(
+            iter_xlsx_rows(workbook_path, sheet="Register", header_row=3)
+        ) == detected
+        # The title row names no import columns, so nothing is read under it
+        assert not list(iter_xlsx_rows(workbook_path, sheet="Register", header_row=1))
+        with pytest.raises(ValueError, match="has no row 10"):
+            list(iter_xlsx_rows(workbook_path, sheet="Register", header_row=10))
+
+    def test_sheet_selection(self, workbook_path) -> None:
+        """Test sheets are chosen by name or index, defaulting to the active one."""
+        by_index = list(iter_xlsx_rows(workbook_path, sheet="1"))
+        assert [row["obligation__number"] for row in by_index] == [
+            "PCEMP-001", "PCEMP-002"
+        ]
+        with pytest.raises(ValueError, match="No header row found in sheet 'Notes'"):
+            list(iter_xlsx_rows(workbook_path))
+        with pytest.raises(ValueError, match="not found"):
+            list(iter_xlsx_rows(workbook_path, sheet="Missing"))
+        with pytest.raises(ValueError, match="no sheet at index 5"):
+            list(iter_xlsx_rows(workbook_path, sheet="5"))
+
+
+DIRTY_REGISTER = """\
+Obligation Number,Obligation,ProjectPhase,Environmental_Aspect,Action_DueDate,\
+Status,Recurring Obligation,Inspection,Site or Desktop,person_email
+PCEMP-1,"Monitor \u2022 dust
+daily",Pre-construction design,air,2025-01-31,Complete,Yes,n,On site,a@b.com
+obl-2,Report \u2013 annual,Construction,NOISE,15/02/2025,in-progress,no,TRUE,\
+Desktop review,bad email
+17,Fence,operations,heritage x,,NOTSTARTED,,1,,
+,Throughout,Throughout the project,Waste,2025-12-01,,maybe,0,NULL, c@d.org
+PCEMP-20,Last,whatever,,not a date,not started,Y,,elsewhere,
+"""
+
+
+def _legacy_phase(value: str):
+    """Project phase rule of the former per-cell cleaner."""
+    lowered = value.lower()
+    if "construction" in lowered:
+        return "Construction"
+    if "pre" in lowered or "design" in lowered:
+        return "Pre-Construction"
+    if "operation" in lowered:
+        return "Operation"
+    if "throughout" in lowered:
+        return "Throughout the project"
+    return value if value in {"Pre-Construction", "Operation"} else None
+
+
+def _legacy_boolean(value: str):
+    """Boolean rule of the former per-cell cleaner."""
+    value = value.strip().lower()
+    if value in ("yes", "y", "true", "1"):
+        return True
+    return False if value in ("no", "n", "false", "0", "") else None
+
+
+# Column -> the former ``.apply`` rule, applied to each cell's str()
+LEGACY_CLEANERS = {
+    "obligation": lambda x: (
+        re.sub(r"[\r\n\u2022\u2013\u2019]", "-", x) if x != "nan" else ""
+    ),
+    "project_phase": _legacy_phase,
+    "environmental__aspect": lambda x: x.title() if x.title() in {
+        "Air", "Noise", "Waste", "Heritage"
+    } else "Other",
+    "status": lambda x: {
+        "complete": "completed", "in-progress": "in progress",
+        "notstarted": "not started", "completed": "completed",
+    }.get(x.lower().strip(), "not started"),
+    "recurring__obligation": _legacy_boolean,
+    "inspection": _legacy_boolean,
+    "site_or__desktop": lambda x: (
+        "Site" if "site" in x.lower()
+        else "Desktop" if "desktop" in x.lower()
+        else None if x in ("nan", "NULL", "")
+        else x
+    ),
+    "person_email": lambda x: x.strip() if x != "nan" and "@" in x else None,
+    "obligation__number": lambda x: (
+        f"PCEMP-{x.split('-')[1]}" if "-" in x
+        else f"PCEMP-{x}" if x.isdigit()
+        else None
+    ),
+}
+
+
+class TestCleanCsvToImport:
+    """Test the vectorized, chunked clean_csv_to_import command."""
+
+    @pytest.fixture
+    def dirty_csv(self, tmp_path):
+        """Write a register with the kinds of mess the cleaners handle."""
+        pytest.importorskip("pandas")
+        path = tmp_path / "dirty.csv"
+        path.write_text(DIRTY_REGISTER, encoding="utf-8")
+        return path
+
+    def _clean(self, dirty_csv, outpath, **options):
+        errors = io.StringIO()
+        call_command(
+            "clean_csv_to_import", str(dirty_csv), output_file=str(outpath),
+            stdout=io.StringIO(), stderr=errors, **options
+        )
+        # The command reports failures on stderr instead of raising
+        assert not errors.getvalue()
+        return outpath
+
+    def test_matches_per_cell_rules(self, dirty_csv, tmp_path) -> None:
+        """Test the vectorized cleaners give what the per-cell rules gave."""
+        pd = pytest.importorskip("pandas")
+        raw = pd.read_csv(dirty_csv, dtype=str)
+        cleaned = pd.read_csv(
+            self._clean(dirty_csv, tmp_path / "clean.csv"), dtype=str,
+            keep_default_na=False,
+        )
+        for header, column in [
+            ("Obligation Number", "obligation__number"),
+            ("Obligation", "obligation"),
+            ("ProjectPhase", "project_phase"),
+            ("Environmental_Aspect", "environmental__aspect"),
+            ("Status", "status"),
+            ("Recurring Obligation", "recurring__obligation"),
+            ("Inspection", "inspection"),
+            ("Site or Desktop", "site_or__desktop"),
+            ("person_email", "person_email"),
+        ]:
+            expected = [
+                "" if value is None else str(value)
+                for value in raw[header].astype(str).map(LEGACY_CLEANERS[column])
+            ]
+            assert cleaned[column].tolist() == expected, column
+        assert cleaned["action__due_date"].tolist() == [
+            "2025-01-31", "2025-02-15", "", "2025-12-01", ""
+        ]
+
+    def test_chunked_output_matches_single_pass(self, dirty_csv, tmp_path) -> None:
+        """Test cleaning in chunks writes the same file as one pass."""
+        whole = self._clean(dirty_csv, tmp_path / "whole.csv")
+        chunked = self._clean(dirty_csv, tmp_path / "chunked.csv", chunk_size=2)
+        assert chunked.read_text(encoding="utf-8") == whole.read_text(
+            encoding="utf-8"
+        )
+
+    def test_parquet_output_matches_csv(self, dirty_csv, tmp_path) -> None:
+        """Test the Parquet output holds the same rows as the CSV output."""
+        pd = pytest.importorskip("pandas")
+        pytest.importorskip("pyarrow")
+        csv_path = self._clean(dirty_csv, tmp_path / "clean.csv")
+        parquet_path = self._clean(
+            dirty_csv, tmp_path / "clean.parquet", chunk_size=2,
+            output_format="parquet",
+        )
+        # CSV cannot tell a null from empty text, so compare both as text
+        from_csv = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+        from_parquet = pd.read_parquet(parquet_path).astype(str)
+        from_csv, from_parquet = (
+            frame.replace({"None": "", "nan": ""}) for frame in (from_csv, from_parquet)
+        )
+        assert from_parquet.to_dict("records") == from_csv.to_dict("records")
+
@@ -0,0 +1,323 @@
+"""
+Chunked, resumable evidence uploads.
+
+A client opens an ``EvidenceUpload`` with the file's name, size and SHA-256
+and then sends the bytes in order, a chunk per request, each tagged with
+its offset. Chunks are appended to a spool file outside the media root, so
+no request carries more than ``MAX_CHUNK_SIZE`` bytes and a dropped
+connection costs at most one chunk: the client reads ``received`` back and
+carries on from there. Completing the upload hashes the spooled file and,
+only if it matches the declared digest, attaches it as ``ObligationEvidence``
+in the same transaction that closes the upload.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from typing import BinaryIO, Optional
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .constants import EVIDENCE_EXTENSIONS, EVIDENCE_MAX_FILES, EVIDENCE_MAX_SIZE
+from .models import EvidenceUpload, Obligation, ObligationEvidence
+
+logger = logging.getLogger(__name__)
+
+# Chunk size suggested to clients
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Largest chunk a single request may carry
+MAX_CHUNK_SIZE = 8 * 1024 * 1024
+# Uploads untouched for this long are discarded by the nightly sweep
+UPLOAD_EXPIRY = timedelta(hours=24)
+
+_COPY_BUFFER = 64 * 1024
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+
+class UploadError(ValueError):
+    """An upload request that cannot be applied.
+
+    Args:
+        message: Explanation for the client
+        status: HTTP status to answer with
+    """
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def spool_directory() -> str:
+    """Return the directory holding partial uploads, creating it if needed.
+
+    Set ``EVIDENCE_UPLOAD_SPOOL_DIR`` to a directory shared by all workers
+    when more than one host serves uploads.
+    """
+    directory = getattr(settings, "EVIDENCE_UPLOAD_SPOOL_DIR", None) or os.path.join(
+        tempfile.gettempdir(), "greenova-evidence-uploads"
+    )
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def spool_path(upload: EvidenceUpload) -> str:
+    """Return the spool file for an upload."""
+    return os.path.join(spool_directory(), f"{upload.pk}.part")
+
+
+def _remove_spool(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as spool:
+        for block in iter(lambda: spool.read(_COPY_BUFFER), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def start_upload(
+    obligation: Obligation,
+    filename: str,
+    size: int,
+    sha256: str,
+    description: str = "",
+    user=None,
+) -> EvidenceUpload:
+    """
+    Open a chunked upload of one evidence file.
+
+    Args:
+        obligation: Obligation the file will be attached to
+        filename: Name of the file on the client
+        size: Total size in bytes
+        sha256: Hex SHA-256 of the whole file
+        description: Evidence description
+        user: User uploading the file
+
+    Returns:
+        EvidenceUpload: The open upload, with nothing received yet
+
+    Raises:
+        UploadError: If the file could never be accepted as evidence
+    """
+    filename = os.path.basename(str(filename or "")).strip()[:255]
+    extension = os.path.splitext(filename)[1].lstrip(".").lower()
+    if extension not in EVIDENCE_EXTENSIONS:
+        raise UploadError(
+            f"File type not allowed. Allowed types: {', '.join(EVIDENCE_EXTENSIONS)}"
+        )
+    if isinstance(size, bool) or not isinstance(size, int) or size <= 0:
+        raise UploadError("'size' must be a positive number of bytes")
+    if size > EVIDENCE_MAX_SIZE:
+        raise UploadError("File size must be under 25MB", status=413)
+    sha256 = str(sha256 or "").lower()
+    if not _SHA256.match(sha256):
+        raise UploadError("'sha256' must be a hex SHA-256 digest")
+    if obligation.evidences.count() >= EVIDENCE_MAX_FILES:
+        raise UploadError(
+            "Maximum of 5 evidence files allowed per obligation", status=409
+        )
+
+    upload = EvidenceUpload.objects.create(
+        obligation=obligation,
+        filename=filename,
+        description=str(description or "")[:255],
+        size=size,
+        sha256=sha256,
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+    open(spool_path(upload), "wb").close()
+    return upload
+
+
+def append_chunk(
+    upload: EvidenceUpload, offset: int, body: BinaryIO, length: int
+) -> EvidenceUpload:
+    """
+    Write ``length`` bytes read from ``body`` into the upload at ``offset``.
+
+    Chunks must arrive in order: ``offset`` may not be past ``received``.
+    A chunk starting before it (resent after a lost response) overwrites
+    the bytes it repeats, and anything after it is discarded. If the spool
+    file has gone, ``received`` is reset to 0 and stored before a later
+    chunk is rejected, so the client starts the file over.
+
+    Args:
+        upload: Open upload
+        offset: Position of the chunk in the file
+        body: Stream to read the chunk from, e.g. the request
+        length: Chunk size in bytes
+
+    Returns:
+        EvidenceUpload: The upload with ``received`` advanced
+
+    Raises:
+        UploadError: If the chunk is out of order, too large, or short
+    """
+    if length <= 0 or length > MAX_CHUNK_SIZE:
+        raise UploadError(
+            f"Chunks must be between 1 and {MAX_CHUNK_SIZE} bytes",
+            status=413 if length > MAX_CHUNK_SIZE else 400,
+        )
+    if offset < 0 or offset + length > upload.size:
+        raise UploadError("Chunk does not fit inside the declared file size")
+
+    # Read the whole chunk before taking the row lock, so a slow connection
+    # never holds it
+    with tempfile.SpooledTemporaryFile(max_size=UPLOAD_CHUNK_SIZE) as chunk:
+        read = 0
+        while read < length:
+            block = body.read(min(_COPY_BUFFER, length - read))
+            if not block:
+                break
+            chunk.write(block)
+            read += len(block)
+        if read != length:
+            raise UploadError(f"Chunk ended after {read} of {length} bytes")
+        chunk.seek(0)
+
+        expected: Optional[int] = None
+        with transaction.atomic():
+            upload = EvidenceUpload.objects.select_for_update().get(pk=upload.pk)
+            if upload.state != EvidenceUpload.STATE_OPEN:
+                raise UploadError("Upload is already complete", status=409)
+            path = spool_path(upload)
+            if not os.path.exists(path):
+                # The spool was cleared (e.g. a reboot wiped /tmp); start over
+                open(path, "wb").close()
+                upload.received = 0
+                upload.save(update_fields=["received", "updated_at"])
+            if offset > upload.received:
+                # Rejected after the block commits, so a reset above is kept
+                expected = upload.received
+            else:
+                with open(path, "r+b") as spool:
+                    spool.seek(offset)
+                    shutil.copyfileobj(chunk, spool, _COPY_BUFFER)
+                    spool.truncate()
+                upload.received = offset + length
+                upload.save(update_fields=["received", "updated_at"])
+    if expected is not None:
+        raise UploadError(f"Expected a chunk at offset {expected}", status=409)
+    return upload
+
+
+def complete_upload(upload: EvidenceUpload) -> ObligationEvidence:
+    """
+    Verify a fully received upload and attach it as evidence.
+
+    Completing an upload twice returns the evidence created the first time.
+    If the spooled file does not match the declared SHA-256 the received
+    bytes are discarded and the client must send the file again.
+
+    Args:
+        upload: Upload whose bytes have all been received
+
+    Returns:
+        ObligationEvidence: The attached evidence file
+
+    Raises:
+        UploadError: If bytes are missing or lost, the digest does not
+            match, or the obligation already has the maximum number of files
+    """
+    with transaction.atomic():
+        upload = EvidenceUpload.objects.select_for_update().get(pk=upload.pk)
+        if upload.state == EvidenceUpload.STATE_COMPLETE:
+            if upload.evidence is None:
+                raise UploadError("The uploaded evidence has been deleted", status=410)
+            return upload.evidence
+        if upload.received != upload.size:
+            raise UploadError(
+                f"Received {upload.received} of {upload.size} bytes", status=409
+            )
+
+        path = spool_path(upload)
+        try:
+            digest: Optional[str] = _hash_file(path)
+        except FileNotFoundError:
+            digest = None
+        if digest == upload.sha256:
+            # Lock the obligation so concurrent completions can't pass the limit
+            obligation = Obligation.objects.select_for_update().get(
+                pk=upload.obligation_id
+            )
+            if obligation.evidences.count() >= EVIDENCE_MAX_FILES:
+                raise UploadError(
+                    "Maximum of 5 evidence files allowed per obligation", status=409
+                )
+            with open(path, "rb") as spool:
+                evidence = ObligationEvidence(
+                    obligation=obligation,
+                    description=upload.description,
+                    file=File(spool, name=upload.filename),
+                )
+                evidence.save()
+            upload.state = EvidenceUpload.STATE_COMPLETE
+            upload.evidence = evidence
+            upload.save(update_fields=["state", "evidence", "updated_at"])
+            transaction.on_commit(lambda: _remove_spool(path))
+            logger.info(
+                "Attached %s to obligation %s as evidence %s",
+                upload.filename, obligation.pk, evidence.pk,
+            )
+            return evidence
+
+    EvidenceUpload.objects.filter(pk=upload.pk).update(
+        received=0, updated_at=timezone.now()
+    )
+    open(path, "wb").close()
+    if digest is None:
+        raise UploadError("Received bytes were lost; send the file again", status=409)
+    raise UploadError(
+        "Uploaded file does not match its SHA-256; send it again", status=422
+    )
+
+
+def abort_upload(upload: EvidenceUpload) -> None:
+    """Discard an upload and its spooled bytes."""
+    path = spool_path(upload)
+    upload.delete()
+    transaction.on_commit(lambda: _remove_spool(path))
+
+
+def expire_uploads(now: Optional[datetime] = None) -> int:
+    """
+    Discard uploads untouched for ``UPLOAD_EXPIRY`` and orphaned spool files.
+
+    Args:
+        now: Current time (defaults to ``timezone.now()``)
+
+    Returns:
+        int: Number of upload records deleted
+    """
+    cutoff = (now or timezone.now()) - UPLOAD_EXPIRY
+    deleted, _ = EvidenceUpload.objects.filter(updated_at__lt=cutoff).delete()
+
+    # Spool files of uploads removed any other way, e.g. with their obligation
+    live = {
+        f"{pk}.part"
+        for pk in EvidenceUpload.objects.filter(
+            state=EvidenceUpload.STATE_OPEN
+        ).values_list("pk", flat=True)
+    }
+    with os.scandir(spool_directory()) as entries:
+        for entry in entries:
+            if (
+                entry.name.endswith(".part")
+                and entry.name not in live
+                and entry.stat().st_mtime < cutoff.timestamp()
+            ):
+                _remove_spool(entry.path)
+    return deleted
@@ -1,7 +1,7 @@
 from django.shortcuts import redirect
 from django.urls import path
 
-from . import views
+from . import api_views, views
 from .views import ObligationSummaryView, ToggleCustomAspectView
 
 app_name = "obligations"
@@ -45,4 +45,38 @@ def root_redirect(request):
     ),
     path("list/", views.ObligationListView.as_view(), name="obligation_list"),
     path("popup/", views.obligation_list_popup, name="obligations_popup"),
+    path("export/", views.ObligationExportView.as_view(), name="export"),
+    # Bulk operations API
+    path("api/bulk/", api_views.BulkOperationsAPI.as_view(), name="bulk"),
+    path(
+        "api/bulk/<uuid:job_id>/",
+        api_views.BulkOperationJobAPI.as_view(),
+        name="bulk_job",
+    ),
+    # Chunked evidence uploads
+    path(
+        "api/evidence-uploads/",
+        api_views.EvidenceUploadsAPI.as_view(),
+        name="evidence_uploads",
+    ),
+    path(
+        "api/evidence-uploads/<uuid:upload_id>/",
+        api_views.EvidenceUploadAPI.as_view(),
+        name="evidence_upload",
+    ),
+    path(
+        "api/evidence-uploads/<uuid:upload_id>/complete/",
+        api_views.EvidenceUploadCompleteAPI.as_view(),
+        name="evidence_upload_complete",
+    ),
+    path(
+        "api/mark-complete/",
+        api_views.MarkObligationsCompleteAPI.as_view(),
+        name="bulk_mark_complete",
+    ),
+    path(
+        "api/delete/",
+        api_views.DeleteObligationsAPI.as_view(),
+        name="bulk_delete",
+    ),
 ]
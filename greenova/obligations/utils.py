@@ -1,8 +1,11 @@
 import logging
-from datetime import date, timedelta
-from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+from datetime import date, datetime, timedelta
+from itertools import chain, islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Union
 
 from core.utils.roles import get_role_display
+from django.db.models import Q
 from django.utils import timezone
 
 # Import Obligation only for type checking to avoid circular imports
@@ -18,6 +21,7 @@
     FREQUENCY_MONTHLY,
     FREQUENCY_QUARTERLY,
     FREQUENCY_WEEKLY,
+    IMPORT_COLUMN_MAPPING,
     STATUS_COMPLETED,
     STATUS_OVERDUE,
     STATUS_UPCOMING,
@@ -25,6 +29,16 @@
 
 logger = logging.getLogger(__name__)
 
+# openpyxl is only needed to read .xlsx obligation registers
+try:
+    from openpyxl import load_workbook
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+# Rows searched for the header when reading a workbook
+XLSX_HEADER_SCAN_ROWS = 20
+
 
 def is_obligation_overdue(
     obligation: Union['Obligation', Dict[str, Any]],
@@ -66,6 +80,29 @@ def is_obligation_overdue(
     return due_date < reference_date
 
 
+def overdue_q(reference_date: Optional[date] = None) -> Q:
+    """
+    Build the database predicate equivalent of ``is_obligation_overdue``.
+
+    Keep the two in step: any rule added to ``is_obligation_overdue`` must be
+    mirrored here so SQL-side filters and counts agree with the Python check.
+
+    Args:
+        reference_date: Optional date to compare against (defaults to today)
+
+    Returns:
+        Q: Predicate matching overdue obligations
+    """
+    if reference_date is None:
+        reference_date = timezone.now().date()
+
+    return (
+        ~Q(status=STATUS_COMPLETED)
+        & Q(action_due_date__isnull=False)
+        & Q(action_due_date__lt=reference_date)
+    )
+
+
 def get_obligation_status(obligation):
     """
     Determine the real status of an obligation based on its due date and current status.
@@ -161,3 +198,124 @@ def get_responsibility_display_name(responsibility_value: str) -> str:
         return role_display
 
     return responsibility_value.replace('_', ' ').title()
+
+
+def _xlsx_cell_to_text(value: Any) -> str:
+    """Render a worksheet cell the way the same value reads in a CSV export."""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _map_import_header(cell: str) -> Optional[str]:
+    """Map a header cell to its import column name, or None if unknown."""
+    if cell in IMPORT_COLUMN_MAPPING:
+        return IMPORT_COLUMN_MAPPING[cell]
+    if cell in IMPORT_COLUMN_MAPPING.values():
+        return cell
+    # Tolerate stray whitespace and case in hand-edited registers
+    for header, column in IMPORT_COLUMN_MAPPING.items():
+        if cell.strip().lower() in (header.strip().lower(), column):
+            return column
+    return None
+
+
+def iter_xlsx_rows(
+    path: Union[str, Path],
+    sheet: Optional[str] = None,
+    header_row: Optional[int] = None,
+) -> Iterator[Dict[str, str]]:
+    """
+    Stream an obligation register worksheet as CSV-style row dicts.
+
+    The workbook is opened read-only, so rows are parsed as they are
+    iterated and memory stays flat however large the sheet is. Headers are
+    mapped to import column names (IMPORT_COLUMN_MAPPING), cells are
+    rendered as strings and blank rows are skipped, so the rows can go
+    straight into import_obligations' process_row.
+
+    Args:
+        path: Path to the .xlsx/.xlsm workbook
+        sheet: Worksheet name or zero-based index; the active sheet if None
+        header_row: 1-based header row; detected from the first
+            XLSX_HEADER_SCAN_ROWS rows if None
+
+    Yields:
+        Dict[str, str]: One dict per data row, keyed by import column name
+
+    Raises:
+        ImportError: If openpyxl is not installed
+        ValueError: If the sheet or a header row cannot be found
+    """
+    if not OPENPYXL_AVAILABLE:
+        raise ImportError(
+            "Reading XLSX requires openpyxl. Please install it with: "
+            "pip install openpyxl"
+        )
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet is None:
+            worksheet = workbook.active
+        elif sheet.isdigit():
+            try:
+                worksheet = workbook.worksheets[int(sheet)]
+            except IndexError as e:
+                raise ValueError(f"Workbook has no sheet at index {sheet}") from e
+        elif sheet in workbook.sheetnames:
+            worksheet = workbook[sheet]
+        else:
+            raise ValueError(
+                f"Sheet '{sheet}' not found, available: {workbook.sheetnames}"
+            )
+
+        rows = worksheet.iter_rows(values_only=True)
+        if header_row is not None:
+            leading = list(islice(rows, header_row))
+            if len(leading) < header_row:
+                raise ValueError(
+                    f"Sheet '{worksheet.title}' has no row {header_row}"
+                )
+            header_index = header_row - 1
+        else:
+            # Pick the row naming the most known columns among the first few;
+            # instruction or title rows above the header match few or none
+            leading = list(islice(rows, XLSX_HEADER_SCAN_ROWS))
+            scores = [
+                sum(
+                    1 for value in values
+                    if _map_import_header(_xlsx_cell_to_text(value))
+                )
+                for values in leading
+            ]
+            if not scores or max(scores) < 2:
+                raise ValueError(f"No header row found in sheet '{worksheet.title}'")
+            header_index = scores.index(max(scores))
+
+        columns = [
+            _map_import_header(_xlsx_cell_to_text(value))
+            for value in leading[header_index]
+        ]
+        logger.info(
+            "Reading sheet '%s' with header on row %s",
+            worksheet.title, header_index + 1
+        )
+
+        for values in chain(leading[header_index + 1:], rows):
+            row = {
+                column: _xlsx_cell_to_text(value)
+                for column, value in zip(columns, values)
+                if column
+            }
+            if any(row.values()):
+                yield row
+    finally:
+        workbook.close()
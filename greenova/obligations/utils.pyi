@@ -1,6 +1,9 @@
 # Stub file for obligations.utils
 from datetime import date
-from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Union
+
+from django.db.models import Q
 
 if TYPE_CHECKING:
     from .models import Obligation
@@ -9,6 +12,12 @@ def is_obligation_overdue(
     obligation: Union["Obligation", Dict[str, Any]],
     reference_date: Optional[date] = None,
 ) -> bool: ...
+def overdue_q(reference_date: Optional[date] = None) -> Q: ...
 def get_obligation_status(obligation: Any) -> str: ...
 def normalize_frequency(frequency: str) -> str: ...
 def get_responsibility_display_name(responsibility_value: str) -> str: ...
+def iter_xlsx_rows(
+    path: Union[str, Path],
+    sheet: Optional[str] = None,
+    header_row: Optional[int] = None,
+) -> Iterator[Dict[str, str]]: ...
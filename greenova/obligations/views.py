@@ -6,10 +6,9 @@
 from company.models import CompanyMembership
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.exceptions import ValidationError
-from django.core.paginator import Paginator
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.db.models import Q, QuerySet
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.decorators import method_decorator
@@ -24,9 +23,13 @@
 from responsibility.models import Responsibility, ResponsibilityAssignment
 from django.http import HttpRequest, HttpResponse
 
+from .conditional import project_conditional
+from .constants import EXPORT_COLUMNS
+from .export import EXPORT_FORMATS, iter_export_rows, stream_csv, stream_xlsx
 from .forms import EvidenceUploadForm, ObligationForm
 from .models import Obligation, ObligationEvidence
-from .utils import is_obligation_overdue
+from .pagination import KeysetPaginator
+from .utils import overdue_q
 
 # Ensure the Django settings module is correctly configured.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "greenova.settings")
@@ -34,6 +37,14 @@
 
 logger = logging.getLogger(__name__)
 
+
+def _page_query(request: HttpRequest) -> str:
+    """Return the request's query string without its pagination cursor."""
+    query = request.GET.copy()
+    query.pop("cursor", None)
+    query.pop("page", None)
+    return query.urlencode()
+
 # Add type hints or mock objects for Obligation and EnvironmentalMechanism to
 # resolve the missing `objects` and `DoesNotExist` members.
 Obligation.objects = Obligation.objects if hasattr(Obligation, "objects") else None
@@ -52,79 +63,8 @@
 )
 
 
-@method_decorator(cache_control(max_age=300), name="dispatch")
-@method_decorator(vary_on_headers("HX-Request"), name="dispatch")
-class ObligationSummaryView(LoginRequiredMixin, View):
-    """View for displaying obligation summary with filtering capabilities.
-
-    This view handles both standard requests and HTMX requests for
-    dynamically loading filtered obligations.
-    """
-
-    def get(self, request, *args, **kwargs):
-        """Handle GET requests for obligation summary.
-
-        When accessed via HTMX from procedure charts, this returns filtered obligations.
-        Otherwise, it provides the full obligation summary view.
-
-        Args:
-            request: The HTTP request
-
-        Returns:
-            Rendered template with appropriate context
-        """
-        # Check if this is a filtered request from procedure charts
-        status = request.GET.get("status")
-        procedure = request.GET.get("procedure")
-        project_id = request.GET.get("project_id")
-
-        if status and procedure and project_id:
-            try:
-                # Filter obligations based on parameters
-                obligations = Obligation.objects.filter(project_id=project_id)
-
-                # Apply status filter (handle overdue special case)
-                if status == "overdue":
-                    # Find obligations that are overdue
-                    filtered_ids = []
-                    for obligation in obligations:
-                        if is_obligation_overdue(obligation):
-                            filtered_ids.append(obligation.obligation_number)
-                    obligations = obligations.filter(obligation_number__in=filtered_ids)
-                else:
-                    obligations = obligations.filter(status=status)
-
-                # Apply procedure filter (adjusted for TextField)
-                if procedure:
-                    obligations = obligations.filter(procedure__icontains=procedure)
-
-                return render(
-                    request,
-                    "obligations/partials/obligation_list.html",
-                    {"obligations": obligations},
-                )
-            except Exception as exc:
-                logger.error("Error filtering obligations: %s", str(exc))
-                return render(
-                    request,
-                    "obligations/partials/obligation_list.html",
-                    {
-                        "error": f"Error loading obligations: {exc!s}",
-                        "obligations": [],
-                    },
-                )
-
-        # For regular requests, proceed with full view
-        context = self.get_context_data(**kwargs)
-
-        if self.request.htmx:
-            return render(
-                request, "obligations/components/_obligations_summary.html", context
-            )
-
-        return render(
-            request, "obligations/components/_obligations_summary.html", context
-        )
+class ObligationFilterMixin:
+    """Filter and sort parameters shared by the obligation list and export views."""
 
     def _filter_by_status(self, queryset: QuerySet, status_values: list) -> QuerySet:
         """Filter obligations by status, handling 'overdue' as a special case.
@@ -141,23 +81,12 @@ def _filter_by_status(self, queryset: QuerySet, status_values: list) -> QuerySet
             # Remove overdue to handle separately
             standard_statuses = [s for s in status_values if s != "overdue"]
 
-            # Get obligations that match standard statuses
+            # Combine the overdue predicate with any standard statuses in one
+            # WHERE clause so the result stays filterable and sortable
+            condition = overdue_q()
             if standard_statuses:
-                filtered_by_status = queryset.filter(status__in=standard_statuses)
-            else:
-                filtered_by_status = queryset.none()
-
-            # Find overdue obligations
-            overdue_ids = []
-            for obligation in queryset:
-                if is_obligation_overdue(obligation):
-                    overdue_ids.append(obligation.obligation_number)
-
-            if overdue_ids:
-                # Combine with standard status filter
-                overdue_queryset = queryset.filter(obligation_number__in=overdue_ids)
-                return filtered_by_status.union(overdue_queryset)
-            return filtered_by_status
+                condition |= Q(status__in=standard_statuses)
+            return queryset.filter(condition)
 
         # Standard status filtering
         if status_values:
@@ -174,7 +103,7 @@ def apply_filters(self, queryset: QuerySet, filters: dict[str, Any]) -> QuerySet
         Returns:
             Filtered queryset
         """
-        if not queryset:
+        if queryset is None:
             return queryset
 
         # Apply status filter
@@ -185,14 +114,6 @@ def apply_filters(self, queryset: QuerySet, filters: dict[str, Any]) -> QuerySet
         if filters.get("phase"):
             queryset = queryset.filter(project_phase__in=filters["phase"])
 
-        # Apply search filter
-        if filters.get("search"):
-            search_term = filters["search"]
-            queryset = queryset.filter(
-                Q(obligation_number__icontains=search_term)
-                | Q(obligation__icontains=search_term)
-            )
-
         # Apply date filter
         if filters.get("date_filter"):
             date_filter = filters["date_filter"]
@@ -200,9 +121,7 @@ def apply_filters(self, queryset: QuerySet, filters: dict[str, Any]) -> QuerySet
 
             if date_filter == "past_due":
                 # Past due - action_due_date is in the past and status isn't completed
-                queryset = queryset.filter(
-                    action_due_date__lt=today, status__ne="completed"
-                )
+                queryset = queryset.overdue(today)
             elif date_filter == "14days":
                 # Due in next 14 days
                 future_date = today + timedelta(days=14)
@@ -217,6 +136,10 @@ def apply_filters(self, queryset: QuerySet, filters: dict[str, Any]) -> QuerySet
                 )
             # Add more date filters as needed
 
+        # Apply search filter last, within the rows the other filters kept
+        if filters.get("search"):
+            queryset = queryset.search(filters["search"])
+
         return queryset
 
     def get_filters(self) -> dict[str, Any]:
@@ -255,6 +178,76 @@ def get_filters(self) -> dict[str, Any]:
 
         return filters
 
+
+@method_decorator(cache_control(max_age=300), name="dispatch")
+@method_decorator(vary_on_headers("HX-Request"), name="dispatch")
+class ObligationSummaryView(LoginRequiredMixin, ObligationFilterMixin, View):
+    """View for displaying obligation summary with filtering capabilities.
+
+    This view handles both standard requests and HTMX requests for
+    dynamically loading filtered obligations.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """Handle GET requests for obligation summary.
+
+        When accessed via HTMX from procedure charts, this returns filtered obligations.
+        Otherwise, it provides the full obligation summary view.
+
+        Args:
+            request: The HTTP request
+
+        Returns:
+            Rendered template with appropriate context
+        """
+        # Check if this is a filtered request from procedure charts
+        status = request.GET.get("status")
+        procedure = request.GET.get("procedure")
+        project_id = request.GET.get("project_id")
+
+        if status and procedure and project_id:
+            try:
+                # Filter obligations based on parameters
+                obligations = Obligation.objects.filter(project_id=project_id)
+
+                # Apply status filter (handle overdue special case)
+                if status == "overdue":
+                    obligations = obligations.overdue()
+                else:
+                    obligations = obligations.filter(status=status)
+
+                # Apply procedure filter (adjusted for TextField)
+                if procedure:
+                    obligations = obligations.filter(procedure__icontains=procedure)
+
+                return render(
+                    request,
+                    "obligations/partials/obligation_list.html",
+                    {"obligations": obligations},
+                )
+            except Exception as exc:
+                logger.error("Error filtering obligations: %s", str(exc))
+                return render(
+                    request,
+                    "obligations/partials/obligation_list.html",
+                    {
+                        "error": f"Error loading obligations: {exc!s}",
+                        "obligations": [],
+                    },
+                )
+
+        # For regular requests, proceed with full view
+        context = self.get_context_data(**kwargs)
+
+        if self.request.htmx:
+            return render(
+                request, "obligations/components/_obligations_summary.html", context
+            )
+
+        return render(
+            request, "obligations/components/_obligations_summary.html", context
+        )
+
     def get_context_data(self, **kwargs):
         """Get context data for the template.
 
@@ -293,20 +286,15 @@ def get_context_data(self, **kwargs):
                     )
 
                     # Find overdue obligations
-                    overdue_obligations = []
-                    for obligation in queryset:
-                        if is_obligation_overdue(obligation):
-                            overdue_obligations.append(obligation.obligation_number)
-
-                    if overdue_obligations:
-                        queryset = queryset.filter(
-                            obligation_number__in=overdue_obligations
-                        )
+                    queryset = queryset.overdue()
+                    overdue_count = queryset.count()
+
+                    if overdue_count:
                         # Create simple context for displaying just overdue obligations
                         context.update(
                             {
                                 "obligations": queryset,
-                                "total_count": len(queryset),
+                                "total_count": overdue_count,
                                 "filters": {"status": ["overdue"]},
                                 "show_overdue_only": True,
                             }
@@ -343,22 +331,21 @@ def get_context_data(self, **kwargs):
             if filters["order"] == "desc":
                 sort_field = f"-{sort_field}"
 
-            queryset = queryset.order_by(sort_field)
-
-            # Paginate results
-            paginator = Paginator(queryset, 15)
-            page_number = self.request.GET.get("page", 1)
-            page_obj = paginator.get_page(page_number)
+            # Paginate results by cursor, so deep pages avoid an OFFSET scan
+            paginator = KeysetPaginator(queryset, 15, sort=sort_field)
+            page_obj = paginator.page(self.request.GET.get("cursor"))
 
             # Update context
             context.update(
                 {
                     "obligations": page_obj,
                     "page_obj": page_obj,
+                    "page_query": _page_query(self.request),
                     "project": mechanism,
                     "mechanism_id": mechanism_id,
                     "filters": filters,
-                    "total_count": paginator.count,
+                    "total_count": page_obj.count,
+                    "count_is_estimate": page_obj.count_is_estimate,
                 }
             )
 
@@ -387,6 +374,7 @@ def get_context_data(self, **kwargs):
 class TotalOverdueObligationsView(LoginRequiredMixin, View):
     """View to get the count of overdue obligations for a project."""
 
+    @method_decorator(project_conditional())
     def get(self, request, *args, **kwargs):
         """Handle GET request to count overdue obligations.
 
@@ -401,10 +389,7 @@ def get(self, request, *args, **kwargs):
         if not project_id:
             return JsonResponse({"error": "Project ID is required"}, status=400)
 
-        obligations = Obligation.objects.filter(project_id=project_id)
-        overdue_count = sum(
-            1 for obligation in obligations if is_obligation_overdue(obligation)
-        )
+        overdue_count = Obligation.objects.filter(project_id=project_id).overdue().count()
 
         return JsonResponse(overdue_count, safe=False)
 
@@ -561,26 +546,6 @@ def get_context_data(self, **kwargs):
         context["project_id"] = self.object.project_id
         return context
 
-    def _update_mechanism_counts(
-        self, old_mechanism: EnvironmentalMechanism, updated_obligation: Obligation
-    ):
-        """Update obligation counts for mechanisms.
-
-        Args:
-            old_mechanism: Previous mechanism (if any)
-            updated_obligation: The updated obligation
-        """
-        if (
-            old_mechanism
-            and old_mechanism != updated_obligation.primary_environmental_mechanism
-        ):
-            old_mechanism.update_obligation_counts()
-            if updated_obligation.primary_environmental_mechanism:
-                mech = updated_obligation.primary_environmental_mechanism
-                mech.update_obligation_counts()
-        elif updated_obligation.primary_environmental_mechanism:
-            updated_obligation.primary_environmental_mechanism.update_obligation_counts()
-
     def form_valid(self, form):
         """Process the form submission with HTMX support.
 
@@ -591,13 +556,8 @@ def form_valid(self, form):
             Appropriate response based on request type
         """
         try:
-            old_mechanism = None
-            if self.object.primary_environmental_mechanism:
-                old_mechanism = self.object.primary_environmental_mechanism
-
-            # Save the updated obligation
+            # Save the updated obligation; mechanism counters follow via signals
             obligation = form.save()
-            self._update_mechanism_counts(old_mechanism, obligation)
 
             messages.success(
                 self.request,
@@ -653,17 +613,12 @@ def post(self, request, *args, **kwargs):
         try:
             self.object = self.get_object()
             project_id = self.object.project_id
-            mechanism = self.object.primary_environmental_mechanism
             obl_number = kwargs.get("obligation_number")
 
-            # Delete the obligation
+            # Delete the obligation; mechanism counters follow via signals
             self.object.delete()
             logger.info("Obligation %s deleted successfully", obl_number)
 
-            # Update mechanism counts
-            if mechanism:
-                mechanism.update_obligation_counts()
-
             base_url = reverse("dashboard:home")
             return JsonResponse(
                 {
@@ -725,12 +680,82 @@ def get_queryset(self):
 
         return queryset
 
+    def paginate_queryset(self, queryset, page_size):
+        """Paginate by cursor instead of page number and OFFSET."""
+        paginator = KeysetPaginator(queryset, page_size, sort="-action_due_date")
+        page = paginator.page(self.request.GET.get("cursor"))
+        return paginator, page, page.object_list, page.has_other_pages()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["project_id"] = self.request.GET.get("project_id")
+        context["page_query"] = _page_query(self.request)
         return context
 
 
+class ObligationExportView(LoginRequiredMixin, ObligationFilterMixin, View):
+    """Stream the filtered obligations as a CSV or XLSX download.
+
+    Takes the same ``mechanism_id``/``project_id``, filter and sort
+    parameters as the summary and list views, plus ``format``.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """Handle GET requests for an export.
+
+        Args:
+            request: The HTTP request
+
+        Returns:
+            StreamingHttpResponse with the file, or 400 for bad parameters
+        """
+        export_format = request.GET.get("format", "csv").lower()
+        if export_format not in EXPORT_FORMATS:
+            return HttpResponse("Unsupported export format", status=400)
+
+        mechanism_id = request.GET.get("mechanism_id", "")
+        project_id = request.GET.get("project_id", "")
+        if mechanism_id.isdigit():
+            queryset = Obligation.objects.filter(
+                primary_environmental_mechanism=mechanism_id
+            )
+            scope = f"mechanism-{mechanism_id}"
+        elif project_id.isdigit():
+            queryset = Obligation.objects.filter(project_id=project_id)
+            scope = f"project-{project_id}"
+        else:
+            return HttpResponse("A mechanism_id or project_id is required", status=400)
+
+        filters = self.get_filters()
+        queryset = self.apply_filters(queryset, filters)
+
+        # Validate up front: errors raised mid-stream can't become a 400
+        sort_field = filters["sort"]
+        try:
+            Obligation._meta.get_field(sort_field)
+        except FieldDoesNotExist:
+            sort_field = "obligation_number"
+        if filters["order"] == "desc":
+            sort_field = f"-{sort_field}"
+        queryset = queryset.order_by(sort_field, "obligation_number")
+
+        headers = [header for header, _ in EXPORT_COLUMNS]
+        rows = iter_export_rows(queryset)
+        if export_format == "xlsx":
+            content = stream_xlsx(rows, headers)
+        else:
+            content = stream_csv(rows, headers)
+
+        filename = f"obligations-{scope}-{date.today():%Y%m%d}.{export_format}"
+        response = StreamingHttpResponse(
+            content, content_type=EXPORT_FORMATS[export_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        # Let a buffering reverse proxy pass chunks through as they are produced
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
 
 def upload_evidence(request, obligation_id):
     """Handle evidence file uploads for an obligation.
@@ -1,21 +1,23 @@
-"""Module for generating figures and statistics for procedures."""
-import io
+"""Module for generating figures and statistics for procedures.
+
+Figures are built with ``core.utils.charts.new_figure`` and never use
+pyplot, so they are safe to draw from threaded workers.
+"""
 import logging
 from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
-import matplotlib
-import matplotlib.pyplot as plt
 import numpy as np
+from core.utils.charts import figure_to_bytes, new_figure, register_chart, render_chart
 from django.db.models import Count, F, Q, QuerySet, Sum
 from matplotlib.axes import Axes
-from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
 from matplotlib.ticker import MaxNLocator
+from obligations.filters import ObligationFilterSpec
 from obligations.models import Obligation
 from procedures.models import Procedure
 from projects.models import Project
 
-matplotlib.use('Agg')
+from .statistics import procedure_statistics
 
 logger = logging.getLogger(__name__)
 
@@ -41,15 +43,15 @@ def generate_procedure_statistics(
         'edgecolor': '#eeeeee',
     }
 
-    fig, axes = plt.subplots(
-        nrows=2,
-        ncols=1,
-        squeeze=True,
-        figsize=fig_config['figsize'],
-        dpi=fig_config['dpi'],
+    width, height = fig_config['figsize']
+    dpi = fig_config['dpi']
+    fig = new_figure(
+        (width * dpi, height * dpi),
+        dpi=dpi,
         facecolor=fig_config['facecolor'],
         edgecolor=fig_config['edgecolor']
     )
+    axes = fig.subplots(nrows=2, ncols=1, squeeze=True)
     axes_array = cast(np.ndarray, axes)
 
     try:
@@ -58,18 +60,15 @@ def generate_procedure_statistics(
             _plot_procedure_timeline_chart(cast(Axes, axes_array[1]), stats)
         else:
             logger.error("Not enough axes created for plotting charts")
-            plt.close(fig)
             raise ValueError("Failed to create required chart axes")
     except (IndexError, ValueError) as e:
         logger.error("Error plotting procedure charts: %s", str(e))
-        plt.close(fig)
         raise
     except Exception as e:
         logger.error("Unexpected error in chart generation: %s", str(e))
-        plt.close(fig)
         raise
 
-    plt.tight_layout()
+    fig.tight_layout()
     return fig, stats
 
 
@@ -127,29 +126,23 @@ def _plot_procedure_timeline_chart(ax: Axes, stats: Dict[str, Any]) -> None:
 
 def get_procedure_charts(
     mechanism_id: Union[str, int],
-    filtered_ids: Optional[List[int]] = None
+    filters: Optional[ObligationFilterSpec] = None
 ) -> Dict[str, Figure]:
-    """Generate charts for procedures related to an environmental mechanism."""
+    """Generate charts for procedures related to an environmental mechanism.
+
+    Filters are compiled into the grouped statistics query rather than
+    applied to a materialized list of obligations.
+    """
     procedure_charts: Dict[str, Figure] = {}
 
     try:
-        query = Obligation.objects.filter(
-            primary_environmental_mechanism_id=mechanism_id
-        )
-
-        if filtered_ids is not None:
-            query = query.filter(id__in=filtered_ids)
-
-        proc_names = query.values_list('procedure', flat=True).distinct().order_by(
-            'procedure'
-        )
-
-        for proc_name in proc_names:
+        # Every procedure's counts come from one grouped query
+        for stats in procedure_statistics(mechanism_id, filters):
+            proc_name = stats['name']
             if not proc_name:
                 continue
 
-            proc_obligations = query.filter(procedure=proc_name)
-            status_counts = _get_status_counts(proc_obligations)
+            status_counts = _get_status_counts(stats)
 
             if sum(status_counts.values()) > 0:
                 fig = _create_pie_chart(proc_name, status_counts)
@@ -166,18 +159,19 @@ def get_procedure_charts(
     return procedure_charts
 
 
-def _get_status_counts(obligations: QuerySet) -> Dict[str, int]:
-    """Get counts of obligations by status."""
+def _get_status_counts(stats: Dict[str, Any]) -> Dict[str, int]:
+    """Get counts of obligations by status from a procedure's statistics."""
     return {
-        'Not Started': obligations.filter(status='not started').count(),
-        'In Progress': obligations.filter(status='in progress').count(),
-        'Completed': obligations.filter(status='completed').count()
+        'Not Started': stats['not_started'],
+        'In Progress': stats['in_progress'],
+        'Completed': stats['completed'],
     }
 
 
 def _create_pie_chart(title: str, status_counts: Dict[str, int]) -> Figure:
     """Create a pie chart for procedure status distribution."""
-    fig, ax = plt.subplots(figsize=(6, 5))
+    fig = new_figure((600, 500))
+    ax = fig.add_subplot(1, 1, 1)
 
     labels = list(status_counts.keys())
     sizes = list(status_counts.values())
@@ -200,7 +194,8 @@ def _create_pie_chart(title: str, status_counts: Dict[str, int]) -> Figure:
 
 def _create_empty_chart(title: str) -> Figure:
     """Create an empty chart with a message."""
-    fig, ax = plt.subplots(figsize=(6, 5))
+    fig = new_figure((600, 500))
+    ax = fig.add_subplot(1, 1, 1)
     ax.text(
         0.5, 0.5,
         "No obligations found",
@@ -215,7 +210,8 @@ def _create_empty_chart(title: str) -> Figure:
 
 def _create_error_chart(error_message: str) -> Figure:
     """Create an error chart with the error message."""
-    fig, ax = plt.subplots(figsize=(6, 5))
+    fig = new_figure((600, 500))
+    ax = fig.add_subplot(1, 1, 1)
     ax.text(
         0.5, 0.5,
         f"Error generating charts: {error_message}",
@@ -231,28 +227,23 @@ def _create_error_chart(error_message: str) -> Figure:
 def get_all_procedure_charts() -> Dict[str, bytes]:
     """Generate all procedure charts and return them as a dictionary.
 
+    Each chart is drawn by the shared rendering service, so unchanged data
+    is served from its cache.
+
     Returns:
         Dict[str, bytes]: Dictionary mapping chart names to PNG image data.
     """
-    # Initialize dictionary to store charts
-    charts = {}
-
-    # Get procedure status distribution chart
-    status_chart = get_procedure_status_chart()
-    charts['status_distribution'] = chart_to_png(status_chart)
-
-    # Get procedure timeline chart
-    timeline_chart = get_procedure_timeline()
-    charts['timeline'] = chart_to_png(timeline_chart)
-
-    # Get procedure completion rate chart
-    completion_chart = get_completion_rate_chart()
-    charts['completion_rate'] = chart_to_png(completion_chart)
-
-    # Clean up
-    plt.close('all')
-
-    return charts
+    return {
+        'status_distribution': render_chart(
+            'procedures.status', _procedure_status_data(), (800, 600)
+        ),
+        'timeline': render_chart(
+            'procedures.timeline', _procedure_timeline_data(), (1000, 600)
+        ),
+        'completion_rate': render_chart(
+            'procedures.completion_rate', _completion_rate_data(), (800, 600)
+        ),
+    }
 
 
 def chart_to_png(fig: Figure) -> bytes:
@@ -264,82 +255,101 @@ def chart_to_png(fig: Figure) -> bytes:
     Returns:
         bytes: PNG image data
     """
-    buf = io.BytesIO()
-    canvas = FigureCanvasAgg(fig)
-    canvas.print_png(buf)
-    return buf.getvalue()
-
+    return figure_to_bytes(fig, 'png')
 
-def get_procedure_status_chart() -> Figure:
-    """Generate a pie chart showing distribution of procedure statuses.
 
-    Returns:
-        Figure: Matplotlib figure containing the chart
-    """
-    # Get status counts
+def _procedure_status_data() -> Dict[str, List[Any]]:
+    """Count procedures by status."""
     status_counts = (Procedure.objects.values('status')
                      .annotate(count=Count('id'))
                      .order_by('status'))
+    return {
+        'statuses': [s['status'] for s in status_counts],
+        'counts': [s['count'] for s in status_counts],
+    }
 
-    # Extract data
-    statuses = [s['status'] for s in status_counts]
-    counts = [s['count'] for s in status_counts]
 
-    # Create figure
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.pie(counts, labels=statuses, autopct='%1.1f%%')
+@register_chart('procedures.status')
+def _build_procedure_status_chart(
+    data: Dict[str, List[Any]], fig_size: Tuple[int, int]
+) -> Figure:
+    fig = new_figure(fig_size)
+    ax = fig.add_subplot(1, 1, 1)
+    ax.pie(data['counts'], labels=data['statuses'], autopct='%1.1f%%')
     ax.set_title('Procedure Status Distribution')
-
     return fig
 
 
-def get_procedure_timeline() -> Figure:
-    """Generate a timeline chart showing procedures over time.
+def get_procedure_status_chart() -> Figure:
+    """Generate a pie chart showing distribution of procedure statuses.
 
     Returns:
         Figure: Matplotlib figure containing the chart
     """
-    # Get procedures ordered by start date
+    return _build_procedure_status_chart(_procedure_status_data(), (800, 600))
+
+
+def _procedure_timeline_data() -> Dict[str, List[Any]]:
+    """Collect each procedure's start date and duration, in start order."""
     procedures = (Procedure.objects.all()
                   .order_by('start_date')
                   .values('start_date', 'end_date', 'title'))
+    return {
+        'titles': [p['title'] for p in procedures],
+        'start_dates': [p['start_date'] for p in procedures],
+        'durations': [(p['end_date'] - p['start_date']).days for p in procedures],
+    }
 
-    # Extract data
-    titles = [p['title'] for p in procedures]
-    start_dates = [p['start_date'] for p in procedures]
-    durations = [(p['end_date'] - p['start_date']).days for p in procedures]
 
-    # Create figure
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.barh(titles, durations, left=start_dates)
+@register_chart('procedures.timeline')
+def _build_procedure_timeline(
+    data: Dict[str, List[Any]], fig_size: Tuple[int, int]
+) -> Figure:
+    fig = new_figure(fig_size)
+    ax = fig.add_subplot(1, 1, 1)
+    ax.barh(data['titles'], data['durations'], left=data['start_dates'])
     ax.set_title('Procedure Timeline')
-
     return fig
 
 
-def get_completion_rate_chart() -> Figure:
-    """Generate a bar chart showing procedure completion rates.
+def get_procedure_timeline() -> Figure:
+    """Generate a timeline chart showing procedures over time.
 
     Returns:
         Figure: Matplotlib figure containing the chart
     """
-    # Get completed vs total procedures by type
+    return _build_procedure_timeline(_procedure_timeline_data(), (1000, 600))
+
+
+def _completion_rate_data() -> Dict[str, List[Any]]:
+    """Compute the percentage of completed procedures by type."""
     procedures = (Procedure.objects.values('type')
                   .annotate(total=Count('id'),
                             completed=Count('id', filter=Q(status='completed')))
                   .order_by('type'))
+    return {
+        'types': [p['type'] for p in procedures],
+        'rates': [p['completed'] / p['total'] * 100 for p in procedures],
+    }
 
-    # Extract data
-    types = [p['type'] for p in procedures]
-    totals = [p['total'] for p in procedures]
-    completed = [p['completed'] for p in procedures]
-    completion_rates = [c / t * 100 for c, t in zip(completed, totals)]
 
-    # Create figure
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.bar(types, completion_rates)
+@register_chart('procedures.completion_rate')
+def _build_completion_rate_chart(
+    data: Dict[str, List[Any]], fig_size: Tuple[int, int]
+) -> Figure:
+    fig = new_figure(fig_size)
+    ax = fig.add_subplot(1, 1, 1)
+    ax.bar(data['types'], data['rates'])
     ax.set_title('Procedure Completion Rates by Type')
     ax.set_ylabel('Completion Rate (%)')
     ax.set_ylim(0, 100)
-
     return fig
+
+
+def get_completion_rate_chart() -> Figure:
+    """Generate a bar chart showing procedure completion rates.
+
+    Returns:
+        Figure: Matplotlib figure containing the chart
+    """
+    return _build_completion_rate_chart(_completion_rate_data(), (800, 600))
@@ -0,0 +1,75 @@
+"""
+Per-procedure obligation status counts for a mechanism.
+
+Procedure charts and tables need, for each procedure of a mechanism, how
+many obligations are not started, in progress, completed and overdue.
+``procedure_statistics`` returns all of them from a single ``GROUP BY
+procedure`` query with conditional ``Count`` aggregates, however many
+procedures the mechanism has and whatever ``ObligationFilterSpec`` applies.
+"""
+
+from datetime import date
+from typing import Any, Dict, List, Optional, Union
+
+from django.db.models import Count, Q
+from obligations.constants import (
+    STATUS_COMPLETED,
+    STATUS_IN_PROGRESS,
+    STATUS_NOT_STARTED,
+)
+from obligations.filters import ObligationFilterSpec
+from obligations.models import Obligation
+from obligations.utils import overdue_q
+
+# Count key for each stored status, in chart order
+STATUS_KEYS: Dict[str, str] = {
+    STATUS_NOT_STARTED: "not_started",
+    STATUS_IN_PROGRESS: "in_progress",
+    STATUS_COMPLETED: "completed",
+}
+OVERDUE_KEY = "overdue"
+
+
+def procedure_statistics(
+    mechanism_id: Union[str, int],
+    filters: Optional[ObligationFilterSpec] = None,
+    reference_date: Optional[date] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Count a mechanism's obligations by status, per procedure, in one query.
+
+    Args:
+        mechanism_id: Environmental mechanism primary key
+        filters: Filters on the obligations counted, applied in the same query
+        reference_date: Date to evaluate overdue against (defaults to today)
+
+    Returns:
+        List[Dict[str, Any]]: One row per procedure, ordered by name, with
+        ``name``, ``not_started``, ``in_progress``, ``completed``,
+        ``overdue`` and ``total`` (the three stored statuses; overdue
+        obligations are also counted under their status)
+    """
+    obligations = Obligation.objects.filter(
+        primary_environmental_mechanism_id=mechanism_id
+    )
+    if filters:
+        obligations = filters.apply(obligations)
+    rows = (
+        obligations.order_by()
+        .values("procedure")
+        .annotate(
+            **{
+                key: Count("pk", filter=Q(status=status))
+                for status, key in STATUS_KEYS.items()
+            },
+            **{OVERDUE_KEY: Count("pk", filter=overdue_q(reference_date))},
+        )
+        .order_by("procedure")
+    )
+
+    statistics = []
+    for row in rows:
+        row["name"] = row.pop("procedure")
+        row["total"] = sum(row[key] for key in STATUS_KEYS.values())
+        statistics.append(row)
+    return statistics
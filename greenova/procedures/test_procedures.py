@@ -1,2 +1,135 @@
 # Copyright 2025 Enveng Group.
 # SPDX-License-Identifier: 	AGPL-3.0-or-later
+"""Tests for the procedures app."""
+
+import json
+from datetime import timedelta
+
+import pytest
+from core.utils.charts import render_cache
+from django.http import Http404
+from django.utils import timezone
+from mechanisms.models import EnvironmentalMechanism
+from obligations.filters import ObligationFilterSpec
+from obligations.models import Obligation
+from procedures.statistics import procedure_statistics
+from procedures.views import procedure_chart_data_json
+from responsibility.views import responsibility_chart_json
+from projects.models import Project
+
+
+@pytest.mark.django_db
+class TestProcedureStatistics:
+    """Test per-procedure status counts."""
+
+    @staticmethod
+    def test_counts_every_procedure_in_one_query(django_assert_num_queries) -> None:
+        """Test all procedures are counted by status with a single query."""
+        project = Project.objects.create(name="Test Project")
+        mechanism = EnvironmentalMechanism.objects.create(
+            name="Test Mechanism", project=project
+        )
+        other = EnvironmentalMechanism.objects.create(
+            name="Other Mechanism", project=project
+        )
+        overdue_date = timezone.now().date() - timedelta(days=1)
+        rows = [
+            ("Air", "not started", overdue_date, mechanism),
+            ("Air", "completed", overdue_date, mechanism),
+            ("Air", "in progress", None, mechanism),
+            ("Water", "in progress", overdue_date, mechanism),
+            ("Water", "not started", None, other),
+        ]
+        for number, (procedure, status, due, owner) in enumerate(rows):
+            Obligation.objects.create(
+                obligation_number=f"PCEMP-{number:03d}",
+                project=project,
+                primary_environmental_mechanism=owner,
+                procedure=procedure,
+                status=status,
+                action_due_date=due,
+            )
+
+        with django_assert_num_queries(1):
+            statistics = procedure_statistics(mechanism.id)
+        assert statistics == [
+            {
+                "name": "Air", "not_started": 1, "in_progress": 1,
+                "completed": 1, "overdue": 1, "total": 3,
+            },
+            {
+                "name": "Water", "not_started": 0, "in_progress": 1,
+                "completed": 0, "overdue": 1, "total": 1,
+            },
+        ]
+
+        # Filters are compiled into the same single query
+        for filters, expected in [
+            (ObligationFilterSpec(status="in progress"), [("Air", 1), ("Water", 1)]),
+            (
+                ObligationFilterSpec.from_params({"overdue": "true"}),
+                [("Air", 1), ("Water", 1)],
+            ),
+            (ObligationFilterSpec(phase="Operation"), []),
+        ]:
+            with django_assert_num_queries(1):
+                statistics = procedure_statistics(mechanism.id, filters)
+            assert [(row["name"], row["total"]) for row in statistics] == expected
+
+
+@pytest.mark.django_db
+class TestChartDataEndpoints:
+    """Test the chart data JSON endpoints and their image export fallback."""
+
+    @staticmethod
+    def test_procedure_and_responsibility_charts(rf, django_user_model) -> None:
+        """Test charts are served as specs, and as a cached image on request."""
+        user = django_user_model(username="charts")
+        project = Project.objects.create(name="Test Project")
+        mechanism = EnvironmentalMechanism.objects.create(
+            name="Test Mechanism", project=project
+        )
+        for number, (procedure, responsibility) in enumerate(
+            [("Air", "Site Manager"), ("Air", "Site Manager"), ("Water", "Ecologist")]
+        ):
+            Obligation.objects.create(
+                obligation_number=f"PCEMP-{number:03d}",
+                project=project,
+                primary_environmental_mechanism=mechanism,
+                procedure=procedure,
+                responsibility=responsibility,
+                status="not started",
+            )
+
+        def get(view, **params):
+            request = rf.get("/", params)
+            request.user = user
+            return view(request, mechanism_id=mechanism.id)
+
+        response = get(procedure_chart_data_json)
+        assert response["Content-Type"] == "application/json"
+        charts = json.loads(response.content)
+        assert [(chart["id"], chart["type"]) for chart in charts] == [
+            ("Air", "pie"),
+            ("Water", "pie"),
+        ]
+        assert charts[0]["data"] == [2, 0, 0, 0]
+        assert len(charts[0]["colors"]) == len(charts[0]["labels"])
+
+        charts = json.loads(get(responsibility_chart_json, status="completed").content)
+        assert charts[0]["type"] == "bar"
+        assert charts[0]["data"] == []
+
+        render_cache.clear()
+        response = get(procedure_chart_data_json, format="png", chart="Water")
+        assert response["Content-Type"] == "image/png"
+        assert response.content.startswith(b"\x89PNG")
+        # The export is rendered once and then served from the cache
+        assert len(render_cache) == 1
+        assert get(procedure_chart_data_json, format="png", chart="Water").content == (
+            response.content
+        )
+
+        assert get(procedure_chart_data_json, format="gif").status_code == 400
+        with pytest.raises(Http404):
+            get(procedure_chart_data_json, format="svg", chart="Soil")
@@ -10,6 +10,11 @@
         views.ProcedureChartsView.as_view(),
         name="procedure_charts",
     ),
+    path(
+        "charts/<int:mechanism_id>/data/",
+        views.procedure_chart_data_json,
+        name="procedure_charts_json",
+    ),
     path("charts/", views.ProcedureChartsView.as_view(), name="procedure_charts"),
     path("charts/", views.ProcedureChartsView.as_view(), name="procedure_charts_query"),
     path("", views.ProcedureListView.as_view(), name="procedure_list"),
@@ -1,27 +1,24 @@
-import base64
-import io
 import logging
-from datetime import timedelta
 from typing import Any
 
-import matplotlib
+from core.utils.charts import chart_response, chart_spec
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_control
 from django.views.decorators.vary import vary_on_headers
 from django.views.generic import ListView, TemplateView
+from mechanisms.chart_data import STATUS_COLORS, STATUS_LABELS
 from mechanisms.models import EnvironmentalMechanism
+from obligations.filters import ObligationFilterSpec
 from obligations.models import Obligation
-from responsibility.figures import get_responsibility_chart
 from django.utils.safestring import mark_safe
 import json
-from .figures import get_procedure_charts as get_all_procedure_charts
 from .models import Procedure
+from .statistics import OVERDUE_KEY, STATUS_KEYS, procedure_statistics
 from django.template.loader import render_to_string
 
-matplotlib.use("Agg")  # Use Agg backend for non-interactive plotting
 logger = logging.getLogger(__name__)
 
 
@@ -48,56 +45,17 @@ def _get_mechanism_and_obligations(self, mechanism_id):
 
     def _apply_filters(self, obligations, request_params):
         """Apply filters to obligations based on request parameters."""
-        filtered_obligations = obligations
-        phase_filter = request_params.get("phase", "")
-        responsibility_filter = request_params.get("responsibility", "")
-        status_filter = request_params.get("status", "")
-        look_ahead = request_params.get("lookahead", "") == "14days"
-        overdue_only = request_params.get("overdue", "") == "true"
-
-        if phase_filter:
-            filtered_obligations = filtered_obligations.filter(
-                project_phase=phase_filter
-            )
-
-        if responsibility_filter:
-            filtered_obligations = filtered_obligations.filter(
-                responsibility=responsibility_filter
-            )
-
-        if status_filter:
-            filtered_obligations = filtered_obligations.filter(status=status_filter)
-
-        if look_ahead:
-            today = timezone.now().date()
-            future_date = today + timedelta(days=14)
-            filtered_obligations = filtered_obligations.filter(
-                action_due_date__gte=today, action_due_date__lte=future_date
-            )
-
-        if overdue_only:
-            today = timezone.now().date()
-            filtered_obligations = filtered_obligations.filter(
-                action_due_date__lt=today
-            ).exclude(status="completed")
-
-        filters_applied = any(
-            [
-                phase_filter,
-                responsibility_filter,
-                status_filter,
-                look_ahead,
-                overdue_only,
-            ]
-        )
+        filters = ObligationFilterSpec.from_params(request_params)
+        filtered_obligations = filters.apply(obligations)
 
         filter_params = {
-            "phase_filter": phase_filter,
-            "responsibility_filter": responsibility_filter,
-            "status_filter": status_filter,
-            "look_ahead": look_ahead,
-            "overdue_only": overdue_only,
-            "filters_applied": filters_applied,
+            "filters": filters,
+            "phase_filter": filters.phase,
+            "responsibility_filter": filters.responsibility,
+            "status_filter": filters.status,
+            "look_ahead": filters.due_within_days is not None,
+            "overdue_only": filters.overdue_only,
+            "filters_applied": bool(filters),
         }
 
         return filtered_obligations, filter_params
@@ -146,86 +104,21 @@ def _get_available_filters(self, all_obligations):
             "status_options": status_options,
         }
 
-    def _generate_responsibility_chart(
-        self, mechanism_id, filtered_obligations=None, filters_applied=False
-    ):
-        """Generate responsibility chart based on filtered obligations."""
-        if filters_applied and filtered_obligations is not None:
-            filtered_ids = filtered_obligations.values_list("id", flat=True)
-            fig = get_responsibility_chart(mechanism_id, filtered_ids=filtered_ids)
-        else:
-            fig = get_responsibility_chart(mechanism_id)
-
-        buf = io.BytesIO()
-        fig.savefig(buf, format="png", bbox_inches="tight")
-        buf.seek(0)
-
-        base64_data = base64.b64encode(buf.getvalue()).decode()
-        img_tag = (
-            f'<img src="data:image/png;base64,{base64_data}" '
-            f'alt="Responsibility Distribution Chart" '
-            f'width="600" height="300">'
-        )
-
-        return img_tag
-
-    def _generate_procedure_charts(
-        self, mechanism_id, filtered_obligations, all_obligations, filters_applied
-    ):
-
-        # Get filtered IDs if filters are applied
-        procedure_charts = []
-        filtered_ids = None
-        if filters_applied:
-            filtered_ids = filtered_obligations.values_list("id", flat=True)
-
-        # Get distinct procedure names from obligations (filtered or all)
-        obligations_to_use = filtered_obligations if filters_applied else all_obligations
-        procedure_names = (
-            obligations_to_use.order_by("procedure")
-            .values_list("procedure", flat=True)
-            .distinct()
-            )
-        for procedure_name in procedure_names:
-            procedure_data = self._create_procedure_chart_data(procedure_name, obligations_to_use)
-            procedure_charts.append(procedure_data)
-
-        return procedure_charts
-
-    def _create_procedure_chart_data(
-        self,
-        procedure_name,
-        obligations,
-        # Removed unused argument 'filters_applied'
-    ):
-
-        # Get obligations for this procedure
-        proc_obligations = obligations.filter(procedure=procedure_name)
-        now = timezone.now().date()
-        # Count status types
-        status_counts = {
-            "not_started": sum(1 for o in proc_obligations if o.status == "not started"),
-            "in_progress": sum(1 for o in proc_obligations if o.status == "in progress"),
-            "completed": sum(1 for o in proc_obligations if o.status == "completed"),
-            "overdue": sum(1 for o in proc_obligations if o.is_overdue),
-        }
-        status_counts["total"] = (
-            status_counts["not_started"]
-            + status_counts["in_progress"]
-            + status_counts["completed"]
-        )
-        labels_list = ["Not Started", "In Progress", "Completed", "Overdue"]
-        data_list = [
-            status_counts["not_started"],
-            status_counts["in_progress"],
-            status_counts["completed"],
-            status_counts["overdue"],
+    def _generate_procedure_charts(self, mechanism_id, filters=None):
+        """Build chart data for every procedure from one grouped query."""
+        return [
+            self._create_procedure_chart_data(stats)
+            for stats in procedure_statistics(mechanism_id, filters)
         ]
+
+    def _create_procedure_chart_data(self, stats):
+        """Shape one procedure's status counts for the chart template."""
+        spec = procedure_chart_spec(stats)
         return {
-            "name": procedure_name,
-            "stats": status_counts,
-            "labels": json.dumps(labels_list),
-            "data": json.dumps(data_list),
+            "name": stats["name"],
+            "stats": {key: value for key, value in stats.items() if key != "name"},
+            "labels": json.dumps(spec["labels"]),
+            "data": json.dumps(spec["data"]),
         }
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
@@ -249,7 +142,7 @@ def get_context_data(self, **kwargs) -> dict[str, Any]:
             context["mechanism"] = mechanism
 
             # Apply filters from request
-            filtered_obligations, filter_params = self._apply_filters(
+            _, filter_params = self._apply_filters(
                 all_obligations, self.request.GET
             )
 
@@ -279,18 +172,10 @@ def get_context_data(self, **kwargs) -> dict[str, Any]:
                 }
             )
 
-            # Generate responsibility chart
-            responsibility_chart_img = self._generate_responsibility_chart(
-                mechanism_id, filtered_obligations, filter_params["filters_applied"]
-            )
-            context["responsibility_chart"] = responsibility_chart_img
-
+            # Drawn in the browser from responsibility:responsibility_chart_json
             # Generate procedure charts
             procedure_charts = self._generate_procedure_charts(
-                mechanism_id,
-                filtered_obligations,
-                all_obligations,
-                filter_params["filters_applied"],
+                mechanism_id, filter_params["filters"]
             )
             context["procedure_charts"] = procedure_charts
             context["procedure_charts_json"] = mark_safe(json.dumps(procedure_charts))
@@ -319,6 +204,34 @@ def get_context_data(self, **kwargs) -> dict[str, Any]:
         return context
 
 
+def procedure_chart_spec(stats):
+    """Describe one procedure's status counts as a pie chart spec."""
+    return chart_spec(
+        stats["name"],
+        stats["name"],
+        STATUS_LABELS,
+        [stats[key] for key in (*STATUS_KEYS.values(), OVERDUE_KEY)],
+        colors=STATUS_COLORS,
+    )
+
+
+@login_required
+def procedure_chart_data_json(request, mechanism_id):
+    """Procedure status charts of a mechanism, in the chart data schema.
+
+    Accepts the same filter parameters as ``ProcedureChartsView``.
+    """
+    get_object_or_404(EnvironmentalMechanism, id=mechanism_id)
+    filters = ObligationFilterSpec.from_params(request.GET)
+    return chart_response(
+        request,
+        [
+            procedure_chart_spec(stats)
+            for stats in procedure_statistics(mechanism_id, filters)
+        ],
+    )
+
+
 class ProcedureListView(LoginRequiredMixin, ListView):
     """List all procedures."""
 
@@ -16,6 +16,7 @@
 from django.views.decorators.vary import vary_on_headers
 from django.views.generic import ListView, TemplateView
 from django_htmx.http import HttpResponseClientRedirect, trigger_client_event
+from obligations.conditional import project_conditional, project_id_from_url
 from obligations.models import Obligation
 
 from .models import Project
@@ -88,6 +89,7 @@ def get_queryset(self):
         return Project.objects.filter(members=self.request.user)
 
 
+@project_conditional(project_id_from_url)
 def project_obligations(_request: HttpRequest, project_id: str) -> JsonResponse:
     """Retrieve obligations associated with a specific project."""
     project = get_object_or_404(Project, id=project_id)
@@ -1,10 +1,16 @@
+from __future__ import annotations
+
 import logging
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
+from core.utils.charts import new_figure
 from django.db.models import Count
-from matplotlib.figure import Figure
+from obligations.filters import ObligationFilterSpec
 from obligations.models import Obligation
 
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
 logger = logging.getLogger(__name__)
 
 def generate_responsibility_chart(responsibility_counts: Dict[str, int], fig_width: int = 600, fig_height: int = 300) -> Figure:
@@ -25,7 +31,7 @@ def generate_responsibility_chart(responsibility_counts: Dict[str, int], fig_wid
         counts = list(responsibility_counts.values())
 
         # Create figure with appropriate size
-        fig = Figure(figsize=(fig_width / 100, fig_height / 100), dpi=100)
+        fig = new_figure((fig_width, fig_height))
         ax = fig.add_subplot(111)
 
         # Only plot if we have data
@@ -56,14 +62,35 @@ def generate_responsibility_chart(responsibility_counts: Dict[str, int], fig_wid
     except Exception as e:
         logger.error(f'Error generating responsibility chart: {str(e)}')
         # Return a simple error figure
-        fig = Figure(figsize=(fig_width / 100, fig_height / 100), dpi=100)
+        fig = new_figure((fig_width, fig_height))
         ax = fig.add_subplot(111)
         ax.text(0.5, 0.5, f'Error: {str(e)}', horizontalalignment='center', verticalalignment='center')
         return fig
 
 
+def get_responsibility_counts(mechanism_id: int, filters: Optional[ObligationFilterSpec] = None) -> Dict[str, int]:
+    """
+    Count a mechanism's obligations by responsibility, largest first.
+
+    Args:
+        mechanism_id: ID of the environmental mechanism to filter by
+        filters: Optional filters, applied in the same aggregate query
+
+    Returns:
+        Dictionary mapping responsibility names to counts
+    """
+    obligations = Obligation.objects.filter(primary_environmental_mechanism_id=mechanism_id)
+    if filters:
+        obligations = filters.apply(obligations)
+
+    responsibility_data = obligations.values('responsibility').annotate(
+        count=Count('obligation_number')
+    ).order_by('-count')
+    return {item['responsibility']: item['count'] for item in responsibility_data}
+
+
 # Keep the original function with correct implementation
-def get_responsibility_chart(mechanism_id: int, fig_width: int = 600, fig_height: int = 300, filtered_ids: Optional[List[int]] = None) -> Figure:
+def get_responsibility_chart(mechanism_id: int, fig_width: int = 600, fig_height: int = 300, filters: Optional[ObligationFilterSpec] = None) -> Figure:
     """
     Generate a horizontal bar chart showing obligation counts by responsibility.
 
@@ -71,30 +98,21 @@ def get_responsibility_chart(mechanism_id: int, fig_width: int = 600, fig_height
         mechanism_id: ID of the environmental mechanism to filter by
         fig_width: Width of figure in pixels
         fig_height: Height of figure in pixels
-        filtered_ids: Optional list of obligation IDs to filter by
+        filters: Optional filters, applied in the same aggregate query
 
     Returns:
         A matplotlib Figure with the horizontal bar chart
     """
     try:
-        # Get obligations for this mechanism
-        obligations = Obligation.objects.filter(primary_environmental_mechanism_id=mechanism_id)
-
-        # Apply additional filtering if provided
-        if filtered_ids is not None:
-            obligations = obligations.filter(id__in=filtered_ids)
-
-        # Count obligations by responsibility using the ORM
-        responsibility_data = obligations.values('responsibility').annotate(
-            count=Count('obligation_number')
-        ).order_by('-count')
+        # Count obligations by responsibility in one filtered query
+        responsibility_counts = get_responsibility_counts(mechanism_id, filters)
 
         # Extract responsibility labels and counts
-        labels = [item['responsibility'] for item in responsibility_data]
-        counts = [item['count'] for item in responsibility_data]
+        labels = list(responsibility_counts.keys())
+        counts = list(responsibility_counts.values())
 
         # Create figure with appropriate size
-        fig = Figure(figsize=(fig_width / 100, fig_height / 100), dpi=100)
+        fig = new_figure((fig_width, fig_height))
         ax = fig.add_subplot(111)
 
         # Only plot if we have data
@@ -125,7 +143,7 @@ def get_responsibility_chart(mechanism_id: int, fig_width: int = 600, fig_height
     except Exception as e:
         logger.error(f'Error generating responsibility chart: {str(e)}')
         # Return a simple error figure
-        fig = Figure(figsize=(fig_width / 100, fig_height / 100), dpi=100)
+        fig = new_figure((fig_width, fig_height))
         ax = fig.add_subplot(111)
         ax.text(0.5, 0.5, f'Error: {str(e)}', horizontalalignment='center', verticalalignment='center')
         return fig
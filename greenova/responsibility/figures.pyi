@@ -1,14 +1,18 @@
 # Stub file for responsibility.figures
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 
 from matplotlib.figure import Figure
+from obligations.filters import ObligationFilterSpec
 
 def generate_responsibility_chart(
     responsibility_counts: Dict[str, int], fig_width: int = ..., fig_height: int = ...
 ) -> Figure: ...
+def get_responsibility_counts(
+    mechanism_id: int, filters: Optional[ObligationFilterSpec] = None
+) -> Dict[str, int]: ...
 def get_responsibility_chart(
     mechanism_id: int,
     fig_width: int = ...,
     fig_height: int = ...,
-    filtered_ids: Optional[List[int]] = None,
+    filters: Optional[ObligationFilterSpec] = None,
 ) -> Figure: ...
@@ -9,4 +9,9 @@
     path('', views.responsibility_home, name='home'),
     path('assignments/', views.assignment_list, name='assignment_list'),
     path('roles/', views.role_list, name='role_list'),
+    path(
+        'charts/<int:mechanism_id>/',
+        views.responsibility_chart_json,
+        name='responsibility_chart_json',
+    ),
 ]
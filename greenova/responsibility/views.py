@@ -1,6 +1,10 @@
+from core.utils.charts import BAR_COLOR, chart_response, chart_spec
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
+from mechanisms.models import EnvironmentalMechanism
+from obligations.filters import ObligationFilterSpec
 
+from .figures import get_responsibility_counts
 from .models import Responsibility, ResponsibilityAssignment
 
 
@@ -49,3 +53,21 @@ def role_list(request):
     }
 
     return render(request, 'responsibility/role_list.html', context)
+
+
+@login_required
+def responsibility_chart_json(request, mechanism_id):
+    """Obligations by responsibility for a mechanism, in the chart data schema."""
+    get_object_or_404(EnvironmentalMechanism, id=mechanism_id)
+    filters = ObligationFilterSpec.from_params(request.GET)
+    counts = get_responsibility_counts(mechanism_id, filters)
+
+    chart = chart_spec(
+        'responsibility',
+        'Obligations by Responsibility',
+        list(counts.keys()),
+        list(counts.values()),
+        chart_type='bar',
+        colors=[BAR_COLOR],
+    )
+    return chart_response(request, [chart])
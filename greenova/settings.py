@@ -257,7 +257,6 @@ def validate_settings() -> None:
     "corsheaders",
     "django_htmx",
     "django_hyperscript",
-    "django_matplotlib",
     "django_pdb",
     "template_partials",
     "tailwind",
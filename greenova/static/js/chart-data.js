@@ -0,0 +1,63 @@
+/* eslint-env browser */
+/* global document, fetch, Chart */
+/**
+ * Client-side charts from the chart data JSON endpoints
+ *
+ * Every <canvas data-chart-url="..."> is drawn with Chart.js from the spec
+ * list the URL returns ({id, name, type, labels, data, colors}). When the
+ * endpoint returns several charts, data-chart-id picks one (default: first).
+ */
+(() => {
+  const charts = new Map()
+
+  function chartConfig (spec) {
+    const bar = spec.type === 'bar'
+    const colors = spec.colors && spec.colors.length ? spec.colors : undefined
+    return {
+      type: spec.type,
+      data: {
+        labels: spec.labels,
+        datasets: [{
+          label: spec.name,
+          data: spec.data,
+          backgroundColor: bar && colors ? colors[0] : colors,
+          borderWidth: 1
+        }]
+      },
+      options: {
+        responsive: true,
+        indexAxis: bar ? 'y' : 'x',
+        plugins: {
+          legend: { display: !bar, position: 'bottom' },
+          title: { display: Boolean(spec.name), text: spec.name }
+        }
+      }
+    }
+  }
+
+  async function drawCanvas (canvas) {
+    try {
+      const response = await fetch(canvas.dataset.chartUrl, {
+        credentials: 'same-origin'
+      })
+      if (!response.ok) throw new Error(`HTTP ${response.status}`)
+      const specs = await response.json()
+      const wanted = canvas.dataset.chartId
+      const spec = specs.find(item => !wanted || String(item.id) === wanted)
+      if (!spec) return
+
+      if (charts.has(canvas)) charts.get(canvas).destroy()
+      charts.set(canvas, new Chart(canvas.getContext('2d'), chartConfig(spec)))
+    } catch (error) {
+      console.error('Failed to load chart data:', canvas.dataset.chartUrl, error)
+    }
+  }
+
+  function drawCharts (root) {
+    if (typeof Chart === 'undefined') return
+    root.querySelectorAll('canvas[data-chart-url]').forEach(drawCanvas)
+  }
+
+  document.addEventListener('DOMContentLoaded', () => drawCharts(document))
+  document.addEventListener('htmx:afterSwap', event => drawCharts(event.detail.target))
+})()
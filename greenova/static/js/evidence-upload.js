@@ -0,0 +1,161 @@
+/* eslint-env browser */
+/* global document, fetch, crypto, localStorage, setTimeout */
+/**
+ * Chunked, resumable evidence uploads
+ *
+ * A <input type="file" data-upload-url="..." data-obligation-number="...">
+ * sends each chosen file through the evidence upload API as soon as it is
+ * picked: open the upload, PUT it in chunks with an Upload-Offset header,
+ * then POST to complete it. A dropped chunk is retried; after a reload the
+ * same file resumes from the offset the server reports. Uploaded files are
+ * cleared from the input, so submitting the form does not send them again.
+ * Without JavaScript the input is posted with the form as before.
+ */
+(() => {
+  const MAX_RETRIES = 5
+
+  function csrfToken (input) {
+    const field = input.form && input.form.querySelector('[name=csrfmiddlewaretoken]')
+    return field ? field.value : ''
+  }
+
+  async function sha256 (file) {
+    const digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer())
+    return Array.from(new Uint8Array(digest))
+      .map(byte => byte.toString(16).padStart(2, '0'))
+      .join('')
+  }
+
+  function sleep (ms) {
+    return new Promise(resolve => setTimeout(resolve, ms))
+  }
+
+  async function request (input, url, options = {}) {
+    const response = await fetch(url, {
+      credentials: 'same-origin',
+      ...options,
+      headers: { 'X-CSRFToken': csrfToken(input), ...options.headers }
+    })
+    const body = await response.json().catch(() => ({}))
+    return { response, body }
+  }
+
+  // Resume an upload of the same file left open by an earlier page, if any
+  async function openUpload (input, file, resumeKey) {
+    const saved = localStorage.getItem(resumeKey)
+    if (saved) {
+      const { response, body } = await request(input, saved)
+      if (response.ok && body.state === 'open') return body
+      localStorage.removeItem(resumeKey)
+    }
+
+    const { response, body } = await request(input, input.dataset.uploadUrl, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        obligation_number: input.dataset.obligationNumber,
+        filename: file.name,
+        size: file.size,
+        sha256: await sha256(file)
+      })
+    })
+    if (!response.ok) throw new Error(body.error || `HTTP ${response.status}`)
+    localStorage.setItem(resumeKey, body.upload_url)
+    return body
+  }
+
+  async function sendChunks (input, file, upload, onProgress) {
+    let received = upload.received
+    let failures = 0
+    while (received < file.size) {
+      const end = Math.min(received + upload.chunk_size, file.size)
+      let result = null
+      try {
+        result = await request(input, upload.upload_url, {
+          method: 'PUT',
+          headers: { 'Upload-Offset': String(received) },
+          body: file.slice(received, end)
+        })
+      } catch {
+        // Dropped connection: result stays null and the chunk is retried
+      }
+
+      if (result === null || result.response.status >= 500) {
+        failures += 1
+        if (failures > MAX_RETRIES) throw new Error('Upload failed, try again later')
+        await sleep(500 * 2 ** failures)
+        // Ask where to resume; the lost chunk may have been written
+        const status = await request(input, upload.upload_url).catch(() => null)
+        if (status && status.response.ok) received = status.body.received
+        continue
+      }
+
+      const { response, body } = result
+      // A 409 carries the offset the server's copy actually ends at
+      if (!response.ok && response.status !== 409) {
+        throw new Error(body.error || `HTTP ${response.status}`)
+      }
+      received = body.received
+      failures = 0
+      onProgress(received)
+    }
+  }
+
+  async function uploadFile (input, file, status) {
+    const resumeKey = [
+      'evidence-upload', input.dataset.obligationNumber,
+      file.name, file.size, file.lastModified
+    ].join(':')
+    const upload = await openUpload(input, file, resumeKey)
+    await sendChunks(input, file, upload, received => {
+      status.textContent = `${file.name}: ${Math.floor(100 * received / file.size)}%`
+    })
+
+    const { response, body } = await request(input, upload.complete_url, {
+      method: 'POST'
+    })
+    localStorage.removeItem(resumeKey)
+    if (!response.ok) throw new Error(body.error || `HTTP ${response.status}`)
+
+    const link = document.createElement('a')
+    link.href = body.url
+    link.target = '_blank'
+    link.textContent = body.name
+    status.replaceChildren(link, ' uploaded')
+  }
+
+  async function uploadFiles (input) {
+    let list = input.nextElementSibling
+    if (!list || !list.matches('.upload-status')) {
+      list = document.createElement('ul')
+      list.className = 'upload-status'
+      list.setAttribute('aria-live', 'polite')
+      input.after(list)
+    }
+
+    const files = Array.from(input.files)
+    input.value = ''
+    for (const file of files) {
+      const status = document.createElement('li')
+      status.textContent = `${file.name}: starting`
+      list.append(status)
+      try {
+        await uploadFile(input, file, status)
+      } catch (error) {
+        status.textContent = `${file.name}: ${error.message}`
+        status.classList.add('error')
+      }
+    }
+  }
+
+  function bind (root) {
+    root.querySelectorAll('input[type=file][data-upload-url]').forEach(input => {
+      if (input.dataset.uploadBound) return
+      input.dataset.uploadBound = 'true'
+      input.addEventListener('change', () => uploadFiles(input))
+    })
+  }
+
+  document.addEventListener('DOMContentLoaded', () => bind(document))
+  document.addEventListener('htmx:afterSwap', event => bind(event.detail.target))
+})()
@@ -10,4 +10,7 @@ class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
 
     def ready(self):
-        """Import signals when the app is ready."""
+        """Generate thumbnails for profile images when they are saved."""
+        from core.utils.thumbnails import register_thumbnail_field
+
+        register_thumbnail_field(self.get_model("Profile"), "profile_image")
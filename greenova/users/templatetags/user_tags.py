@@ -1,5 +1,6 @@
 from allauth.account.models import EmailAddress
 from allauth.account.utils import user_display
+from core.utils.thumbnails import thumbnail_url
 from django import template
 from django.utils.html import format_html
 
@@ -16,9 +17,9 @@ def full_name_or_username(user):
 
 @register.filter
 def profile_image_url(user):
-    """Return profile image URL or empty string if no image."""
+    """Return profile thumbnail URL or empty string if no image."""
     if hasattr(user, 'profile') and user.profile.profile_image:
-        return user.profile.profile_image.url
+        return thumbnail_url(user.profile.profile_image.name, 'small')
     return ''
 
 
@@ -21,7 +21,7 @@ def calculate_overdue_obligations(user_id: int) -> list[Obligation]:
         Obligation.objects.filter(
             responsibility__in=user_roles, project_id__in=project_ids
         )
+        .overdue()
         .select_related("project")
-        .distinct()
     )
-    return [obligation for obligation in obligations if obligation.is_overdue]
+    return list(obligations)